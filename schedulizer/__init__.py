@@ -0,0 +1,19 @@
+# Scheduling algorithms, metrics and deadlock checks with no GUI dependency.
+# The Qt front end lives in schedulizer.gui and is only imported when the GUI starts.
+from .process import Process
+from .table import ProcessTable
+from .algorithms import ALGORITHM_VERSIONS, ALGORITHMS, run_algorithm, run_stream
+from .engine import OnlineScheduler
+from .smp import SmpScheduler, core_utilization, run_smp
+from .shard import run_sharded
+from .incremental import IncrementalSchedule
+from .gantt import ScheduleStats, SegmentStream, add_segment
+from .trace import SchedulerTrace
+from .schedule_file import ScheduleFile, ScheduleWriter, write_schedule
+from .compare import best_quantum, compare_algorithms, sweep_quantum
+from .cache import ResultCache, workload_fingerprint
+from .metrics import Histogram, RunningAverages, StreamingMetrics, compute_metrics, process_metrics
+from .deadlock import (BankerState, WaitForGraph, check_state, find_safe_sequence, read_state,
+                       wait_for_state)
+from .workload import WorkloadError, iter_workload, parse_process, read_table, read_workload
+from .generate import generate_table, write_trace
@@ -0,0 +1,424 @@
+from collections import deque
+from time import perf_counter_ns
+import heapq
+
+from .gantt import add_segment
+from .queues import ArrivalFeed, FairQueue, FeedbackQueue, ResponseRatioQueue
+from .table import ProcessTable
+
+# Every scheduler takes an arrival-ordered iterable of processes, which may be a
+# generator over a trace file. Arrivals are pulled only when simulated time reaches
+# them. gantt defaults to a new list; pass a SegmentStream to stream segments out
+# instead. on_finish, if given, is called with each process as it completes.
+# trace, if given, is a SchedulerTrace told about arrivals, selections and the end
+# of every run slice.
+
+def finish_process(p, time, on_finish):
+    p.finish = time
+    p.completed = True
+    if on_finish:
+        on_finish(p)
+
+def run_fcfs(processes, gantt=None, on_finish=None, trace=None):
+    gantt = [] if gantt is None else gantt
+    time = 0
+
+    for p in processes:
+        # Jump over idle time
+        if time < p.arrival:
+            add_segment(gantt, time, p.arrival, None)
+            time = p.arrival
+
+        # Execute process
+        if trace:
+            trace.arrive(p)
+            trace.select(time, p, 0)
+        add_segment(gantt, time, time + p.service, p.pid)
+        time += p.service
+
+        if trace:
+            trace.release(time, p, True)
+        finish_process(p, time, on_finish)
+
+    return gantt
+
+def run_rr(processes, quantum, gantt=None, on_finish=None, trace=None):
+    gantt = [] if gantt is None else gantt
+    time = 0
+    ready_queue = deque()
+    arrivals = ArrivalFeed(processes)
+
+    while arrivals or ready_queue:
+        # Add arriving processes to ready queue
+        while arrivals and arrivals.next_arrival() <= time:
+            p = arrivals.pop()[1]
+            ready_queue.append(p)
+            if trace:
+                trace.arrive(p)
+
+        if ready_queue:
+            if trace:
+                started = perf_counter_ns()
+                current = ready_queue.popleft()
+                trace.select(time, current, perf_counter_ns() - started)
+            else:
+                current = ready_queue.popleft()
+            exec_time = min(quantum, current.remaining)
+
+            add_segment(gantt, time, time + exec_time, current.pid)
+            time += exec_time
+
+            current.remaining -= exec_time
+
+            # Add arriving processes during execution
+            while arrivals and arrivals.next_arrival() <= time:
+                p = arrivals.pop()[1]
+                ready_queue.append(p)
+                if trace:
+                    trace.arrive(p)
+
+            if trace:
+                trace.release(time, current, current.remaining == 0)
+            if current.remaining > 0:
+                ready_queue.append(current)
+            else:
+                finish_process(current, time, on_finish)
+        else:
+            # Jump to the next arrival
+            next_arrival = arrivals.next_arrival()
+            add_segment(gantt, time, next_arrival, None)
+            time = next_arrival
+
+    return gantt
+
+# The heap-based schedulers below key their ready queues on (key, arrival order).
+# Processes come in sorted by arrival, so ties go to the earlier arrival and then
+# to the earlier row in the process table.
+
+def run_spn(processes, gantt=None, on_finish=None, trace=None):
+    gantt = [] if gantt is None else gantt
+    time = 0
+    ready = []  # Heap of (service, arrival order, process)
+    arrivals = ArrivalFeed(processes)
+
+    while arrivals or ready:
+        # Move arrived processes into the ready heap
+        while arrivals and arrivals.next_arrival() <= time:
+            order, p = arrivals.pop()
+            heapq.heappush(ready, (p.service, order, p))
+            if trace:
+                trace.arrive(p)
+
+        if ready:
+            # Process with shortest service time
+            if trace:
+                started = perf_counter_ns()
+                _, _, current = heapq.heappop(ready)
+                trace.select(time, current, perf_counter_ns() - started)
+            else:
+                _, _, current = heapq.heappop(ready)
+
+            # Execute process
+            add_segment(gantt, time, time + current.service, current.pid)
+            time += current.service
+
+            if trace:
+                trace.release(time, current, True)
+            finish_process(current, time, on_finish)
+        else:
+            # Jump to the next arrival
+            next_arrival = arrivals.next_arrival()
+            add_segment(gantt, time, next_arrival, None)
+            time = next_arrival
+
+    return gantt
+
+def run_srt(processes, gantt=None, on_finish=None, trace=None):
+    gantt = [] if gantt is None else gantt
+    time = 0
+    ready = []  # Heap of (remaining, arrival order, process)
+    arrivals = ArrivalFeed(processes)
+
+    while arrivals or ready:
+        # Move arrived processes into the ready heap
+        while arrivals and arrivals.next_arrival() <= time:
+            order, p = arrivals.pop()
+            heapq.heappush(ready, (p.remaining, order, p))
+            if trace:
+                trace.arrive(p)
+
+        if ready:
+            # Process with shortest remaining time
+            if trace:
+                started = perf_counter_ns()
+                _, order, current = heapq.heappop(ready)
+                trace.select(time, current, perf_counter_ns() - started)
+            else:
+                _, order, current = heapq.heappop(ready)
+
+            # Execute until it completes or the next arrival may preempt it
+            exec_time = current.remaining
+            if arrivals:
+                exec_time = min(exec_time, arrivals.next_arrival() - time)
+            add_segment(gantt, time, time + exec_time, current.pid)
+            time += exec_time
+            current.remaining -= exec_time
+
+            if trace:
+                trace.release(time, current, current.remaining == 0)
+            if current.remaining == 0:
+                finish_process(current, time, on_finish)
+            else:
+                heapq.heappush(ready, (current.remaining, order, current))
+        else:
+            # Jump to the next arrival
+            next_arrival = arrivals.next_arrival()
+            add_segment(gantt, time, next_arrival, None)
+            time = next_arrival
+
+    return gantt
+
+def run_hrrn(processes, gantt=None, on_finish=None, trace=None):
+    gantt = [] if gantt is None else gantt
+    time = 0
+    ready = ResponseRatioQueue()
+    arrivals = ArrivalFeed(processes)
+
+    while arrivals or ready:
+        # Move arrived processes into the ready queue
+        while arrivals and arrivals.next_arrival() <= time:
+            order, p = arrivals.pop()
+            ready.push(p, order, time)
+            if trace:
+                trace.arrive(p)
+
+        if ready:
+            # Process with highest response ratio
+            if trace:
+                started = perf_counter_ns()
+                current = ready.pop(time)
+                trace.select(time, current, perf_counter_ns() - started)
+            else:
+                current = ready.pop(time)
+
+            # Execute process to completion (non-preemptive)
+            add_segment(gantt, time, time + current.service, current.pid)
+            time += current.service
+
+            if trace:
+                trace.release(time, current, True)
+            finish_process(current, time, on_finish)
+        else:
+            # Jump to the next arrival
+            next_arrival = arrivals.next_arrival()
+            add_segment(gantt, time, next_arrival, None)
+            time = next_arrival
+
+    return gantt
+
+def run_priority_nonpreemptive(processes, gantt=None, on_finish=None, trace=None):
+    gantt = [] if gantt is None else gantt
+    time = 0
+    ready = []  # Heap of (priority, arrival order, process)
+    arrivals = ArrivalFeed(processes)
+
+    while arrivals or ready:
+        # Move arrived processes into the ready heap
+        while arrivals and arrivals.next_arrival() <= time:
+            order, p = arrivals.pop()
+            heapq.heappush(ready, (p.priority, order, p))
+            if trace:
+                trace.arrive(p)
+
+        if ready:
+            # Process with highest priority (lowest priority number)
+            if trace:
+                started = perf_counter_ns()
+                _, _, current = heapq.heappop(ready)
+                trace.select(time, current, perf_counter_ns() - started)
+            else:
+                _, _, current = heapq.heappop(ready)
+
+            # Execute process to completion
+            add_segment(gantt, time, time + current.service, current.pid)
+            time += current.service
+
+            if trace:
+                trace.release(time, current, True)
+            finish_process(current, time, on_finish)
+        else:
+            # Jump to the next arrival
+            next_arrival = arrivals.next_arrival()
+            add_segment(gantt, time, next_arrival, None)
+            time = next_arrival
+
+    return gantt
+
+def run_priority_preemptive(processes, gantt=None, on_finish=None, trace=None):
+    gantt = [] if gantt is None else gantt
+    time = 0
+    ready = []  # Heap of (priority, arrival order, process)
+    arrivals = ArrivalFeed(processes)
+
+    while arrivals or ready:
+        # Move arrived processes into the ready heap
+        while arrivals and arrivals.next_arrival() <= time:
+            order, p = arrivals.pop()
+            heapq.heappush(ready, (p.priority, order, p))
+            if trace:
+                trace.arrive(p)
+
+        if ready:
+            # Process with highest priority (lowest priority number)
+            if trace:
+                started = perf_counter_ns()
+                _, order, current = heapq.heappop(ready)
+                trace.select(time, current, perf_counter_ns() - started)
+            else:
+                _, order, current = heapq.heappop(ready)
+
+            # Execute until it completes or the next arrival may preempt it
+            exec_time = current.remaining
+            if arrivals:
+                exec_time = min(exec_time, arrivals.next_arrival() - time)
+            add_segment(gantt, time, time + exec_time, current.pid)
+            time += exec_time
+            current.remaining -= exec_time
+
+            if trace:
+                trace.release(time, current, current.remaining == 0)
+            if current.remaining == 0:
+                finish_process(current, time, on_finish)
+            else:
+                heapq.heappush(ready, (current.priority, order, current))
+        else:
+            # Jump to the next arrival
+            next_arrival = arrivals.next_arrival()
+            add_segment(gantt, time, next_arrival, None)
+            time = next_arrival
+
+    return gantt
+
+def run_sliced(ready, preemptive, processes, gantt=None, on_finish=None, trace=None):
+    # Runs a time-sliced ready queue (see queues.py): each dispatched process runs
+    # for the queue's slice, or until the next arrival if the policy preempts
+    gantt = [] if gantt is None else gantt
+    time = 0
+    arrivals = ArrivalFeed(processes)
+
+    while arrivals or ready:
+        # Move arrived processes into the ready queue
+        while arrivals and arrivals.next_arrival() <= time:
+            order, p = arrivals.pop()
+            ready.push(p, order, time)
+            if trace:
+                trace.arrive(p)
+
+        if ready:
+            if trace:
+                started = perf_counter_ns()
+                order, current = ready.pop(time)
+                trace.select(time, current, perf_counter_ns() - started)
+            else:
+                order, current = ready.pop(time)
+
+            exec_time = min(ready.slice(current, order, time), current.remaining)
+            if preemptive and arrivals:
+                exec_time = min(exec_time, arrivals.next_arrival() - time)
+            add_segment(gantt, time, time + exec_time, current.pid)
+            time += exec_time
+            current.remaining -= exec_time
+
+            if trace:
+                trace.release(time, current, current.remaining == 0)
+            if current.remaining == 0:
+                ready.retire(order, time)
+                finish_process(current, time, on_finish)
+            else:
+                # Processes arriving meanwhile queue ahead of it
+                while arrivals and arrivals.next_arrival() <= time:
+                    arrived_order, p = arrivals.pop()
+                    ready.push(p, arrived_order, time)
+                    if trace:
+                        trace.arrive(p)
+                ready.push(current, order, time)
+        else:
+            # Jump to the next arrival
+            next_arrival = arrivals.next_arrival()
+            add_segment(gantt, time, next_arrival, None)
+            time = next_arrival
+
+    return gantt
+
+def run_cfs(processes, quantum, gantt=None, on_finish=None, trace=None, latency=None):
+    # Completely-fair-style sharing by virtual runtime, weighted by priority read as
+    # a nice value. quantum is the minimum slice; latency defaults to 8 quanta.
+    return run_sliced(FairQueue(quantum, latency), False, processes, gantt, on_finish, trace)
+
+def run_mlfq(processes, quantum, gantt=None, on_finish=None, trace=None,
+             levels=3, quanta=None, boost=None):
+    # Multilevel feedback queue with levels levels whose quanta double from quantum,
+    # or the given quanta, and a boost of every waiting process to the top level each
+    # boost time units (default: 10x the last quantum; 0 turns it off)
+    return run_sliced(FeedbackQueue(quantum, levels, quanta, boost), True, processes, gantt,
+                      on_finish, trace)
+
+ALGORITHMS = {
+    "fcfs": ("First-Come, First-Served (FCFS)", run_fcfs),
+    "rr": ("Round Robin (RR)", run_rr),
+    "spn": ("Shortest Process Next (SPN)", run_spn),
+    "srt": ("Shortest Remaining Time (SRT)", run_srt),
+    "hrrn": ("Highest Response Ratio Next (HRRN)", run_hrrn),
+    "priority-np": ("Priority Scheduling (Non-Preemptive)", run_priority_nonpreemptive),
+    "priority-p": ("Priority Scheduling (Preemptive)", run_priority_preemptive),
+    "cfs": ("Completely Fair Scheduler (CFS)", run_cfs),
+    "mlfq": ("Multilevel Feedback Queue (MLFQ)", run_mlfq),
+}
+
+# Algorithms that take the time quantum (and, for cfs and mlfq, extra options)
+TIME_SLICED = ("rr", "cfs", "mlfq")
+
+# Bump an algorithm's version whenever a change alters its schedule, so results
+# cached on disk for the old version are no longer used
+ALGORITHM_VERSIONS = {
+    "fcfs": 1,
+    "rr": 1,
+    "spn": 1,
+    "srt": 1,
+    "hrrn": 1,
+    "priority-np": 1,
+    "priority-p": 1,
+    "cfs": 1,
+    "mlfq": 1,
+}
+
+def run_stream(name, processes, quantum=4, gantt=None, on_finish=None, trace=None, **options):
+    # Runs an algorithm over processes that are already in arrival order
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {name}")
+    if options and name not in ("cfs", "mlfq"):
+        raise ValueError(f"{name} takes no options")
+
+    run = ALGORITHMS[name][1]
+    if name in TIME_SLICED:
+        return run(processes, quantum, gantt, on_finish, trace, **options)
+    return run(processes, gantt, on_finish, trace)
+
+def prepare_processes(processes):
+    # Sort processes by arrival time and reset their states
+    if isinstance(processes, ProcessTable):
+        processes.sort()
+        processes.reset()
+    else:
+        processes.sort(key=lambda p: p.arrival)
+        for p in processes:
+            p.remaining = p.service
+            p.completed = False
+            p.finish = 0
+
+def run_algorithm(name, processes, quantum=4, trace=None, **options):
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {name}")
+
+    prepare_processes(processes)
+    return run_stream(name, processes, quantum, trace=trace, **options)
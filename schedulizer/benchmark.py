@@ -0,0 +1,413 @@
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from .algorithms import ALGORITHMS, prepare_processes, run_stream
+from .deadlock import BankerState, WaitForGraph, find_safe_sequence, wait_for_state
+from .gantt import ScheduleStats, SegmentStream
+from .table import ProcessTable, np
+
+# Synthetic workload profiles for the suite: service times are uniform over the given
+# range, and arrivals are spaced so the offered load (service demand per unit of time)
+# is about the given value. Dense arrivals overload the CPU and grow long ready
+# queues; sparse ones leave it idle between short bursts.
+SERVICE_RANGES = {"short": (1, 10), "long": (10, 100)}
+LOADS = {"dense": 2.0, "sparse": 0.5}
+PROFILES = [f"{service}-{arrivals}" for service in SERVICE_RANGES for arrivals in LOADS]
+SUITE_SIZES = (100, 1000, 10000, 100000, 1000000)
+
+def random_banker_state(processes, resources, claims, seed):
+    # Random safe state where each process claims up to `claims` resource types.
+    # Available covers the largest need of each type, so any process could run first.
+    rng = random.Random(seed)
+    max_demand = [[0] * resources for _ in range(processes)]
+    for row in max_demand:
+        for j in rng.sample(range(resources), min(claims, resources)):
+            row[j] = rng.randint(1, 9)
+    allocation = [[rng.randint(0, x // 2) for x in row] for row in max_demand]
+    available = [max(row[j] - a[j] for row, a in zip(max_demand, allocation)) for j in range(resources)]
+    return allocation, max_demand, available
+
+def full_check_request(allocation, max_demand, available, i, amounts):
+    # The from-scratch approach: apply the request and rerun the whole safety check
+    if any(a > x for a, x in zip(amounts, available)):
+        return False
+    for j, a in enumerate(amounts):
+        allocation[i][j] += a
+        available[j] -= a
+    if find_safe_sequence(allocation, max_demand, available) is not None:
+        return True
+    for j, a in enumerate(amounts):
+        allocation[i][j] -= a
+        available[j] += a
+    return False
+
+def bench_banker(processes, resources, requests, claims=3, seed=1, full=False):
+    allocation, max_demand, available = random_banker_state(processes, resources, claims, seed)
+    state = BankerState(allocation, max_demand, available)
+    holding = allocation if full else state.allocation
+    claimed = [[j for j, x in enumerate(row) if x] for row in max_demand]
+    rng = random.Random(seed + 1)
+    granted = denied = 0
+    checking = 0.0  # Time spent in the request checks alone
+
+    # Each step picks a process. One that holds its whole claim finishes and releases
+    # everything; otherwise it asks for a few more units of one of its resource types,
+    # or now and then hands some back early.
+    start = time.perf_counter()
+    for _ in range(requests):
+        i = rng.randrange(processes)
+        if not claimed[i]:
+            continue
+        j = rng.choice(claimed[i])
+        held = holding[i]
+        amounts = [0] * resources
+        finished = all(h == x for h, x in zip(held, max_demand[i]))
+        if finished or rng.random() < 0.1:
+            if finished:
+                amounts = [int(h) for h in held]
+            else:
+                amounts[j] = rng.randint(0, int(held[j]))
+            if full:
+                for k, a in enumerate(amounts):
+                    held[k] -= a
+                    available[k] += a
+            else:
+                state.release(i, amounts)
+            continue
+
+        amounts[j] = min(rng.randint(1, 3), max_demand[i][j] - int(held[j]))
+        asked = time.perf_counter()
+        if full:
+            ok = full_check_request(allocation, max_demand, available, i, amounts)
+        else:
+            ok = state.request(i, amounts)
+        checking += time.perf_counter() - asked
+        if ok:
+            granted += 1
+        else:
+            denied += 1
+    seconds = time.perf_counter() - start
+
+    return {
+        "mode": "full" if full else "incremental",
+        "processes": processes,
+        "resources": resources,
+        "claims": claims,
+        "operations": requests,
+        "granted": granted,
+        "denied": denied,
+        "seconds": seconds,
+        # Only the steps that made a request, over the time spent checking them
+        "requests_per_second": (granted + denied) / checking if checking > 0 else 0,
+    }
+
+def print_banker(result):
+    print(f"{result['mode']:<12} {result['processes']} processes x {result['resources']} resources: "
+          f"{result['operations']} operations in {result['seconds']:.3f}s, "
+          f"{result['requests_per_second']:,.0f} requests/s "
+          f"({result['granted']} granted, {result['denied']} denied)")
+
+def random_wait_ops(processes, edges, operations, seed):
+    # Adds random wait edges until there are `edges` of them, then alternates adding
+    # and removing at random. Yields (add, waiter, holder).
+    rng = random.Random(seed)
+    current = []
+    position = {}
+    for _ in range(operations):
+        if current and (len(current) >= edges and rng.random() < 0.5):
+            k = rng.randrange(len(current))
+            edge = current[k]
+            last = current.pop()
+            if k < len(current):
+                current[k] = last
+                position[last] = k
+            del position[edge]
+            yield False, edge[0], edge[1]
+        else:
+            edge = (rng.randrange(processes), rng.randrange(processes))
+            if edge in position:
+                continue
+            position[edge] = len(current)
+            current.append(edge)
+            yield True, edge[0], edge[1]
+
+def bench_waitfor(processes, edges, operations, seed=1):
+    graph = WaitForGraph()
+    for p in range(processes):
+        graph.add_process(p)
+    ops = list(random_wait_ops(processes, edges, operations, seed))
+
+    start = time.perf_counter()
+    for add, waiter, holder in ops:
+        if add:
+            graph.add_wait(waiter, holder)
+        else:
+            graph.remove_wait(waiter, holder)
+    seconds = time.perf_counter() - start
+
+    return {
+        "processes": processes,
+        "edges": edges,
+        "operations": len(ops),
+        "cycles": len(graph.cycles()),
+        "seconds": seconds,
+        "operations_per_second": len(ops) / seconds if seconds > 0 else 0,
+    }
+
+def check_waitfor(processes, operations, seed=1):
+    # Replays random edge changes on a small graph and compares the verdict after
+    # every change with the Banker's safety check on the equivalent matrices.
+    # Returns the number of states checked; raises AssertionError on a mismatch.
+    graph = WaitForGraph()
+    for p in range(processes):
+        graph.add_process(p)
+    edges = set()
+    for add, waiter, holder in random_wait_ops(processes, processes, operations, seed):
+        if add:
+            graph.add_wait(waiter, holder)
+            edges.add((waiter, holder))
+        else:
+            graph.remove_wait(waiter, holder)
+            edges.discard((waiter, holder))
+
+        unsafe = find_safe_sequence(*wait_for_state(range(processes), edges)) is None
+        assert unsafe == bool(graph), f"verdicts differ after {len(edges)} edges"
+        for cycle in graph.cycles():
+            assert all((cycle[k - 1], cycle[k]) in edges for k in range(len(cycle))), \
+                f"reported cycle {cycle} is not in the graph"
+    return operations
+
+def print_waitfor(result):
+    print(f"wait-for     {result['processes']} processes, ~{result['edges']} edges: "
+          f"{result['operations']} edge changes in {result['seconds']:.3f}s, "
+          f"{result['operations_per_second']:,.0f} changes/s ({result['cycles']} cycles at the end)")
+
+def synthetic_table(count, profile, seed):
+    service, arrivals = profile.split("-")
+    low, high = SERVICE_RANGES[service]
+    gap = (low + high) / LOADS[arrivals]  # twice the mean interarrival time
+    rng = random.Random(f"{seed}-{profile}-{count}")
+    table = ProcessTable()
+    arrival = 0
+    for i in range(count):
+        table.append(f"P{i + 1}", arrival, rng.randint(low, high), rng.randint(0, 9))
+        arrival += rng.randint(0, int(gap))
+    return table
+
+def measure(run, memory, repeat=5):
+    # Returns (seconds, peak bytes allocated, result) for run. Quick cases are timed up
+    # to `repeat` times, within about a second, and the best time is kept to damp
+    # noise. As in timeit, the garbage collector is off while timing. Peak memory
+    # comes from a separate traced call, since tracing slows the run down.
+    seconds = float("inf")
+    spent = 0
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        seconds = min(seconds, elapsed)
+        spent += elapsed
+        if spent > 1:
+            break
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return seconds, peak, result
+
+def suite_cases(sizes, algorithms, profiles, quantum, seed, memory, repeat):
+    # Yields one result record per (algorithm, profile, size)
+    for size in sizes:
+        for profile in profiles:
+            table = synthetic_table(size, profile, seed)
+            for name in algorithms:
+                def run():
+                    stats = ScheduleStats()
+                    gantt = SegmentStream(stats)
+                    prepare_processes(table)
+                    run_stream(name, table, quantum, gantt)
+                    gantt.close()
+                    return stats
+
+                seconds, peak, stats = measure(run, memory, repeat)
+                yield {
+                    "case": f"{name}/{profile}/{size}",
+                    "seconds": seconds,
+                    "peak_bytes": peak,
+                    "events": stats.dispatches,
+                    "context_switches": stats.context_switches,
+                    "makespan": stats.makespan,
+                }
+
+def banker_cases(sizes, resources, seed, memory, repeat):
+    for size in sizes:
+        state = random_banker_state(size, resources, 3, seed)
+        seconds, peak, sequence = measure(lambda: find_safe_sequence(*state), memory, repeat)
+        yield {
+            "case": f"banker/{resources}-resources/{size}",
+            "seconds": seconds,
+            "peak_bytes": peak,
+            "events": None,
+            "safe": sequence is not None,
+        }
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__ if np is not None else None,
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+def find_regressions(results, baseline, tolerance, min_seconds):
+    # Compares against a stored run. Slower or larger cases beyond the tolerance are
+    # regressions; different event counts mean the schedule itself changed. Cases
+    # faster than min_seconds are too noisy to time and only have their counts checked:
+    # at a few hundredths of a second, identical runs can differ by more than half.
+    previous = {record["case"]: record for record in baseline["results"]}
+    flags = []
+    for record in results:
+        old = previous.get(record["case"])
+        if old is None:
+            continue
+        for field in ("events", "context_switches", "makespan", "safe"):
+            if field in old and old[field] != record.get(field):
+                flags.append((record["case"], f"{field} changed from {old[field]} to {record.get(field)}"))
+        if old["seconds"] >= min_seconds and record["seconds"] > old["seconds"] * (1 + tolerance):
+            flags.append((record["case"], f"time {old['seconds']:.3f}s -> {record['seconds']:.3f}s"))
+        if old.get("peak_bytes") and record.get("peak_bytes") and \
+                record["peak_bytes"] > old["peak_bytes"] * (1 + tolerance):
+            flags.append((record["case"], f"peak memory {old['peak_bytes'] / 2**20:.1f} MB -> "
+                                          f"{record['peak_bytes'] / 2**20:.1f} MB"))
+    return flags
+
+def print_suite_record(record):
+    peak = f"{record['peak_bytes'] / 2**20:>9.1f}" if record.get("peak_bytes") is not None else f"{'-':>9}"
+    events = record["events"] if record["events"] is not None else "-"
+    print(f"{record['case']:<34} {record['seconds']:>10.4f} {peak} {events:>12}", flush=True)
+
+def run_suite(args):
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else SUITE_SIZES
+    algorithms = args.algorithms.split(",") if args.algorithms else list(ALGORITHMS) + ["banker"]
+    profiles = args.profiles.split(",") if args.profiles else PROFILES
+    unknown = [name for name in algorithms if name not in ALGORITHMS and name != "banker"]
+    unknown += [profile for profile in profiles if profile not in PROFILES]
+    if unknown:
+        print(f"Unknown algorithm or profile: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'Case':<34} {'Seconds':>10} {'Peak MB':>9} {'Events':>12}")
+    results = []
+    schedulers = [name for name in algorithms if name != "banker"]
+    for record in suite_cases(sizes, schedulers, profiles, args.quantum, args.seed,
+                               not args.no_memory, args.repeat):
+        print_suite_record(record)
+        results.append(record)
+    if "banker" in algorithms:
+        for record in banker_cases(sizes, args.resources, args.seed, not args.no_memory, args.repeat):
+            print_suite_record(record)
+            results.append(record)
+
+    if args.output:
+        data = {
+            "environment": environment(),
+            "settings": {"seed": args.seed, "quantum": args.quantum, "resources": args.resources,
+                         "repeat": args.repeat},
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+
+    if baseline is None:
+        return 0
+    flags = find_regressions(results, baseline, args.tolerance, args.min_seconds)
+    if flags:
+        print(f"\n{len(flags)} regressions against {args.baseline}:")
+        for case, message in flags:
+            print(f"  {case}: {message}")
+        return 1
+    print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m schedulizer.benchmark",
+                                     description="Schedulizer benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    banker = commands.add_parser("banker", help="Banker's resource-request throughput")
+    banker.add_argument("-n", "--processes", type=int, default=1000)
+    banker.add_argument("-m", "--resources", type=int, default=10)
+    banker.add_argument("-c", "--claims", type=int, default=3,
+                        help="resource types each process claims (default: 3)")
+    banker.add_argument("-r", "--requests", type=int, default=100000,
+                        help="number of requests and releases to replay (default: 100000)")
+    banker.add_argument("--seed", type=int, default=1)
+    banker.add_argument("--full", action="store_true",
+                        help="also time a full safety check per request, on the same stream")
+
+    waitfor = commands.add_parser("waitfor", help="incremental wait-for graph cycle detection")
+    waitfor.add_argument("-n", "--processes", type=int, default=100000)
+    waitfor.add_argument("-e", "--edges", type=int, default=50000,
+                         help="number of wait edges to keep in the graph (default: 50000)")
+    waitfor.add_argument("-r", "--operations", type=int, default=200000,
+                         help="number of edge additions and removals (default: 200000)")
+    waitfor.add_argument("--seed", type=int, default=1)
+    waitfor.add_argument("--check", action="store_true",
+                         help="first cross-check against the Banker's safety check on small graphs")
+
+    suite = commands.add_parser("suite", help="every scheduler and the Banker's check on scaled synthetic workloads")
+    suite.add_argument("--sizes", help="comma-separated process counts (default: 100 to 1000000 in powers of 10)")
+    suite.add_argument("-a", "--algorithms",
+                       help=f"comma-separated subset of {', '.join(ALGORITHMS)} and banker (default: all)")
+    suite.add_argument("-p", "--profiles", help=f"comma-separated subset of {', '.join(PROFILES)} (default: all)")
+    suite.add_argument("-q", "--quantum", type=int, default=10, help="time quantum for rr (default: 10)")
+    suite.add_argument("-m", "--resources", type=int, default=10,
+                       help="resource types for the Banker's cases (default: 10)")
+    suite.add_argument("--seed", type=int, default=1)
+    suite.add_argument("--repeat", type=int, default=5,
+                       help="time quick cases up to this many times and keep the best (default: 5)")
+    suite.add_argument("--no-memory", action="store_true", help="skip the traced run that measures peak memory")
+    suite.add_argument("-o", "--output", help="save the results as JSON")
+    suite.add_argument("--baseline", help="JSON results of an earlier run to check for regressions")
+    suite.add_argument("--tolerance", type=float, default=0.25,
+                       help="allowed slowdown or memory growth over the baseline (default: 0.25)")
+    suite.add_argument("--min-seconds", type=float, default=0.1,
+                       help="don't compare times of cases faster than this in the baseline (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    if args.command == "banker":
+        print_banker(bench_banker(args.processes, args.resources, args.requests, args.claims, args.seed))
+        if args.full:
+            print_banker(bench_banker(args.processes, args.resources, args.requests, args.claims,
+                                      args.seed, full=True))
+    elif args.command == "waitfor":
+        if args.check:
+            checked = sum(check_waitfor(size, 2000, args.seed + size) for size in (5, 20, 60))
+            print(f"cross-check  {checked} graph states agree with the Banker's safety check")
+        print_waitfor(bench_waitfor(args.processes, args.edges, args.operations, args.seed))
+    elif args.command == "suite":
+        return run_suite(args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from array import array
+
+from .algorithms import ALGORITHM_VERSIONS, ALGORITHMS, TIME_SLICED, prepare_processes, run_stream
+from .table import ProcessTable
+
+# Bump when the entry layout changes
+CACHE_FORMAT = 1
+
+def default_cache_dir():
+    if os.environ.get("SCHEDULIZER_CACHE_DIR"):
+        return os.environ["SCHEDULIZER_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "schedulizer")
+
+def workload_fingerprint(processes):
+    # Content hash of an arrival-sorted workload. Row order matters because ties
+    # are broken by it, so the hash covers the rows in the order they will run.
+    digest = hashlib.sha256()
+    if isinstance(processes, ProcessTable):
+        digest.update(b"table")
+        for column in (processes.pid_offsets, processes.pid_index, processes.arrival,
+                       processes.service, processes.priority):
+            digest.update(len(column).to_bytes(8, "little"))
+            digest.update(column.tobytes())
+        digest.update(processes.pid_data)
+    else:
+        digest.update(b"list")
+        for p in processes:
+            digest.update(f"{p.pid}\0{p.arrival}\0{p.service}\0{p.priority}\n".encode())
+    return digest.hexdigest()
+
+class ResultCache:
+    # Simulation results on local disk, one file per (workload, algorithm, version,
+    # parameters) key. Entries hold the Gantt segments and every process's finish
+    # time, from which the per-process metrics are recomputed. Hits refresh an
+    # entry's mtime and the oldest entries are evicted once the directory grows past
+    # max_bytes, which makes it an LRU cache. Entries are pickles, and loading one
+    # can run arbitrary code, so the directory must only be writable by users trusted
+    # to run code as the reader.
+    def __init__(self, directory=None, max_bytes=512 * 1024 * 1024):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, processes, name, params):
+        identity = {
+            "format": CACHE_FORMAT,
+            "workload": workload_fingerprint(processes),
+            "algorithm": name,
+            "version": ALGORITHM_VERSIONS[name],
+            "params": params,
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or foreign file; unpickling can fail with almost any
+            # exception, so drop it and recompute
+            self.discard(path)
+            return None
+
+        if (not isinstance(entry, dict) or entry.get("format") != CACHE_FORMAT or
+                entry.get("key") != key):
+            self.discard(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["gantt"], entry["finish"]
+
+    def put(self, key, gantt, finish):
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {"format": CACHE_FORMAT, "key": key, "gantt": gantt, "finish": finish}
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            self.discard(tmp)
+            raise
+        self.evict()
+
+    def evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith(".pkl"):
+                    stat = item.stat()
+                    entries.append((stat.st_mtime, stat.st_size, item.path))
+                    total += stat.st_size
+        entries.sort()
+        # Always keep the newest entry, even if it alone is over the limit
+        for _, size, path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            total -= size
+
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith((".pkl", ".tmp")):
+                    self.discard(item.path)
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def run(self, name, processes, quantum=4, gantt=None, **options):
+        # Drop-in for run_algorithm that answers repeated runs from disk. A gantt list
+        # passed in is filled on a miss; a hit returns the cached list instead. A
+        # SegmentStream keeps no segments, so a run into one isn't cached.
+        if name not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {name}")
+
+        prepare_processes(processes)
+        key = self.key(processes, name, dict(options, quantum=quantum) if name in TIME_SLICED else {})
+        cached = self.get(key)
+        if cached is not None and len(cached[1]) == len(processes):
+            gantt, finish = cached
+            apply_finish(processes, finish)
+            return gantt
+
+        gantt = run_stream(name, processes, quantum, gantt, **options)
+        if isinstance(processes, ProcessTable):
+            finish = processes.finish
+        else:
+            finish = array("q", (p.finish for p in processes))
+        if not isinstance(gantt, list):
+            return gantt
+        try:
+            # Stored as a plain list, whatever list subclass collected it
+            self.put(key, gantt if type(gantt) is list else list(gantt), finish)
+        except OSError:
+            # An unwritable cache shouldn't fail the run
+            pass
+        return gantt
+
+def apply_finish(processes, finish):
+    if isinstance(processes, ProcessTable):
+        processes.finish = array("q", finish)
+        processes.remaining = array("q", [0]) * len(processes)
+        processes.completed = bytearray(b"\x01") * len(processes)
+        return
+    for p, value in zip(processes, finish):
+        p.finish = value
+        p.remaining = 0
+        p.completed = True
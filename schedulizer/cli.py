@@ -0,0 +1,482 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+from .algorithms import ALGORITHMS, prepare_processes, run_algorithm, run_stream
+from .cache import ResultCache
+from .compare import (COMPARISON_FIELDS, best_quantum, compare_algorithms, comparison_row,
+                      parse_quanta, sweep_quantum)
+from .gantt import SegmentStream
+from .generate import add_generator_arguments, generate_table, generator_options
+from .metrics import StreamingMetrics, compute_metrics, process_metrics
+from .schedule_file import ScheduleFile, ScheduleWriter, is_schedule_file, write_schedule
+from .shard import run_sharded
+from .smp import RUN_QUEUES, core_utilization, run_smp
+from .trace import SchedulerTrace
+from .workload import WorkloadError, iter_workload, read_table
+
+RESULT_FIELDS = ("pid", "arrival", "service", "priority", "finish", "tat", "waiting", "ntat")
+
+def result_record(p):
+    return {field: getattr(p, field) for field in RESULT_FIELDS}
+
+def write_results(path, processes, gantt, averages, utilization=None):
+    # With several CPUs gantt holds one segment list per core
+    if path.endswith(".json"):
+        data = {
+            "processes": [result_record(p) for p in processes],
+            "gantt": gantt,
+            "averages": dict(zip(("tat", "waiting", "ntat"), averages)),
+        }
+        if utilization is not None:
+            data["utilization"] = utilization
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(RESULT_FIELDS)
+            for p in processes:
+                writer.writerow([getattr(p, field) for field in RESULT_FIELDS])
+
+def row_writer(out, path):
+    # Writes one process per call: printed, or to an open .csv or .jsonl file
+    if out is None:
+        print_header()
+        return print_row
+    if path.endswith(".jsonl"):
+        return lambda p: out.write(json.dumps(result_record(p)) + "\n")
+    writer = csv.writer(out)
+    writer.writerow(RESULT_FIELDS)
+    return lambda p: writer.writerow([getattr(p, field) for field in RESULT_FIELDS])
+
+def schedule_metadata(args):
+    # Saved along with a schedule, to describe the run it came from
+    metadata = {"algorithm": args.algorithm, "quantum": args.quantum, "options": args.options,
+                "cpus": args.cpus, "run_queues": args.run_queues}
+    if args.generate is not None:
+        # Enough to generate the same workload again
+        metadata["workload"] = "generated"
+        metadata["generator"] = dict(args.generator, count=args.generate, seed=args.seed)
+    else:
+        metadata["workload"] = os.path.basename(args.workload)
+    return metadata
+
+def parse_window(text):
+    start, sep, end = text.partition(":")
+    try:
+        window = int(start), int(end)
+    except ValueError:
+        window = None
+    if not sep or window is None or window[0] >= window[1]:
+        raise ValueError(f"Invalid window: {text!r}, expected start:end with start < end")
+    return window
+
+def print_segment(segment):
+    start, end, pid = segment
+    print(f"{start:>8} {end:>8}  {pid if pid else '(idle)'}")
+
+def print_cores(gantts, utilization, show_gantt):
+    for core, (gantt, busy) in enumerate(zip(gantts, utilization)):
+        print(f"CPU {core}: {busy:.1%} busy")
+        if show_gantt:
+            for segment in gantt:
+                print_segment(segment)
+
+def print_header():
+    print(f"{'PID':<10} {'Finish':>8} {'TAT':>8} {'WT':>8} {'NTAT':>8}")
+
+def print_row(p):
+    print(f"{p.pid:<10} {p.finish:>8} {p.tat:>8} {p.waiting:>8} {p.ntat:>8.2f}")
+
+def print_results(processes, gantt, averages, show_gantt):
+    if show_gantt:
+        for segment in gantt:
+            print_segment(segment)
+        print()
+
+    print_header()
+    for p in processes:
+        print_row(p)
+
+    print_averages(averages)
+
+def print_percentiles(summary):
+    print(f"{'':<16} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    rows = [("WT", summary["waiting"]), ("TAT", summary["tat"])]
+    for priority, stats in summary["by_priority"].items():
+        rows.append((f"WT  priority {priority}", stats["waiting"]))
+        rows.append((f"TAT priority {priority}", stats["tat"]))
+    for label, stats in rows:
+        print(f"{label:<16} {stats['p50']:>8} {stats['p95']:>8} {stats['p99']:>8} {stats['max']:>8}")
+
+def write_metrics(path, metrics):
+    # The state can be loaded with StreamingMetrics.from_dict and merged across shards
+    with open(path, "w") as f:
+        json.dump({"summary": metrics.summary(), "state": metrics.to_dict()}, f, indent=2)
+
+def print_trace_summary(summary):
+    selection = summary["selection_ns"]
+    queue = summary["ready_queue"]
+    print(f"Dispatches: {summary['dispatches']} | "
+          f"Preemptions: {summary['preemptions']} | "
+          f"Context switches: {summary['context_switches']}")
+    print(f"Ready queue: max {queue['max']}, mean {queue['mean']:.2f} | "
+          f"Selection: {summary['selections']} in {selection['total'] / 1e6:.2f} ms, "
+          f"mean {selection['mean']:.0f} ns, max {selection['max']} ns")
+
+def finish_trace(args, trace):
+    trace.write_chrome(args.trace, f"schedulizer {args.algorithm}")
+    print_trace_summary(trace.summary())
+
+def print_averages(averages):
+    avg_tat, avg_waiting, avg_ntat = averages
+    print(f"Average TAT: {avg_tat:.2f} | "
+          f"Average WT: {avg_waiting:.2f} | "
+          f"Average NTAT: {avg_ntat:.2f}")
+
+def load_table(args):
+    # The workload file, or a generated workload with --generate
+    if args.generate is not None:
+        return generate_table(args.generate, args.seed, **args.generator)
+    return read_table(args.workload)
+
+def run_batch(args):
+    try:
+        processes = load_table(args)
+    except WorkloadError as e:
+        for error in e.errors:
+            print(f"schedulizer: {error}", file=sys.stderr)
+        return 1
+
+    trace = SchedulerTrace() if args.trace else None
+    utilization = None
+    metrics = None
+    if args.cpus > 1:
+        # Per-core schedules are not cached
+        prepare_processes(processes)
+        gantt = run_smp(args.algorithm, processes, args.cpus, args.quantum, args.run_queues,
+                        **args.options)
+        utilization = core_utilization(gantt)
+    elif args.parallel:
+        # The shards bring their metrics back with them
+        if args.percentiles or args.metrics:
+            metrics = StreamingMetrics()
+        gantt = run_sharded(args.algorithm, processes, args.quantum, args.jobs, metrics, **args.options)
+    elif args.no_cache or trace:
+        # A cached result has no decisions to trace, so tracing always runs the algorithm
+        gantt = run_algorithm(args.algorithm, processes, args.quantum, trace, **args.options)
+    else:
+        cache = ResultCache(args.cache_dir)
+        gantt = cache.run(args.algorithm, processes, args.quantum, **args.options)
+    averages = compute_metrics(processes)
+
+    if (args.percentiles or args.metrics) and metrics is None:
+        metrics = StreamingMetrics()
+        for p in processes:
+            metrics.add(p)
+    if args.metrics:
+        write_metrics(args.metrics, metrics)
+
+    if args.save:
+        write_schedule(args.save, processes, gantt if utilization is not None else [gantt],
+                       **schedule_metadata(args))
+    if args.output:
+        write_results(args.output, processes, gantt, averages, utilization)
+        print_averages(averages)
+    elif utilization is not None:
+        print_results(processes, gantt, averages, False)
+    else:
+        print_results(processes, gantt, averages, args.gantt)
+    if utilization is not None:
+        print_cores(gantt, utilization, args.gantt)
+    if args.percentiles:
+        print_percentiles(metrics.summary())
+    if trace:
+        finish_trace(args, trace)
+    return 0
+
+def print_comparison(results):
+    print(f"{'Algorithm':<12} {'Avg TAT':>9} {'Avg WT':>9} {'Avg NTAT':>9} {'WT p50':>8} {'WT p95':>8} "
+          f"{'WT p99':>8} {'WT max':>8} {'TAT p95':>8} {'TAT p99':>8} {'Switches':>9} {'Makespan':>9}")
+    for result in results.values():
+        row = comparison_row(result)
+        print(f"{row[0]:<12} {row[1]:>9.2f} {row[2]:>9.2f} {row[3]:>9.2f} " +
+              " ".join(f"{value:>8}" for value in row[4:10]) + f" {row[10]:>9} {row[11]:>9}")
+
+def print_sweep(results):
+    best = best_quantum(results)
+    print(f"{'Quantum':>8} {'Avg WT':>9} {'WT p95':>8} {'WT p99':>8} {'WT max':>8} {'Switches':>9}")
+    for result in results:
+        waiting = result["waiting"]
+        marker = "  <- best" if result["quantum"] == best else ""
+        print(f"{result['quantum']:>8} {result['averages']['waiting']:>9.2f} {waiting['p95']:>8} "
+              f"{waiting['p99']:>8} {waiting['max']:>8} {result['context_switches']:>9}{marker}")
+
+def write_comparison(path, results):
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(("quantum",) + COMPARISON_FIELDS)
+            for result in results:
+                writer.writerow([result["quantum"]] + comparison_row(result))
+
+def run_compare(args):
+    try:
+        processes = load_table(args)
+    except WorkloadError as e:
+        for error in e.errors:
+            print(f"schedulizer: {error}", file=sys.stderr)
+        return 1
+
+    if args.sweep:
+        results = sweep_quantum(processes, args.sweep, workers=args.jobs)
+        if args.output:
+            write_comparison(args.output, results)
+        else:
+            print_sweep(results)
+        return 0
+
+    results = compare_algorithms(processes, quantum=args.quantum, workers=args.jobs)
+    if args.output:
+        write_comparison(args.output, list(results.values()))
+    else:
+        print_comparison(results)
+    return 0
+
+def run_streaming(args):
+    # Reads the trace lazily and writes each process out as it finishes, so memory
+    # tracks the processes in the system rather than the size of the trace.
+    # Bad rows are reported and skipped.
+    bad_rows = 0
+
+    def report(error):
+        nonlocal bad_rows
+        bad_rows += 1
+        print(f"schedulizer: {error}", file=sys.stderr)
+
+    metrics = StreamingMetrics()
+    trace = SchedulerTrace() if args.trace else None
+    out = open(args.output, "w", newline="") if args.output else None
+    saved = ScheduleWriter(args.save, **schedule_metadata(args)) if args.save else None
+    try:
+        write = row_writer(out, args.output)
+
+        def on_finish(p):
+            process_metrics(p)
+            metrics.add(p)
+            write(p)
+            if saved:
+                saved.add_process(p)
+
+        def on_segment(segment):
+            if args.gantt:
+                print_segment(segment)
+            if saved:
+                saved.add_segment(*segment)
+
+        gantt = SegmentStream(on_segment)
+        processes = iter_workload(args.workload, report, check_order=True)
+        run_stream(args.algorithm, processes, args.quantum, gantt, on_finish, trace, **args.options)
+        gantt.close()
+        if saved:
+            saved.close()
+            saved = None
+    finally:
+        if out is not None:
+            out.close()
+        if saved:
+            saved.discard()
+
+    print_averages(metrics.totals.averages())
+    if args.percentiles:
+        print_percentiles(metrics.summary())
+    if args.metrics:
+        write_metrics(args.metrics, metrics)
+    if trace:
+        finish_trace(args, trace)
+    return 1 if bad_rows else 0
+
+def run_replay(args):
+    # Reads a saved schedule back. --window limits the Gantt segments to a time
+    # window, and the process rows to those in the system during it.
+    with ScheduleFile(args.workload) as schedule:
+        info = schedule.metadata
+        print(f"Saved run of {info.get('algorithm', '?')} on {info.get('workload', '?')}: "
+              f"{len(schedule)} processes, {len(schedule.lanes)} CPU(s), "
+              f"makespan {schedule.end_time()}")
+        start, end = args.window or (0, schedule.end_time())
+        if args.gantt:
+            for lane in range(len(schedule.lanes)):
+                if len(schedule.lanes) > 1:
+                    print(f"CPU {lane}:")
+                for segment in schedule.segments(start, end, lane):
+                    print_segment(segment)
+            print()
+
+        if args.window:
+            rows = (schedule.process(index) for index in schedule.active(start, end))
+        else:
+            rows = schedule.processes()
+        out = open(args.output, "w", newline="") if args.output else None
+        try:
+            write = row_writer(out, args.output)
+            for p in rows:
+                write(p)
+        finally:
+            if out is not None:
+                out.close()
+
+        metrics = schedule.metrics()
+        print_averages(metrics.totals.averages())
+        if len(schedule.lanes) > 1:
+            for core, busy in enumerate(schedule.utilization()):
+                print(f"CPU {core}: {busy:.1%} busy")
+        if args.percentiles:
+            print_percentiles(metrics.summary())
+        if args.metrics:
+            write_metrics(args.metrics, metrics)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="schedulizer",
+        description="Run a CPU scheduling algorithm on a workload without starting the GUI.")
+    parser.add_argument("workload", nargs="?",
+                        help="CSV or JSONL file with pid, arrival, service and priority fields, "
+                             "or a schedule saved with --save to read back")
+    parser.add_argument("--generate", type=int, metavar="COUNT",
+                        help="run on COUNT generated processes instead of a workload file")
+    parser.add_argument("-a", "--algorithm", choices=ALGORITHMS, default="fcfs")
+    parser.add_argument("-q", "--quantum", type=int, default=4,
+                        help="time quantum for rr, minimum slice for cfs and top-level quantum "
+                             "for mlfq (default: 4)")
+    parser.add_argument("--latency", type=int,
+                        help="cfs: period in which every ready process runs once (default: 8 quanta)")
+    parser.add_argument("--levels", type=int,
+                        help="mlfq: number of queue levels, each with twice the quantum of the one "
+                             "above (default: 3)")
+    parser.add_argument("--boost", type=int,
+                        help="mlfq: move every waiting process back to the top level this often, "
+                             "0 to never (default: 10 times the lowest level's quantum)")
+    parser.add_argument("--cpus", type=int, default=1,
+                        help="number of CPUs to schedule on, with one Gantt lane each (default: 1)")
+    parser.add_argument("--run-queues", choices=RUN_QUEUES, default="global",
+                        help="with --cpus, share one ready queue or give each CPU its own, "
+                             "with work stealing (default: global)")
+    parser.add_argument("-o", "--output", help="write per-process results to a .csv or .json file "
+                                               "(.csv or .jsonl with --stream)")
+    parser.add_argument("--gantt", action="store_true", help="also print the Gantt segments")
+    parser.add_argument("--save", metavar="FILE",
+                        help="save the schedule and per-process results as a compact binary file")
+    parser.add_argument("--window", metavar="START:END",
+                        help="when reading a saved schedule, only show the segments and processes "
+                             "in this time window")
+    parser.add_argument("--stream", action="store_true",
+                        help="read an arrival-sorted trace lazily and write results as processes finish")
+    parser.add_argument("--percentiles", action="store_true",
+                        help="print p50/p95/p99/max waiting time and turnaround, overall and per priority")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write the percentile summary and mergeable histogram state as JSON")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write every scheduling decision as Chrome trace-event JSON (open in "
+                             "Perfetto) and print dispatch, preemption and ready-queue counters")
+    parser.add_argument("--no-cache", action="store_true", help="don't read or write the result cache")
+    parser.add_argument("--cache-dir", help="result cache directory (default: ~/.cache/schedulizer)")
+    parser.add_argument("--compare", action="store_true",
+                        help="run every algorithm on the workload in parallel and print one row each")
+    parser.add_argument("--sweep", metavar="QUANTA",
+                        help="run rr for each quantum in start:stop[:step] or a comma-separated list")
+    parser.add_argument("--parallel", action="store_true",
+                        help="split the workload where the CPU goes idle and schedule the parts in "
+                             "parallel; the result is the same as a serial run")
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="worker processes for --compare, --sweep and --parallel "
+                             "(default: one per CPU)")
+    add_generator_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.quantum < 1:
+        parser.error("quantum must be a positive integer")
+    if args.cpus < 1:
+        parser.error("cpus must be a positive integer")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("jobs must be a positive integer")
+    args.options = {}
+    for option, algorithm, minimum in (("latency", "cfs", 1), ("levels", "mlfq", 1), ("boost", "mlfq", 0)):
+        value = getattr(args, option)
+        if value is None:
+            continue
+        if args.algorithm != algorithm or args.compare or args.sweep:
+            parser.error(f"--{option} only applies to a single {algorithm} run")
+        if value < minimum:
+            parser.error(f"{option} must be at least {minimum}")
+        args.options[option] = value
+    if args.compare and args.sweep:
+        parser.error("--compare and --sweep are separate modes")
+    if args.cpus > 1 and (args.stream or args.compare or args.sweep or args.trace):
+        parser.error("--cpus cannot be combined with --stream, --compare, --sweep or --trace")
+    if args.parallel and (args.cpus > 1 or args.stream or args.compare or args.sweep or args.trace):
+        parser.error("--parallel runs a single batch run on one CPU, without --trace")
+    if args.stream and args.output and args.output.endswith(".json"):
+        parser.error("--stream writes .csv or .jsonl output")
+    if args.stream and args.gantt and not args.output:
+        parser.error("--stream with --gantt needs --output for the per-process results")
+
+    if args.sweep:
+        try:
+            args.sweep = parse_quanta(args.sweep)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.window:
+        try:
+            args.window = parse_window(args.window)
+        except ValueError as e:
+            parser.error(str(e))
+    if (args.compare or args.sweep) and args.save:
+        parser.error("--save saves a single run, not --compare or --sweep")
+
+    if args.generate is not None:
+        if args.workload:
+            parser.error("give a workload file or --generate, not both")
+        if args.stream:
+            parser.error("--generate builds the workload in memory; write a trace with "
+                         "python -m schedulizer.generate to use --stream")
+        if args.generate < 0:
+            parser.error("count must be non-negative")
+        try:
+            args.generator = generator_options(args)
+        except ValueError as e:
+            parser.error(str(e))
+    elif not args.workload:
+        parser.error("a workload file or --generate is required")
+    elif is_schedule_file(args.workload):
+        if (args.compare or args.sweep or args.stream or args.trace or args.save or args.cpus > 1
+                or args.parallel):
+            parser.error("a saved schedule can only be read back, not run again")
+        if args.output and args.output.endswith(".json"):
+            parser.error("a saved schedule writes .csv or .jsonl output")
+        try:
+            return run_replay(args)
+        except (OSError, ValueError) as e:
+            parser.exit(1, f"schedulizer: {e}\n")
+    if args.window:
+        parser.error("--window reads back a schedule saved with --save")
+    if (args.compare or args.sweep) and args.stream:
+        parser.error("--compare and --sweep cannot be combined with --stream")
+    if (args.compare or args.sweep) and args.trace:
+        parser.error("--trace traces a single run, not --compare or --sweep")
+
+    try:
+        if args.compare or args.sweep:
+            return run_compare(args)
+        if args.stream:
+            return run_streaming(args)
+        return run_batch(args)
+    except OSError as e:
+        parser.exit(1, f"schedulizer: {e}\n")
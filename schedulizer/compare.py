@@ -0,0 +1,120 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .algorithms import ALGORITHMS, TIME_SLICED, run_stream
+from .gantt import ScheduleStats, SegmentStream
+from .metrics import StreamingMetrics, process_metrics
+from .table import ProcessTable
+
+# Each pool worker receives the workload once, through the initializer, and keeps
+# it here. Runs read it through ProcessTable.processes(), which builds fresh Process
+# objects, so no run mutates state shared with the parent or another run.
+worker_table = None
+
+def init_worker(table):
+    global worker_table
+    worker_table = table
+
+def run_on_worker(name, quantum):
+    return simulate_summary(worker_table, name, quantum)
+
+def simulate_summary(table, name, quantum):
+    # Runs one algorithm on an arrival-sorted table and summarises it without
+    # keeping the Gantt segments or the finished processes
+    stats = ScheduleStats()
+    gantt = SegmentStream(stats)
+    metrics = StreamingMetrics()
+
+    def record(p):
+        process_metrics(p)
+        metrics.add(p)
+
+    run_stream(name, table.processes(), quantum, gantt, record)
+    gantt.close()
+
+    summary = metrics.summary()
+    summary["algorithm"] = name
+    summary["label"] = ALGORITHMS[name][0]
+    summary["quantum"] = quantum if name in TIME_SLICED else None
+    summary["dispatches"] = stats.dispatches
+    summary["context_switches"] = stats.context_switches
+    summary["makespan"] = stats.makespan
+    summary["utilization"] = stats.busy_time / stats.makespan if stats.makespan else 0
+    return summary
+
+COMPARISON_FIELDS = ("algorithm", "avg_tat", "avg_waiting", "avg_ntat", "waiting_p50", "waiting_p95",
+                     "waiting_p99", "waiting_max", "tat_p95", "tat_p99", "context_switches", "makespan")
+
+def comparison_row(result):
+    averages = result["averages"]
+    return [result["algorithm"], averages["tat"], averages["waiting"], averages["ntat"],
+            result["waiting"]["p50"], result["waiting"]["p95"], result["waiting"]["p99"],
+            result["waiting"]["max"], result["tat"]["p95"], result["tat"]["p99"],
+            result["context_switches"], result["makespan"]]
+
+def as_sorted_table(processes):
+    # The workload is converted and sorted once in the parent, not in every worker
+    if not isinstance(processes, ProcessTable):
+        processes = ProcessTable(processes)
+    processes.sort()
+    return processes
+
+def run_tasks(table, tasks, workers=None):
+    # tasks is a list of (algorithm, quantum); results come back in the same order
+    if workers is None:
+        workers = min(len(tasks), os.cpu_count() or 1)
+    if workers <= 1 or len(tasks) <= 1:
+        return [simulate_summary(table, name, quantum) for name, quantum in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(table,)) as pool:
+        futures = [pool.submit(run_on_worker, name, quantum) for name, quantum in tasks]
+        return [future.result() for future in futures]
+
+def compare_algorithms(processes, algorithms=None, quantum=4, workers=None):
+    # Runs every algorithm on the same workload in a process pool and returns one
+    # summary per algorithm, keyed by name in the order of ALGORITHMS
+    algorithms = list(ALGORITHMS if algorithms is None else algorithms)
+    for name in algorithms:
+        if name not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {name}")
+
+    table = as_sorted_table(processes)
+    results = run_tasks(table, [(name, quantum) for name in algorithms], workers)
+    return dict(zip(algorithms, results))
+
+def parse_quanta(text):
+    # "1:20" and "1:100:5" are inclusive ranges; "1,2,4,8" is a list of values
+    try:
+        if ":" in text:
+            parts = [int(part) for part in text.split(":")]
+            if len(parts) not in (2, 3):
+                raise ValueError
+            start, stop = parts[0], parts[1]
+            step = parts[2] if len(parts) == 3 else 1
+            if step < 1:
+                raise ValueError
+            quanta = list(range(start, stop + 1, step))
+        else:
+            quanta = [int(part) for part in text.split(",")]
+    except ValueError:
+        raise ValueError(f"Invalid quantum list: {text!r}. Use start:stop[:step] or a comma-separated list.")
+    if not quanta or min(quanta) < 1:
+        raise ValueError("Quanta must be positive integers")
+    return sorted(set(quanta))
+
+def sweep_quantum(processes, quanta, workers=None):
+    # Runs Round Robin once per quantum on the same parsed workload, in parallel,
+    # and returns the summaries in quantum order
+    quanta = sorted(set(quanta))
+    if not quanta or min(quanta) < 1:
+        raise ValueError("Quanta must be positive integers")
+
+    table = as_sorted_table(processes)
+    return run_tasks(table, [("rr", quantum) for quantum in quanta], workers)
+
+def best_quantum(results):
+    # Lowest average waiting time; ties go to fewer context switches, then the
+    # smaller quantum
+    best = min(results, key=lambda r: (r["averages"]["waiting"], r["context_switches"], r["quantum"]))
+    return best["quantum"]
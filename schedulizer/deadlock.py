@@ -0,0 +1,621 @@
+import csv
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STATE_ROWS = ("available", "allocation", "max")
+
+def read_state(path):
+    # Loads a Banker's state: allocation and max demand matrices plus the available
+    # vector. A .npz file holds arrays named allocation, max and available. In a CSV
+    # file each line starts with available, allocation or max followed by one value
+    # per resource type; allocation and max lines are listed in process order.
+    if path.endswith(".npz"):
+        if np is None:
+            raise ValueError("Reading .npz files requires NumPy")
+        with np.load(path) as data:
+            missing = [name for name in STATE_ROWS if name not in data]
+            if missing:
+                raise ValueError(f"Missing arrays in {path}: {', '.join(missing)}")
+            return data["allocation"], data["max"], data["available"]
+
+    rows = {name: [] for name in STATE_ROWS}
+    with open(path, newline="") as f:
+        for line, record in enumerate(csv.reader(f), start=1):
+            if not record or not record[0].strip():
+                continue
+            name = record[0].strip().lower()
+            if name not in rows:
+                raise ValueError(f"Unknown row type '{record[0]}' in line {line}. "
+                                 "Expected available, allocation or max.")
+            try:
+                rows[name].append([int(value) for value in record[1:] if value.strip()])
+            except ValueError:
+                raise ValueError(f"Invalid value in line {line}. Must be integers.") from None
+
+    if len(rows["available"]) != 1:
+        raise ValueError(f"Expected exactly one available line in {path}")
+    return rows["allocation"], rows["max"], rows["available"][0]
+
+def check_state(allocation, max_demand, available):
+    # Raises ValueError for a state the safety check can't be run on
+    n = len(allocation)
+    m = len(available)
+    if len(max_demand) != n:
+        raise ValueError(f"Allocation has {n} processes but max demand has {len(max_demand)}")
+    for i in range(n):
+        if len(allocation[i]) != m or len(max_demand[i]) != m:
+            raise ValueError(f"Process {i} does not have {m} resource types")
+
+    if np is not None:
+        allocation = np.asarray(allocation, dtype=np.int64).reshape(n, m)
+        max_demand = np.asarray(max_demand, dtype=np.int64).reshape(n, m)
+        bad = np.argwhere((allocation < 0) | (allocation > max_demand))
+        cell = tuple(int(x) for x in bad[0]) if len(bad) else None
+        negative = np.flatnonzero(np.asarray(available) < 0)
+        resource = int(negative[0]) if len(negative) else None
+    else:
+        cell = next(((i, j) for i in range(n) for j in range(m)
+                     if not 0 <= allocation[i][j] <= max_demand[i][j]), None)
+        resource = next((j for j in range(m) if available[j] < 0), None)
+
+    if cell is not None:
+        i, j = cell
+        if allocation[i][j] < 0:
+            raise ValueError(f"Allocation cannot be negative for Process {i}, Resource {j}")
+        raise ValueError(f"Allocation cannot exceed max demand for Process {i}, Resource {j}")
+    if resource is not None:
+        raise ValueError(f"Available instances of Resource {resource} cannot be negative")
+
+def find_safe_sequence(allocation, max_demand, available):
+    # Banker's safety check. Returns the safe sequence, or None if the state is unsafe.
+    #
+    # Rather than rescanning every unfinished process until nothing changes, each
+    # resource type keeps its processes sorted by need and a pointer to the first need
+    # that the available work can't cover. When work grows only the pointers move, and
+    # a process becomes runnable once all m pointers have passed it, so the whole check
+    # is O(n*m*log n). Processes are released in rounds: everything runnable with the
+    # current work, in process order, then everything that release makes runnable.
+    n = len(allocation)
+    m = len(available)
+    if n == 0 or m == 0:
+        return list(range(n))
+    if np is not None:
+        return safe_sequence_numpy(allocation, max_demand, available, n, m)
+
+    need = [[max_demand[i][j] - allocation[i][j] for j in range(m)] for i in range(n)]
+    columns = [sorted(range(n), key=lambda i: need[i][j]) for j in range(m)]
+    work = list(available)
+    passed = [0] * m
+    covered = [0] * n
+    safe_sequence = []
+    runnable = []
+
+    while True:
+        for j in range(m):
+            column = columns[j]
+            k = passed[j]
+            while k < n and need[column[k]][j] <= work[j]:
+                i = column[k]
+                covered[i] += 1
+                if covered[i] == m:
+                    runnable.append(i)
+                k += 1
+            passed[j] = k
+
+        if not runnable:
+            break
+
+        # Simulate execution of this round's processes
+        runnable.sort()
+        for i in runnable:
+            row = allocation[i]
+            for j in range(m):
+                work[j] += row[j]
+        safe_sequence.extend(runnable)
+        runnable = []
+
+    return safe_sequence if len(safe_sequence) == n else None
+
+def safe_sequence_numpy(allocation, max_demand, available, n, m):
+    allocation = np.asarray(allocation, dtype=np.int64).reshape(n, m)
+    need = np.asarray(max_demand, dtype=np.int64).reshape(n, m) - allocation
+    work = np.array(available, dtype=np.int64)
+    unfinished = np.arange(n)
+    safe_sequence = []
+
+    # Compare every unfinished process against work at once while each round still
+    # releases a good share of them; a long tail of small rounds goes to the worklist
+    while len(unfinished):
+        runs = (need[unfinished] <= work).all(axis=1)
+        runnable = unfinished[runs]
+        if len(runnable) == 0:
+            return None
+
+        # Simulate execution of this round's processes
+        work += allocation[runnable].sum(axis=0)
+        safe_sequence.extend(runnable.tolist())
+        unfinished = unfinished[~runs]
+        if len(runnable) * 8 < len(unfinished):
+            rest = worklist_numpy(allocation[unfinished], need[unfinished], work)
+            if rest is None:
+                return None
+            safe_sequence.extend(unfinished[rest].tolist())
+            break
+
+    return safe_sequence
+
+def worklist_numpy(allocation, need, work):
+    # NumPy form of the sorted-threshold worklist in find_safe_sequence. Returns the
+    # order in which the rows can finish, or None if some never can.
+    n, m = need.shape
+
+    # Sort each column of need, then lay the columns end to end with each one shifted
+    # above the last, so one searchsorted call moves the pointers of all m columns.
+    # Row numbers are packed into the low digits of the sort keys to keep them together.
+    lowest = int(need.min())
+    span = int(need.max()) - lowest + 1
+    shift = np.arange(m, dtype=np.int64) * span
+    keys = ((need.T - lowest) + shift[:, None]) * n + np.arange(n)
+    keys.sort(axis=1)
+    keys = keys.ravel()
+    thresholds = keys // n
+    rows = keys - thresholds * n
+
+    passed = np.arange(m, dtype=np.int64) * n
+    covered = np.zeros(n, dtype=np.int64)
+    order = []
+
+    while len(order) < n:
+        limits = np.clip(work - lowest, -1, span - 1) + shift
+        reached = np.searchsorted(thresholds, limits, side="right")
+        lengths = reached - passed
+        total = int(lengths.sum())
+        if total == 0:
+            return None
+
+        # Every row whose need was just covered in some column
+        offsets = np.repeat(passed - np.cumsum(lengths) + lengths, lengths)
+        touched, counts = np.unique(rows[offsets + np.arange(total)], return_counts=True)
+        passed = reached
+        covered[touched] += counts
+        runnable = touched[covered[touched] == m]
+        if len(runnable) == 0:
+            return None
+
+        work += allocation[runnable].sum(axis=0)
+        order.extend(runnable.tolist())
+
+    return order
+
+class BankerState:
+    # Request half of the Banker's algorithm: keeps allocation, need and available
+    # between calls and grants or denies one request at a time.
+    #
+    # The last safe sequence is cached with each process's slack, the work available
+    # at its turn minus its need. Granting r to process p lowers the work of every
+    # process ahead of p by r and leaves the rest of the sequence as it was, so the
+    # grant is safe if the slack of those earlier processes covers r. Only the
+    # resource types in the request are looked at. If the cached order doesn't hold,
+    # a full safety check looks for another one before the grant is rolled back.
+    #
+    # Grants never make an unsafe request safe again, only releases can, so a denied
+    # request is remembered until the next release and any request at least as large
+    # from the same process is denied straight away.
+    def __init__(self, allocation, max_demand, available):
+        check_state(allocation, max_demand, available)
+        self.n = len(allocation)
+        self.m = len(available)
+        if np is not None:
+            self.allocation = np.array(allocation, dtype=np.int64).reshape(self.n, self.m)
+            self.max_demand = np.array(max_demand, dtype=np.int64).reshape(self.n, self.m)
+            self.need = self.max_demand - self.allocation
+            self.available = np.array(available, dtype=np.int64)
+        else:
+            self.allocation = [[int(x) for x in row] for row in allocation]
+            self.max_demand = [[int(x) for x in row] for row in max_demand]
+            self.need = [[mx - a for mx, a in zip(*rows)] for rows in zip(self.max_demand, self.allocation)]
+            self.available = [int(x) for x in available]
+        self.denied = {}
+        if not self.rebuild():
+            raise ValueError("Initial state is unsafe")
+
+    def rebuild(self):
+        # Recomputes the safe sequence and slacks; returns False, leaving the cache
+        # as it was, if the current state is unsafe
+        sequence = find_safe_sequence(self.allocation, self.max_demand, self.available)
+        if sequence is None:
+            return False
+
+        if np is not None:
+            order = np.array(sequence, dtype=np.int64)
+            released = self.allocation[order]
+            work = self.available + np.cumsum(released, axis=0) - released
+            slack = (work - self.need[order]).reshape(self.n, self.m)
+        else:
+            work = list(self.available)
+            slack = []
+            for i in sequence:
+                slack.append([w - x for w, x in zip(work, self.need[i])])
+                work = [w + a for w, a in zip(work, self.allocation[i])]
+
+        self.sequence = sequence
+        self.position = [0] * self.n
+        for k, i in enumerate(sequence):
+            self.position[i] = k
+        self.slack = slack
+        return True
+
+    def request(self, i, amounts):
+        # Returns True if the request was granted. A request that exceeds what is
+        # available, or that would leave the system unsafe, is denied and leaves the
+        # state unchanged.
+        amounts = [int(x) for x in amounts]
+        if any(a < 0 for a in amounts):
+            raise ValueError(f"Process {i} requested a negative amount")
+        if any(a > x for a, x in zip(amounts, self.need[i])):
+            raise ValueError(f"Process {i} requested more than its maximum claim")
+        if any(a > x for a, x in zip(amounts, self.available)):
+            return False
+
+        changed = [j for j in range(self.m) if amounts[j]]
+        if not changed:
+            return True
+        denied = self.denied.get(i, ())
+        if any(all(a >= d for a, d in zip(amounts, smaller)) for smaller in denied):
+            return False
+
+        # Processes ahead of i in the cached sequence stay runnable up to the first one
+        # whose slack doesn't cover the request. If i could already run at that point
+        # it moves there: it gets back everything it asked for when it finishes, so the
+        # processes it overtakes have more work than before.
+        ahead = self.position[i]
+        blocked = self.first_blocked(ahead, changed, amounts)
+        if blocked == ahead or self.runs_at(blocked, i):
+            released = [int(x) for x in self.allocation[i]]
+            self.apply(i, changed, amounts, 1)
+            self.shift_slack(blocked, changed, amounts, -1)
+            if blocked < ahead:
+                self.move_back(i, blocked, ahead, released, amounts)
+            return True
+
+        # Tentative grant
+        self.apply(i, changed, amounts, 1)
+        if self.rebuild():
+            return True
+
+        # Roll back
+        self.apply(i, changed, amounts, -1)
+        self.denied.setdefault(i, []).append(amounts)
+        return False
+
+    def release(self, i, amounts=None):
+        # Returns resources held by process i, all of them if amounts is None. A safe
+        # state stays safe, so the cached sequence only needs its slacks shifted.
+        amounts = [int(x) for x in (self.allocation[i] if amounts is None else amounts)]
+        if any(not 0 <= a <= x for a, x in zip(amounts, self.allocation[i])):
+            raise ValueError(f"Process {i} cannot release more than it holds")
+
+        changed = [j for j in range(self.m) if amounts[j]]
+        if not changed:
+            return
+        self.apply(i, changed, amounts, -1)
+        self.shift_slack(self.position[i], changed, amounts, 1)
+        self.denied.clear()
+
+    def apply(self, i, changed, amounts, sign):
+        allocation = self.allocation[i]
+        need = self.need[i]
+        for j in changed:
+            allocation[j] += sign * amounts[j]
+            need[j] -= sign * amounts[j]
+            self.available[j] -= sign * amounts[j]
+
+    def first_blocked(self, ahead, changed, amounts):
+        # Position of the first process ahead of position `ahead` whose slack is
+        # smaller than the request, or `ahead` if there is none
+        if np is not None:
+            short = (self.slack[:ahead, changed] < [amounts[j] for j in changed]).any(axis=1)
+            return int(short.argmax()) if short.any() else ahead
+        for k in range(ahead):
+            row = self.slack[k]
+            if any(row[j] < amounts[j] for j in changed):
+                return k
+        return ahead
+
+    def runs_at(self, k, i):
+        # Whether process i's current need fits the work available at position k
+        other = self.sequence[k]
+        return all(x <= w + y for x, w, y in zip(self.need[i], self.slack[k], self.need[other]))
+
+    def shift_slack(self, ahead, changed, amounts, sign):
+        if np is not None:
+            self.slack[:ahead, changed] += [sign * amounts[j] for j in changed]
+            return
+        for row in self.slack[:ahead]:
+            for j in changed:
+                row[j] += sign * amounts[j]
+
+    def move_back(self, i, k, ahead, released, amounts):
+        # Moves process i from position `ahead` to position k after a grant. Its slack
+        # there is the work at k less the request, minus its new need; the processes it
+        # overtakes gain what it held before the grant.
+        sequence = self.sequence
+        other = sequence[k]
+        if np is not None:
+            slack = self.slack[k] + self.need[other] - amounts - self.need[i]
+            self.slack[k + 1:ahead + 1] = self.slack[k:ahead] + released
+            self.slack[k] = slack
+        else:
+            slack = [w + y - a - x for w, y, a, x in zip(self.slack[k], self.need[other], amounts, self.need[i])]
+            for row in self.slack[k:ahead]:
+                for j in range(self.m):
+                    row[j] += released[j]
+            self.slack[k + 1:ahead + 1] = self.slack[k:ahead]
+            self.slack[k] = slack
+
+        sequence[k + 1:ahead + 1] = sequence[k:ahead]
+        sequence[k] = i
+        for position in range(k, ahead + 1):
+            self.position[sequence[position]] = position
+
+    def safe_sequence(self):
+        return list(self.sequence)
+
+class WaitForGraph:
+    # Wait-for graph for single-instance resources, with an edge waiter -> holder for
+    # each process waiting on a resource another one holds. The system is deadlocked
+    # exactly when the graph has a cycle.
+    #
+    # Cycles are found incrementally (Pearce-Kelly). The graph keeps a topological
+    # order of its acyclic part, and a new edge that agrees with the order costs O(1).
+    # Otherwise only the nodes between its two ends in the order are searched: either
+    # a path back closes a cycle, or that region is reordered. An edge that closes a
+    # cycle stays out of the order and keeps the cycle as its witness. Removing any
+    # edge of the witness puts it back through the same check, so every reported cycle
+    # is current and the graph is deadlocked whenever some edge is held back. A cycle
+    # through a held-back edge doesn't show in the order, so while the graph is
+    # deadlocked a new edge is also checked by a search that follows held-back edges.
+    def __init__(self):
+        self.order = {}  # Node -> position in the topological order
+        self.succ = {}  # Edges kept in the order
+        self.pred = {}
+        self.cycles_by_edge = {}  # Held-back edge -> the cycle it closes
+        self.held = {}  # Node -> holders it waits on through held-back edges
+        self.held_pred = {}  # Node -> waiters on it through held-back edges
+        self.witnessed = {}  # Ordered edge -> held-back edges whose cycle uses it
+        self.next_order = 0
+
+    def __len__(self):
+        return len(self.order)
+
+    def __bool__(self):
+        # True while the graph is deadlocked
+        return bool(self.cycles_by_edge)
+
+    def add_process(self, node):
+        if node not in self.order:
+            self.order[node] = self.next_order
+            self.next_order += 1
+            self.succ[node] = set()
+            self.pred[node] = set()
+
+    def has_wait(self, waiter, holder):
+        return (waiter in self.succ and holder in self.succ[waiter]) or (waiter, holder) in self.cycles_by_edge
+
+    def add_wait(self, waiter, holder):
+        # Returns the cycle, as a list of processes each waiting on the next, if the
+        # new edge closes one
+        self.add_process(waiter)
+        self.add_process(holder)
+        if self.has_wait(waiter, holder):
+            return self.cycles_by_edge.get((waiter, holder))
+        return self.insert(waiter, holder)
+
+    def remove_wait(self, waiter, holder):
+        edge = (waiter, holder)
+        if edge in self.cycles_by_edge:
+            self.release_cycle(edge)
+        elif waiter in self.succ and holder in self.succ[waiter]:
+            self.succ[waiter].discard(holder)
+            self.pred[holder].discard(waiter)
+        else:
+            raise KeyError(edge)
+        # Edges whose cycle went through this one may fit the order now
+        for held_back in list(self.witnessed.pop(edge, ())):
+            self.release_cycle(held_back)
+            self.insert(*held_back)
+
+    def remove_process(self, node):
+        edges = [edge for edge in self.cycles_by_edge if node in edge]
+        edges += [(node, holder) for holder in self.succ[node]]
+        edges += [(waiter, node) for waiter in self.pred[node]]
+        for edge in edges:
+            # Held-back edges can move into the order as the ones before are removed
+            if self.has_wait(*edge):
+                self.remove_wait(*edge)
+        del self.order[node], self.succ[node], self.pred[node]
+
+    def cycles(self):
+        return list(self.cycles_by_edge.values())
+
+    def deadlocked(self):
+        # Every process on some cycle: the strongly connected components with more
+        # than one process or a process waiting on itself. Each of those has a
+        # held-back edge, so the search starts from them (Tarjan, iteratively).
+        index, low = {}, {}
+        stack, on_stack = [], set()
+        members = set()
+        for root in self.held:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, self.successors(root))]
+            while work:
+                w, successors = work[-1]
+                for x in successors:
+                    if x not in index:
+                        index[x] = low[x] = len(index)
+                        stack.append(x)
+                        on_stack.add(x)
+                        work.append((x, self.successors(x)))
+                        break
+                    if x in on_stack:
+                        low[w] = min(low[w], index[x])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[w])
+                    if low[w] == index[w]:
+                        component = []
+                        while True:
+                            x = stack.pop()
+                            on_stack.discard(x)
+                            component.append(x)
+                            if x == w:
+                                break
+                        if len(component) > 1 or w in self.held.get(w, ()):
+                            members.update(component)
+        return members
+
+    def successors(self, node):
+        return chain(self.succ[node], self.held.get(node, ()))
+
+    def predecessors(self, node):
+        return chain(self.pred[node], self.held_pred.get(node, ()))
+
+    def find_path(self, start, goal):
+        # Processes from start to one waiting on goal, held-back edges included.
+        # Searches breadth-first from both ends, a level of the smaller side at a
+        # time, which stops early in a dense graph and finds a short path.
+        ahead, behind = {start: None}, {goal: None}  # Node -> next one towards the end
+        forward, backward = [start], [goal]
+        while forward and backward:
+            level = []
+            if len(forward) <= len(backward):
+                for w in forward:
+                    for x in self.successors(w):
+                        if x in behind:
+                            return self.join_path(ahead, behind, w, x)
+                        if x not in ahead:
+                            ahead[x] = w
+                            level.append(x)
+                forward = level
+            else:
+                for w in backward:
+                    for x in self.predecessors(w):
+                        if x in ahead:
+                            return self.join_path(ahead, behind, x, w)
+                        if x not in behind:
+                            behind[x] = w
+                            level.append(x)
+                backward = level
+        return None
+
+    def join_path(self, ahead, behind, w, x):
+        # The path through the edge w -> x where the two searches met
+        path = [w]
+        while ahead[path[-1]] is not None:
+            path.append(ahead[path[-1]])
+        path.reverse()
+        while behind[x] is not None:
+            path.append(x)
+            x = behind[x]
+        return path
+
+    def insert(self, u, v):
+        order = self.order
+        if u == v:
+            return self.hold_back(u, v, [u])
+        if self.held:
+            path = self.find_path(v, u)
+            if path is not None:
+                return self.hold_back(u, v, [u] + path)
+        if order[u] < order[v]:
+            self.link(u, v)
+            return None
+
+        # Forward search from v over nodes ordered before u
+        upper = order[u]
+        parent = {v: None}
+        stack = [v]
+        while stack:
+            w = stack.pop()
+            for x in self.succ[w]:
+                if x == u:
+                    path = [w]
+                    while parent[path[-1]] is not None:
+                        path.append(parent[path[-1]])
+                    return self.hold_back(u, v, [u] + path[::-1])
+                if x not in parent and order[x] < upper:
+                    parent[x] = w
+                    stack.append(x)
+
+        # Backward search from u over nodes ordered after v
+        lower = order[v]
+        behind = {u}
+        stack = [u]
+        while stack:
+            w = stack.pop()
+            for x in self.pred[w]:
+                if x not in behind and order[x] > lower:
+                    behind.add(x)
+                    stack.append(x)
+
+        # Reuse the affected positions: u and its predecessors first, then v's successors
+        moved = sorted(behind, key=order.__getitem__) + sorted(parent, key=order.__getitem__)
+        slots = sorted(order[node] for node in moved)
+        for node, slot in zip(moved, slots):
+            order[node] = slot
+        self.link(u, v)
+        return None
+
+    def link(self, u, v):
+        self.succ[u].add(v)
+        self.pred[v].add(u)
+
+    def hold_back(self, u, v, cycle):
+        self.cycles_by_edge[(u, v)] = cycle
+        self.held.setdefault(u, set()).add(v)
+        self.held_pred.setdefault(v, set()).add(u)
+        for k in range(1, len(cycle)):
+            edge = (cycle[k], cycle[(k + 1) % len(cycle)])
+            self.witnessed.setdefault(edge, set()).add((u, v))
+        return cycle
+
+    def release_cycle(self, edge):
+        cycle = self.cycles_by_edge.pop(edge)
+        waiter, holder = edge
+        self.held[waiter].discard(holder)
+        if not self.held[waiter]:
+            del self.held[waiter]
+        self.held_pred[holder].discard(waiter)
+        if not self.held_pred[holder]:
+            del self.held_pred[holder]
+        for k in range(1, len(cycle)):
+            path_edge = (cycle[k], cycle[(k + 1) % len(cycle)])
+            witnessed = self.witnessed.get(path_edge)
+            if witnessed is not None:
+                witnessed.discard(edge)
+                if not witnessed:
+                    del self.witnessed[path_edge]
+
+def wait_for_state(processes, edges):
+    # Banker's state equivalent to a wait-for graph: each process holds one
+    # single-instance resource of its own and needs the resource of every process it
+    # waits for, with nothing available. The state is unsafe exactly when the graph
+    # has a cycle. A process waiting on itself needs a second instance of its own.
+    index = {p: k for k, p in enumerate(processes)}
+    n = len(index)
+    allocation = [[int(i == j) for j in range(n)] for i in range(n)]
+    max_demand = [row[:] for row in allocation]
+    for waiter, holder in edges:
+        i, j = index[waiter], index[holder]
+        max_demand[i][j] = 2 if i == j else 1
+    return allocation, max_demand, [0] * n
@@ -0,0 +1,241 @@
+from collections import deque
+from operator import attrgetter
+from time import perf_counter_ns
+import heapq
+
+from .gantt import add_segment
+from .metrics import StreamingMetrics, process_metrics
+from .queues import FairQueue, FeedbackQueue, ResponseRatioQueue
+
+# Ready queues for the online engine. push takes (process, arrival order, time) and
+# pop(time) returns (arrival order, process), so a preempted process can be put back
+# with its original tie-breaking order. Queues of preemptive policies also have
+# peek(), the key of the process pop would return. Time-sliced queues have
+# slice(process, order, time), how long a dispatched process may run before it is
+# queued again, and retire(order, time), called when it finishes.
+
+class FifoQueue:
+    def __init__(self):
+        self.queue = deque()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def push(self, process, order, time):
+        self.queue.append((order, process))
+
+    def pop(self, time):
+        return self.queue.popleft()
+
+class RoundRobinQueue(FifoQueue):
+    def __init__(self, quantum):
+        super().__init__()
+        self.quantum = quantum
+
+    def slice(self, process, order, time):
+        return self.quantum
+
+    def retire(self, order, time):
+        pass
+
+class HeapQueue:
+    def __init__(self, key):
+        self.key = key
+        self.heap = []  # Heap of (key, arrival order, process)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, process, order, time):
+        heapq.heappush(self.heap, (self.key(process), order, process))
+
+    def pop(self, time):
+        _, order, process = heapq.heappop(self.heap)
+        return order, process
+
+    def peek(self):
+        # (key, arrival order) of the process pop would return
+        return self.heap[0][:2]
+
+class RatioQueue(ResponseRatioQueue):
+    # HRRN never puts a running process back, so its order is not needed after dispatch
+    def pop(self, time):
+        return None, super().pop(time)
+
+# Algorithm name -> (ready queue factory taking the quantum and any algorithm
+# options, preempts on arrival)
+POLICIES = {
+    "fcfs": (lambda quantum: FifoQueue(), False),
+    "rr": (RoundRobinQueue, False),
+    "spn": (lambda quantum: HeapQueue(attrgetter("service")), False),
+    "srt": (lambda quantum: HeapQueue(attrgetter("remaining")), True),
+    "hrrn": (lambda quantum: RatioQueue(), False),
+    "priority-np": (lambda quantum: HeapQueue(attrgetter("priority")), False),
+    "priority-p": (lambda quantum: HeapQueue(attrgetter("priority")), True),
+    "cfs": (lambda quantum, latency=None: FairQueue(quantum, latency), False),
+    "mlfq": (FeedbackQueue, True),
+}
+
+class OnlineScheduler:
+    # Incremental counterpart of the run_* functions. Processes can be submitted at any
+    # point, and the simulation is advanced explicitly, so the ready queue, remaining
+    # times, Gantt chart and metrics carry over from one call to the next. Work per
+    # event is the same as in the batch schedulers, and submitting a process never
+    # replays what has already been simulated.
+    #
+    # The clock only moves forward. Events at time t are settled once the engine is
+    # advanced past t or stepped to it; after that a process may no longer arrive at
+    # t, since the decision it would have taken part in is already made. Submitting
+    # everything up front gives the same schedule as run_stream. trace takes a
+    # SchedulerTrace, as in the batch schedulers; options go to cfs and mlfq.
+    def __init__(self, name, quantum=4, gantt=None, on_finish=None, trace=None, **options):
+        if name not in POLICIES:
+            raise ValueError(f"Unknown algorithm: {name}")
+
+        new_queue, self.preemptive = POLICIES[name]
+        self.name = name
+        self.ready = new_queue(quantum, **options)
+        self.timesliced = hasattr(self.ready, "slice")
+        self.pending = []  # Heap of (arrival, submission number, process)
+        self.submitted = 0
+        self.admitted = 0
+        self.time = 0
+        self.settled = False
+        self.current = None
+        self.current_order = None
+        self.slice_end = 0
+        self.idle_since = 0
+        self.gantt = [] if gantt is None else gantt
+        self.on_finish = on_finish
+        self.trace = trace
+        self.metrics = StreamingMetrics()
+
+    def __bool__(self):
+        # True while any submitted process is still unfinished
+        return bool(self.pending or self.ready or self.current is not None)
+
+    def submit(self, process):
+        if process.arrival < self.time or (process.arrival == self.time and self.settled):
+            raise ValueError(f"Process {process.pid} arrives at {process.arrival}, "
+                             f"but the schedule is already decided up to time {self.time}")
+
+        process.remaining = process.service
+        process.completed = False
+        process.finish = 0
+        heapq.heappush(self.pending, (process.arrival, self.submitted, process))
+        self.submitted += 1
+
+    def extend(self, processes):
+        for p in processes:
+            self.submit(p)
+
+    def next_event(self):
+        # Time of the next arrival or end of the running slice; None once all work is done
+        time = self.pending[0][0] if self.pending else None
+        if self.current is not None and (time is None or self.slice_end < time):
+            time = self.slice_end
+        return time
+
+    def decisions(self, until=None):
+        # Simulates every event before until, or to completion if until is None.
+        # Yields (time, process) whenever the CPU switches, with process None when it
+        # goes idle. New processes may be submitted between yields.
+        while True:
+            time = self.next_event()
+            if time is None or (until is not None and time >= until):
+                break
+            yield from self.process_events(time)
+
+        if until is not None and until > self.time:
+            self.run_to(until)
+            self.settled = False
+
+    def advance(self, until=None):
+        for _ in self.decisions(until):
+            pass
+
+    def step(self):
+        # Settles the events at the next event time and returns the decisions made there
+        time = self.next_event()
+        if time is None:
+            return []
+        return list(self.process_events(time))
+
+    def run(self):
+        self.advance()
+        return self.gantt
+
+    def run_to(self, time):
+        if self.current is not None:
+            add_segment(self.gantt, self.time, time, self.current.pid)
+            self.current.remaining -= time - self.time
+        self.time = time
+
+    def admit(self, time):
+        arrived = False
+        while self.pending and self.pending[0][0] <= time:
+            p = heapq.heappop(self.pending)[2]
+            self.ready.push(p, self.admitted, time)
+            self.admitted += 1
+            arrived = True
+            if self.trace:
+                self.trace.arrive(p)
+        return arrived
+
+    def process_events(self, time):
+        previous = self.current
+        self.run_to(time)
+
+        trace = self.trace
+        current = self.current
+        if current is not None and current.remaining == 0:
+            if trace:
+                trace.release(time, current, True)
+            self.finish(current)
+            current = None
+        elif current is not None and self.timesliced and time == self.slice_end:
+            # Slice expired: processes arriving meanwhile queue ahead of it
+            self.admit(time)
+            if trace:
+                trace.release(time, current, False)
+            self.ready.push(current, self.current_order, time)
+            current = None
+
+        if self.admit(time) and current is not None and self.preemptive:
+            if trace:
+                trace.release(time, current, False)
+            self.ready.push(current, self.current_order, time)
+            current = None
+
+        if current is None:
+            if self.ready:
+                if previous is None:
+                    add_segment(self.gantt, self.idle_since, time, None)
+                if trace:
+                    started = perf_counter_ns()
+                    self.current_order, current = self.ready.pop(time)
+                    trace.select(time, current, perf_counter_ns() - started)
+                else:
+                    self.current_order, current = self.ready.pop(time)
+                run_time = current.remaining
+                if self.timesliced:
+                    run_time = min(self.ready.slice(current, self.current_order, time), run_time)
+                self.slice_end = time + run_time
+            else:
+                self.idle_since = time
+            self.current = current
+
+        self.settled = True
+        if current is not previous:
+            yield time, current
+
+    def finish(self, p):
+        if self.timesliced:
+            self.ready.retire(self.current_order, self.time)
+        p.finish = self.time
+        p.completed = True
+        process_metrics(p)
+        self.metrics.add(p)
+        if self.on_finish:
+            self.on_finish(p)
+        self.current = None
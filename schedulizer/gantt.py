@@ -0,0 +1,166 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .table import int_column, np
+
+def add_segment(gantt, start, end, pid):
+    # Gantt entries are (start, end, pid) runs; pid is None while the CPU is idle
+    if start >= end:
+        return
+    if gantt and gantt[-1][2] == pid and gantt[-1][1] == start:
+        gantt[-1] = (gantt[-1][0], end, pid)
+    else:
+        gantt.append((start, end, pid))
+
+class SegmentStream:
+    # Stands in for the gantt list when a run is streamed. Only the last segment is
+    # kept, since add_segment may still extend it; earlier ones go to the callback.
+    def __init__(self, callback):
+        self.callback = callback
+        self.last = None
+
+    def __bool__(self):
+        return self.last is not None
+
+    def __getitem__(self, index):
+        if index != -1 or self.last is None:
+            raise IndexError("only the last segment of a stream is available")
+        return self.last
+
+    def __setitem__(self, index, segment):
+        if index != -1 or self.last is None:
+            raise IndexError("only the last segment of a stream is available")
+        self.last = segment
+
+    def append(self, segment):
+        if self.last is not None:
+            self.callback(self.last)
+        self.last = segment
+
+    def close(self):
+        if self.last is not None:
+            self.callback(self.last)
+            self.last = None
+
+class ScheduleStats:
+    # Segment callback for SegmentStream that keeps counts instead of the segments.
+    # A context switch is the CPU going straight from one process to another.
+    def __init__(self):
+        self.dispatches = 0
+        self.context_switches = 0
+        self.busy_time = 0
+        self.makespan = 0
+        self.last_pid = None
+
+    def __call__(self, segment):
+        start, end, pid = segment
+        self.makespan = end
+        if pid is not None:
+            self.dispatches += 1
+            self.busy_time += end - start
+            if self.last_pid is not None:
+                self.context_switches += 1
+        self.last_pid = pid
+
+def shift_column(column, offset):
+    if np is not None:
+        return int_column(np.frombuffer(column, dtype=np.int64) + offset)
+    return array("q", (value + offset for value in column))
+
+class SegmentColumns:
+    # Column form of a Gantt chart for time-range queries: parallel start, end and
+    # pid-code arrays in time order, with idle stored as code -1. busy[i] is the CPU
+    # time used before segment i, so busy time over any window is two lookups.
+    def __init__(self, gantt=()):
+        self.starts = array("q")
+        self.ends = array("q")
+        self.codes = array("q")
+        self.busy = array("q")
+        self.pid_names = []
+        self.pid_codes = {}
+        self.busy_total = 0
+        self.extend(gantt)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def pid_code(self, pid):
+        code = self.pid_codes.get(pid)
+        if code is None:
+            code = self.pid_codes[pid] = len(self.pid_names)
+            self.pid_names.append(pid)
+        return code
+
+    def extend(self, segments):
+        for start, end, pid in segments:
+            if pid is None:
+                code = -1
+            else:
+                code = self.pid_codes.get(pid)
+                if code is None:
+                    code = self.pid_codes[pid] = len(self.pid_names)
+                    self.pid_names.append(pid)
+            # A batch may continue the last segment of the previous one
+            if self.starts and self.ends[-1] == start and self.codes[-1] == code:
+                if code >= 0:
+                    self.busy_total += end - start
+                self.ends[-1] = end
+                continue
+            self.starts.append(start)
+            self.ends.append(end)
+            self.codes.append(code)
+            self.busy.append(self.busy_total)
+            if code >= 0:
+                self.busy_total += end - start
+
+    def join(self, other, first=0, last=None):
+        # Appends segments first to last of another chart, a slice of columns at a
+        # time. The first of them must not continue the last segment here.
+        last = len(other) if last is None else last
+        if first >= last:
+            return
+        codes = other.codes[first:last]
+        if other.pid_names is not self.pid_names:
+            mapping = [self.pid_code(pid) for pid in other.pid_names]
+            if np is not None:
+                codes = int_column(np.array(mapping + [-1], dtype=np.int64)[np.frombuffer(codes, dtype=np.int64)])
+            else:
+                codes = array("q", (mapping[code] if code >= 0 else -1 for code in codes))
+        before = other.busy[first]
+        after = other.busy[last] if last < len(other) else other.busy_total
+        self.starts.extend(other.starts[first:last])
+        self.ends.extend(other.ends[first:last])
+        self.codes.extend(codes)
+        self.busy.extend(shift_column(other.busy[first:last], self.busy_total - before))
+        self.busy_total += after - before
+
+    def end_time(self):
+        return self.ends[-1] if self.ends else 0
+
+    def find(self, time):
+        # Index of the last segment starting at or before time, or -1
+        return bisect_right(self.starts, time) - 1
+
+    def window(self, start, end):
+        # Segments overlapping [start, end) as (start, end, pid), in time order
+        first = self.find(start)
+        if first < 0 or self.ends[first] <= start:
+            first += 1
+        for i in range(first, bisect_left(self.starts, end)):
+            code = self.codes[i]
+            yield self.starts[i], self.ends[i], self.pid_names[code] if code >= 0 else None
+
+    def busy_until(self, time):
+        i = self.find(time)
+        if i < 0:
+            return 0
+        busy = self.busy[i]
+        if self.codes[i] >= 0:
+            busy += min(time, self.ends[i]) - self.starts[i]
+        return busy
+
+    def pid_at(self, time):
+        i = self.find(time)
+        if i < 0 or time >= self.ends[i] or self.codes[i] < 0:
+            return None
+        return self.pid_names[self.codes[i]]
@@ -0,0 +1,268 @@
+import math
+import zlib
+from bisect import bisect_left
+
+from PyQt5.QtWidgets import QAbstractScrollArea
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QBrush, QColor, QFontMetrics, QPainter, QPen
+
+from .gantt import SegmentColumns
+
+CLASSIC_COLORS = {
+    'P1': QColor(255, 0, 0),    # Red
+    'P2': QColor(0, 255, 0),    # Green
+    'P3': QColor(0, 0, 255),    # Blue
+    'P4': QColor(255, 255, 0),  # Yellow
+    'P5': QColor(255, 0, 255),  # Magenta
+    'P6': QColor(0, 255, 255),  # Cyan
+    'P7': QColor(128, 0, 0),    # Dark Red
+    'P8': QColor(0, 128, 0),    # Dark Green
+    'P9': QColor(0, 0, 128),    # Dark Blue
+    'P10': QColor(128, 128, 0)  # Dark Yellow
+}
+
+def pid_color(pid):
+    # P1-P10 keep their original colors; any other PID gets a hue derived from a
+    # hash of its name, so it is stable across runs and charts
+    if pid in CLASSIC_COLORS:
+        return CLASSIC_COLORS[pid]
+    hue = (zlib.crc32(pid.encode()) * 0.618033988749895) % 1.0
+    return QColor.fromHsvF(hue, 0.55, 0.95)
+
+class LaneColors:
+    # PID code -> color, picked the first time a code is drawn, so a lane over a
+    # saved schedule with millions of PIDs doesn't build a color for each of them
+    def __init__(self, pid_names):
+        self.pid_names = pid_names
+        self.colors = {}
+
+    def __getitem__(self, code):
+        color = self.colors.get(code)
+        if color is None:
+            color = self.colors[code] = pid_color(self.pid_names[code])
+        return color
+
+def nice_step(span):
+    # Smallest 1/2/5 x 10^k step at least as large as span
+    if span <= 1:
+        return 1
+    power = 10 ** math.floor(math.log10(span))
+    for factor in (1, 2, 5, 10):
+        if factor * power >= span:
+            return factor * power
+    return 10 * power
+
+class GanttView(QAbstractScrollArea):
+    # Gantt chart that paints only the visible time window straight from
+    # SegmentColumns, so the cost of a frame depends on the widget width rather than
+    # the schedule length. Level of detail follows the zoom:
+    # - segments wide enough for text get a PID label,
+    # - narrower ones are drawn as plain blocks,
+    # - once segments are smaller than a pixel, each pixel column shows the process
+    #   running at its midpoint, with a strip below for the busy fraction.
+    # The time axis picks a 1/2/5 step so labels never crowd together.
+    # The mouse wheel scrolls; Ctrl+wheel zooms around the cursor.
+    # A multi-CPU schedule gets one lane per core, shrunk to fit the height.
+    MARGIN = 10
+    LANE_LABEL_WIDTH = 50
+    BAR_TOP = 10
+    BAR_HEIGHT = 30
+    MAX_SCALE = 200.0  # pixels per time unit
+    LABEL_SPACING = 70  # minimum pixels between time labels
+    SCROLL_STEPS = 1000000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.lanes = [SegmentColumns()]
+        self.lane_colors = [LaneColors([])]
+        self.end = 0
+        self.margin = self.MARGIN
+        self.scale = 30.0
+        self.offset = 0.0
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.horizontalScrollBar().setRange(0, 0)
+        self.horizontalScrollBar().valueChanged.connect(self.scrolled)
+
+    def set_segments(self, gantt):
+        self.set_lanes([gantt])
+
+    def set_lanes(self, gantts):
+        # One Gantt chart per CPU, drawn top to bottom
+        self.lanes = [g if isinstance(g, SegmentColumns) else SegmentColumns(g) for g in gantts]
+        self.lane_colors = [LaneColors(lane.pid_names) for lane in self.lanes]
+        self.end = max(lane.end_time() for lane in self.lanes)
+        self.margin = self.MARGIN + (self.LANE_LABEL_WIDTH if len(self.lanes) > 1 else 0)
+        self.offset = 0.0
+        # Start zoomed out so the whole schedule fits the width
+        self.scale = self.fit_scale()
+        self.update_scrollbar()
+        self.viewport().update()
+
+    def append_segments(self, segments, lane=0):
+        columns = self.lanes[lane]
+        # A chart zoomed out to fit keeps fitting while a run streams in
+        fitted = self.scale <= self.fit_scale()
+        columns.extend(segments)
+        self.end = max(self.end, columns.end_time())
+        if fitted:
+            self.scale = self.fit_scale()
+        self.update_scrollbar()
+        self.viewport().update()
+
+    def refresh(self):
+        # Redraws after the lanes were changed in place, keeping the zoom and
+        # position where they still fit
+        fitted = self.scale <= self.fit_scale()
+        self.end = max(lane.end_time() for lane in self.lanes)
+        self.scale = self.fit_scale() if fitted else max(self.scale, self.fit_scale())
+        self.offset = min(self.offset, self.max_offset())
+        self.update_scrollbar()
+        self.viewport().update()
+
+    def clear(self):
+        self.set_segments([])
+
+    def plot_width(self):
+        return max(1, self.viewport().width() - self.margin - self.MARGIN)
+
+    def lane_pitch(self):
+        # (distance between lane tops, bar height); lanes thinner than a few pixels
+        # are packed without a gap so that every core still fits
+        if len(self.lanes) == 1:
+            return self.BAR_HEIGHT, self.BAR_HEIGHT
+        room = self.viewport().height() - self.BAR_TOP - 30
+        pitch = max(1.0, min(self.BAR_HEIGHT + 2.0, room / len(self.lanes)))
+        return pitch, pitch - 2 if pitch >= 6 else pitch
+
+    def fit_scale(self):
+        return self.plot_width() / self.end if self.end else 30.0
+
+    def visible_span(self):
+        return self.plot_width() / self.scale
+
+    def max_offset(self):
+        # Ignore rounding slack left over when the chart is zoomed out to fit
+        slack = self.end - self.visible_span()
+        return slack if slack > 1e-9 * self.end else 0.0
+
+    def update_scrollbar(self):
+        bar = self.horizontalScrollBar()
+        bar.blockSignals(True)
+        if self.max_offset() > 0:
+            bar.setRange(0, self.SCROLL_STEPS)
+            bar.setPageStep(max(1, int(self.SCROLL_STEPS * self.visible_span() / self.end)))
+            bar.setValue(int(self.SCROLL_STEPS * self.offset / self.max_offset()))
+        else:
+            bar.setRange(0, 0)
+        bar.blockSignals(False)
+
+    def scrolled(self, value):
+        self.offset = self.max_offset() * value / self.SCROLL_STEPS
+        self.viewport().update()
+
+    def zoom(self, factor, anchor_x):
+        anchor_time = self.offset + (anchor_x - self.margin) / self.scale
+        self.scale = min(self.MAX_SCALE, max(self.fit_scale(), self.scale * factor))
+        self.offset = min(self.max_offset(), max(0.0, anchor_time - (anchor_x - self.margin) / self.scale))
+        self.update_scrollbar()
+        self.viewport().update()
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if event.modifiers() & Qt.ControlModifier:
+            self.zoom(1.25 ** steps, event.pos().x())
+        else:
+            self.offset = min(self.max_offset(), max(0.0, self.offset - steps * self.visible_span() / 10))
+            self.update_scrollbar()
+            self.viewport().update()
+        event.accept()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.scale = max(self.scale, self.fit_scale())
+        self.offset = min(self.offset, self.max_offset())
+        self.update_scrollbar()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        if not self.end:
+            return
+
+        t0 = self.offset
+        t1 = t0 + self.visible_span()
+        pitch, height = self.lane_pitch()
+        top = self.BAR_TOP
+        for lane, (columns, colors) in enumerate(zip(self.lanes, self.lane_colors)):
+            if len(self.lanes) > 1 and height >= 10:
+                painter.drawText(QRectF(2, top, self.LANE_LABEL_WIDTH, height),
+                                 Qt.AlignVCenter, f"CPU {lane}")
+            if len(columns):
+                first = max(0, columns.find(t0))
+                last = bisect_left(columns.starts, t1)
+                if last - first > self.plot_width() / 2:
+                    self.paint_aggregated(painter, columns, colors, t0, top, height)
+                else:
+                    self.paint_segments(painter, columns, colors, t0, first, last, top, height)
+            top += pitch
+        self.paint_axis(painter, t0, t1, int(top))
+
+    def x_of(self, time, t0):
+        return self.margin + (time - t0) * self.scale
+
+    def paint_segments(self, painter, columns, colors, t0, first, last, top, height):
+        metrics = QFontMetrics(painter.font())
+        painter.setPen(QPen(Qt.black, 0))
+        for i in range(first, last):
+            x = self.x_of(columns.starts[i], t0)
+            width = (columns.ends[i] - columns.starts[i]) * self.scale
+            code = columns.codes[i]
+            color = colors[code] if code >= 0 else QColor(Qt.lightGray)
+            rect = QRectF(x, top, width, height)
+            painter.fillRect(rect, QBrush(color))
+            if width >= 3 and height >= 6:
+                painter.drawRect(rect)
+            if code >= 0 and height >= metrics.height():
+                pid = columns.pid_names[code]
+                if metrics.horizontalAdvance(pid) + 4 <= width:
+                    painter.drawText(rect, Qt.AlignCenter, pid)
+
+    def paint_aggregated(self, painter, columns, colors, t0, top, height):
+        # One sample per pixel column instead of one shape per segment. A single lane
+        # also gets a strip below it for the busy fraction.
+        per_pixel = 1 / self.scale
+        strip = len(self.lanes) == 1
+        strip_top = top + height + 2
+        idle = QColor(Qt.lightGray)
+        busy_color = QColor(60, 60, 60)
+        for px in range(int(self.plot_width())):
+            start = t0 + px * per_pixel
+            end = start + per_pixel
+            middle = start + per_pixel / 2
+            i = columns.find(middle)
+            # A lane ends when its CPU last goes idle, which may be before the chart does
+            code = columns.codes[i] if 0 <= i < len(columns) and middle < columns.ends[i] else -1
+            x = self.margin + px
+            painter.fillRect(QRectF(x, top, 1, height), colors[code] if code >= 0 else idle)
+            if not strip:
+                continue
+            fraction = (columns.busy_until(end) - columns.busy_until(start)) / per_pixel
+            strip_height = 6 * min(1.0, fraction)
+            painter.fillRect(QRectF(x, strip_top + 6 - strip_height, 1, strip_height), busy_color)
+
+    def paint_axis(self, painter, t0, t1, top):
+        painter.setPen(QPen(Qt.black, 0))
+        metrics = QFontMetrics(painter.font())
+        right = self.viewport().width() - 2
+        top = min(top, self.viewport().height() - 26)
+        y = top + 22
+        step = nice_step(self.LABEL_SPACING / self.scale)
+        tick = math.ceil(t0 / step) * step
+        end = min(t1, self.end)
+        while tick <= end:
+            x = self.x_of(tick, t0)
+            painter.drawLine(int(x), top, int(x), top + 4)
+            label = str(int(tick))
+            # Keep the last label inside the viewport instead of clipping it
+            painter.drawText(min(int(x) - 5, right - metrics.horizontalAdvance(label)), y, label)
+            tick += step
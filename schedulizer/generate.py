@@ -0,0 +1,285 @@
+import argparse
+import random
+import sys
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from .table import ProcessTable, np
+
+ARRIVALS = ("poisson", "bursty")
+SERVICES = ("exponential", "pareto", "bimodal")
+CHUNK = 1 << 20  # Processes generated per step, which bounds memory when writing a file
+BURST_SPEEDUP = 10  # Arrivals within a burst come this many times faster than on average
+BIMODAL_RATIO = 10  # Mean of the long mode over the short one
+BIMODAL_SPREAD = 0.2  # Standard deviation of each mode over its mean
+TRACE_FORMATS = {
+    # Text around the pid number and each column, for each trace format
+    "csv": (b"P", b",", b",", b",", b"\n"),
+    "jsonl": (b'{"pid": "P', b'", "arrival": ', b', "service": ', b', "priority": ', b"}\n"),
+}
+CSV_HEADER = b"pid,arrival,service,priority\n"
+
+def parse_mix(text):
+    # "0:5,1:3,2" -> priorities (0, 1, 2) with weights (5, 3, 1); a bare value weighs 1
+    values, weights = [], []
+    for item in text.split(","):
+        value, _, weight = item.partition(":")
+        try:
+            values.append(int(value))
+            weights.append(float(weight) if weight else 1.0)
+        except ValueError:
+            raise ValueError(f"Invalid priority mix item: {item!r}") from None
+    if any(value < 0 for value in values):
+        raise ValueError("priorities must be non-negative")
+    if any(weight < 0 for weight in weights) or not sum(weights) > 0:
+        raise ValueError("priority weights must be non-negative and not all 0")
+    return values, weights
+
+def check_options(arrivals, service, mean_service, load, burst, shape, long_fraction):
+    if arrivals not in ARRIVALS:
+        raise ValueError(f"Unknown arrival process: {arrivals}")
+    if service not in SERVICES:
+        raise ValueError(f"Unknown service distribution: {service}")
+    if not mean_service >= 1:
+        raise ValueError("mean service time must be at least 1")
+    if not load > 0:
+        raise ValueError("load must be positive")
+    if not burst >= 1:
+        raise ValueError("burst size must be at least 1")
+    if service == "pareto" and not shape > 1:
+        raise ValueError("pareto shape must be greater than 1 for a finite mean")
+    if not 0 <= long_fraction < 1:
+        raise ValueError("long fraction must be in [0, 1)")
+
+class Generator:
+    # Draws a workload a chunk at a time, so a trace file of any size is written in
+    # bounded memory. A table and a trace file generated with the same seed and
+    # options hold the same processes.
+    #
+    # Arrival times are spaced so the offered load (service demand per unit of time)
+    # is about load. Poisson arrivals have exponential gaps. Bursty arrivals come in
+    # bursts of burst processes on average, BURST_SPEEDUP times faster than the mean
+    # rate, with longer gaps between bursts to make up for it. Service times are
+    # rounded to whole units of at least 1: exponential, Pareto with the given shape
+    # (heavy-tailed below about 2), or bimodal, where long_fraction of the processes
+    # take BIMODAL_RATIO times longer than the rest. Priorities are drawn from
+    # (values, weights). Uses NumPy when it is installed; the pure-Python fallback
+    # draws a different workload for the same seed.
+    def __init__(self, seed=0, arrivals="poisson", service="exponential", mean_service=5.0,
+                 load=0.9, burst=20, shape=1.5, long_fraction=0.1, priorities=((0,), (1,))):
+        check_options(arrivals, service, mean_service, load, burst, shape, long_fraction)
+        self.arrivals = arrivals
+        self.service = service
+        self.mean_service = mean_service
+        self.shape = shape
+        self.long_fraction = long_fraction
+        self.priorities = list(priorities[0])
+        weights = list(accumulate(priorities[1]))
+        self.cumulative = [weight / weights[-1] for weight in weights]
+
+        self.mean_gap = mean_service / load
+        self.burst_start = 1 / burst
+        self.gap_within = self.mean_gap / BURST_SPEEDUP
+        # The mean gap stays mean_gap: p * between + (1 - p) * within
+        self.gap_between = (self.mean_gap - (1 - self.burst_start) * self.gap_within) / self.burst_start
+        # Mean of the short mode, so the mixture's mean is mean_service
+        self.short_mean = mean_service / (1 - long_fraction + long_fraction * BIMODAL_RATIO)
+
+        self.clock = 0.0
+        self.count = 0
+        if np is not None:
+            streams = np.random.SeedSequence(seed).spawn(4)
+            self.rngs = [np.random.default_rng(stream) for stream in streams]
+        else:
+            self.rngs = [random.Random(f"{seed}-{stream}") for stream in range(4)]
+
+    def chunk(self, count):
+        # Returns the arrival, service and priority columns of the next count processes
+        if np is None:
+            return self.chunk_python(count)
+        arrival_rng, service_rng, choice_rng, priority_rng = self.rngs
+
+        gaps = arrival_rng.standard_exponential(count)
+        if self.arrivals == "poisson":
+            gaps *= self.mean_gap
+        else:
+            starts = choice_rng.random(count) < self.burst_start
+            gaps *= np.where(starts, self.gap_between, self.gap_within)
+        # Each process arrives one gap after the previous one; the first at the clock
+        clock = np.cumsum(gaps)
+        arrival = (clock - gaps + self.clock).astype(np.int64)
+        if count:
+            self.clock += clock[-1]
+
+        if self.service == "exponential":
+            service = service_rng.exponential(self.mean_service, count)
+        elif self.service == "pareto":
+            scale = self.mean_service * (self.shape - 1) / self.shape
+            service = (service_rng.pareto(self.shape, count) + 1) * scale
+        else:
+            means = np.where(choice_rng.random(count) < self.long_fraction,
+                             self.short_mean * BIMODAL_RATIO, self.short_mean)
+            service = service_rng.normal(means, means * BIMODAL_SPREAD)
+        service = np.maximum(np.rint(service), 1).astype(np.int64)
+
+        picks = np.searchsorted(self.cumulative, priority_rng.random(count), side="right")
+        priority = np.asarray(self.priorities, dtype=np.int64)[np.minimum(picks, len(self.priorities) - 1)]
+        self.count += count
+        return arrival, service, priority
+
+    def chunk_python(self, count):
+        arrival_rng, service_rng, choice_rng, priority_rng = self.rngs
+        arrival, service, priority = array("q"), array("q"), array("q")
+        scale = self.mean_service * (self.shape - 1) / self.shape
+        last = len(self.priorities) - 1
+        for _ in range(count):
+            if self.arrivals == "poisson":
+                gap = self.mean_gap
+            else:
+                gap = self.gap_between if choice_rng.random() < self.burst_start else self.gap_within
+            arrival.append(int(self.clock))
+            self.clock += arrival_rng.expovariate(1.0) * gap
+
+            if self.service == "exponential":
+                value = service_rng.expovariate(1 / self.mean_service)
+            elif self.service == "pareto":
+                value = service_rng.paretovariate(self.shape) * scale
+            else:
+                mean = self.short_mean
+                if choice_rng.random() < self.long_fraction:
+                    mean *= BIMODAL_RATIO
+                value = service_rng.gauss(mean, mean * BIMODAL_SPREAD)
+            service.append(max(round(value), 1))
+
+            pick = bisect_right(self.cumulative, priority_rng.random())
+            priority.append(self.priorities[min(pick, last)])
+        self.count += count
+        return arrival, service, priority
+
+def digit_counts(values):
+    # Decimal digits of each non-negative value
+    return np.searchsorted(10 ** np.arange(1, 19, dtype=np.int64), values, side="right") + 1
+
+def render_rows(literals, columns):
+    # Formats rows of non-negative integers as text, a column and a digit at a time.
+    # Row i is literals[0], columns[0][i], literals[1], ..., literals[-1]. Returns the
+    # bytes and the offset where each row ends.
+    widths = [digit_counts(column) for column in columns]
+    lengths = sum(len(literal) for literal in literals) + sum(widths)
+    ends = np.cumsum(lengths)
+    out = np.empty(int(ends[-1]) if len(ends) else 0, dtype=np.uint8)
+    position = ends - lengths
+    for literal, column, width in zip(literals, columns + [None], widths + [None]):
+        if literal:
+            out[position[:, None] + np.arange(len(literal))] = np.frombuffer(literal, dtype=np.uint8)
+        position += len(literal)
+        if column is None:
+            break
+        # Digits are written from the last one back, dropping each value once it has
+        # none left, so the work follows the number of digits
+        value = column.copy()
+        digit = position + width - 1
+        while len(value):
+            out[digit] = 48 + value % 10
+            value //= 10
+            left = value > 0
+            value = value[left]
+            digit = digit[left] - 1
+        position += width
+    return out.tobytes(), ends
+
+def generate_table(count, seed=0, **options):
+    # A ProcessTable of count generated processes P1..Pn; see Generator for options
+    if count < 0:
+        raise ValueError("count must be non-negative")
+    generator = Generator(seed, **options)
+    table = ProcessTable()
+    while generator.count < count:
+        first = generator.count
+        columns = generator.chunk(min(CHUNK, count - first))
+        if np is not None:
+            pid_data, pid_ends = render_rows([b"P", b""], [np.arange(first + 1, generator.count + 1)])
+        else:
+            names = [f"P{i}".encode() for i in range(first + 1, generator.count + 1)]
+            pid_data, pid_ends = b"".join(names), array("q", accumulate(map(len, names)))
+        table.extend_packed(pid_data, pid_ends, *columns)
+    return table
+
+def write_trace(path, count, seed=0, **options):
+    # Writes count generated processes to a CSV trace, or JSONL if path ends in
+    # .jsonl. The rows are in arrival order, so --stream can read the file.
+    if count < 0:
+        raise ValueError("count must be non-negative")
+    generator = Generator(seed, **options)
+    trace_format = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+    literals = TRACE_FORMATS[trace_format]
+    with open(path, "wb") as f:
+        if trace_format == "csv":
+            f.write(CSV_HEADER)
+        while generator.count < count:
+            first = generator.count
+            arrival, service, priority = generator.chunk(min(CHUNK, count - first))
+            if np is not None:
+                pids = np.arange(first + 1, generator.count + 1)
+                f.write(render_rows(list(literals), [pids, arrival, service, priority])[0])
+                continue
+            row = "{}".join(literal.decode().replace("{", "{{").replace("}", "}}")
+                            for literal in literals)
+            f.write("".join(row.format(first + i, a, s, p) for i, a, s, p in
+                            zip(range(1, count + 1), arrival, service, priority)).encode())
+
+OPTIONS = ("arrivals", "service", "mean_service", "load", "burst", "shape", "long_fraction")
+
+def add_generator_arguments(parser):
+    # Generator options, shared by python -m schedulizer.generate and --generate
+    group = parser.add_argument_group("workload generator")
+    group.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    group.add_argument("--arrivals", choices=ARRIVALS, default="poisson",
+                       help="arrival process (default: poisson)")
+    group.add_argument("--service", choices=SERVICES, default="exponential",
+                       help="service time distribution (default: exponential)")
+    group.add_argument("--mean-service", type=float, default=5.0,
+                       help="mean service time (default: 5)")
+    group.add_argument("--load", type=float, default=0.9,
+                       help="offered load, service demand per unit of time; above 1 overloads "
+                            "one CPU (default: 0.9)")
+    group.add_argument("--burst", type=float, default=20,
+                       help="bursty: mean number of processes per burst (default: 20)")
+    group.add_argument("--shape", type=float, default=1.5,
+                       help="pareto: shape; lower is more heavy-tailed (default: 1.5)")
+    group.add_argument("--long-fraction", type=float, default=0.1,
+                       help=f"bimodal: share of processes in the long mode, {BIMODAL_RATIO} times "
+                            "the short one (default: 0.1)")
+    group.add_argument("--priorities", default="0",
+                       help="priority mix as value:weight pairs, e.g. 0:1,1:3,2:6 (default: 0)")
+
+def generator_options(args):
+    # Generator keyword arguments from parsed add_generator_arguments options
+    options = {name: getattr(args, name) for name in OPTIONS}
+    check_options(**options)
+    options["priorities"] = parse_mix(args.priorities)
+    return options
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m schedulizer.generate",
+        description="Write a seeded synthetic workload as a CSV or JSONL trace.")
+    parser.add_argument("output", help="trace file to write; .jsonl for JSON lines, otherwise CSV")
+    parser.add_argument("-n", "--count", type=int, required=True, help="number of processes")
+    add_generator_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.count < 0:
+        parser.error("count must be non-negative")
+    try:
+        options = generator_options(args)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        write_trace(args.output, args.count, args.seed, **options)
+    except OSError as e:
+        parser.exit(1, f"schedulizer: {e}\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,759 @@
+import sys
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                            QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+                            QTableView, QHeaderView, QGraphicsView, QGraphicsScene,
+                            QMessageBox, QInputDialog, QSpinBox, QComboBox, QFileDialog,
+                            QDialog, QShortcut, QProgressBar, QFormLayout, QDoubleSpinBox,
+                            QLineEdit, QDialogButtonBox, QProgressDialog)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QBrush, QColor, QFont, QKeySequence, QPainterPath, QPen
+
+from .algorithms import ALGORITHMS, TIME_SLICED, prepare_processes
+from .cache import ResultCache, apply_finish
+from .compare import COMPARISON_FIELDS, best_quantum, comparison_row, parse_quanta
+from .deadlock import check_state, find_safe_sequence, read_state
+from .gantt import SegmentColumns
+from .gantt_view import GanttView
+from .generate import ARRIVALS, SERVICES, generate_table, parse_mix, write_trace
+from .incremental import IncrementalSchedule
+from .metrics import StreamingMetrics, compute_metrics
+from .schedule_file import ScheduleFile, write_schedule
+from .table import ProcessTable
+from .table_model import ProcessTableModel, ResultsModel
+from .worker import SimulationRun, TaskRun, makespan_estimate
+from .workload import iter_workload
+
+INLINE_ROWS = 5000  # Incremental re-runs of at most this many rows skip the worker process
+
+def table_view(model):
+    # Rows all get the same height, so the view never measures rows it doesn't show
+    view = QTableView()
+    view.setModel(model)
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.verticalHeader().setDefaultSectionSize(view.fontMetrics().height() + 8)
+    return view
+
+def show_errors(parent, title, errors, message):
+    shown = "\n".join(str(e) for e in errors[:20])
+    if len(errors) > 20:
+        shown += f"\n... and {len(errors) - 20} more"
+    QMessageBox.warning(parent, title, f"{message}:\n{shown}")
+
+class SchedulingSimulator(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("CPU Scheduling Simulator")
+        self.setGeometry(100, 100, 1000, 800)
+
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+
+        self.main_layout = QVBoxLayout()
+        self.central_widget.setLayout(self.main_layout)
+
+        self.create_control_panel()
+        self.create_process_table()
+        self.create_gantt_chart()
+        self.create_results_display()
+
+        # Initialize process list
+        self.processes = []
+        self.lanes = None  # Gantt chart of each CPU in the last run
+        self.incremental = None  # Last single-CPU run, brought up to date by the next one
+        self.rerun = None  # Chart of the busy periods an incremental run schedules again
+        self.schedule_file = None  # Saved schedule being shown, kept mapped while on screen
+        self.result_cache = ResultCache()
+        self.simulation = None  # SimulationRun in progress
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(50)
+        self.poll_timer.timeout.connect(self.poll_simulation)
+        self.tasks = None  # TaskRun of Compare All or Quantum Sweep in progress
+        self.task_timer = QTimer(self)
+        self.task_timer.setInterval(50)
+        self.task_timer.timeout.connect(self.poll_tasks)
+
+    def create_control_panel(self):
+        control_panel = QWidget()
+        control_layout = QHBoxLayout()
+
+        # Algorithm selection
+        self.algorithm_combo = QComboBox()
+        for key, (label, _) in ALGORITHMS.items():
+            self.algorithm_combo.addItem(label, key)
+        self.algorithm_combo.addItem("Deadlock Detection")
+
+        # Quantum input (only for RR)
+        self.quantum_spin = QSpinBox()
+        self.quantum_spin.setRange(1, 100)
+        self.quantum_spin.setValue(4)
+        self.quantum_spin.setEnabled(False)
+
+        # Number of CPUs and how they share the ready queue
+        self.cpus_spin = QSpinBox()
+        self.cpus_spin.setRange(1, 1024)
+        self.cpus_spin.setValue(1)
+        self.run_queues_combo = QComboBox()
+        self.run_queues_combo.addItem("Global queue", "global")
+        self.run_queues_combo.addItem("Per-core queues", "per-core")
+        self.run_queues_combo.setEnabled(False)
+
+        # Buttons
+        self.add_process_btn = QPushButton("Add Process")
+        self.load_btn = QPushButton("Load Workload")
+        self.generate_btn = QPushButton("Generate Workload")
+        self.clear_btn = QPushButton("Clear All")
+        self.run_btn = QPushButton("Run Simulation")
+        self.compare_btn = QPushButton("Compare All")
+        self.sweep_btn = QPushButton("Quantum Sweep")
+        self.save_btn = QPushButton("Save Schedule")
+        self.open_btn = QPushButton("Open Schedule")
+
+        # Layout
+        control_layout.addWidget(QLabel("Algorithm:"))
+        control_layout.addWidget(self.algorithm_combo)
+        control_layout.addWidget(QLabel("Quantum:"))
+        control_layout.addWidget(self.quantum_spin)
+        control_layout.addWidget(QLabel("CPUs:"))
+        control_layout.addWidget(self.cpus_spin)
+        control_layout.addWidget(self.run_queues_combo)
+        control_layout.addWidget(self.add_process_btn)
+        control_layout.addWidget(self.load_btn)
+        control_layout.addWidget(self.generate_btn)
+        control_layout.addWidget(self.clear_btn)
+        control_layout.addWidget(self.run_btn)
+        control_layout.addWidget(self.compare_btn)
+        control_layout.addWidget(self.sweep_btn)
+        control_layout.addWidget(self.save_btn)
+        control_layout.addWidget(self.open_btn)
+
+        control_panel.setLayout(control_layout)
+        self.main_layout.addWidget(control_panel)
+
+        # Connect signals
+        self.algorithm_combo.currentIndexChanged.connect(self.toggle_quantum_visibility)
+        self.cpus_spin.valueChanged.connect(lambda cpus: self.run_queues_combo.setEnabled(cpus > 1))
+        self.add_process_btn.clicked.connect(self.add_process)
+        self.load_btn.clicked.connect(self.load_workload)
+        self.generate_btn.clicked.connect(self.generate_workload)
+        self.clear_btn.clicked.connect(self.clear_all)
+        self.run_btn.clicked.connect(self.run_simulation)
+        self.compare_btn.clicked.connect(self.compare_all)
+        self.sweep_btn.clicked.connect(self.quantum_sweep)
+        self.save_btn.clicked.connect(self.save_schedule)
+        self.open_btn.clicked.connect(self.open_schedule)
+
+    def toggle_quantum_visibility(self, index):
+        self.quantum_spin.setEnabled(self.algorithm_combo.itemData(index) in TIME_SLICED)
+
+    def create_process_table(self):
+        self.process_model = ProcessTableModel(self)
+        self.process_table = table_view(self.process_model)
+        for column in range(4):
+            self.process_table.setColumnWidth(column, 100)
+        # Rows copied from a spreadsheet or CSV file are appended in one batch
+        QShortcut(QKeySequence.Paste, self.process_table, self.paste_processes)
+
+        self.main_layout.addWidget(QLabel("Process List:"))
+        self.main_layout.addWidget(self.process_table)
+
+        # Add some default processes
+        self.add_process("P1", 0, 5, 3)
+        self.add_process("P2", 1, 3, 1)
+        self.add_process("P3", 2, 8, 2)
+
+    def create_gantt_chart(self):
+        self.gantt_view = GanttView()
+        self.gantt_view.setMinimumHeight(150)
+
+        # Progress of a running simulation, by simulated time
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setTextVisible(False)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_simulation)
+        self.cancel_btn.setEnabled(False)
+        header = QHBoxLayout()
+        header.addWidget(QLabel("Gantt Chart:"))
+        header.addStretch()
+        header.addWidget(self.progress_bar)
+        header.addWidget(self.cancel_btn)
+
+        self.main_layout.addLayout(header)
+        self.main_layout.addWidget(self.gantt_view)
+
+    def create_results_display(self):
+        self.results_model = ResultsModel(self)
+        self.results_table = table_view(self.results_model)
+
+        self.avg_results_label = QLabel()
+        self.avg_results_label.setFont(QFont("Arial", 10, QFont.Bold))
+
+        self.main_layout.addWidget(QLabel("Results:"))
+        self.main_layout.addWidget(self.results_table)
+        self.main_layout.addWidget(self.avg_results_label)
+
+    def add_process(self, pid=None, arrival=None, service=None, priority=None):
+        if pid is None:
+            pid = f"P{self.process_model.rowCount() + 1}"
+            arrival = 0
+            service = 1
+            priority = 0
+
+        self.process_model.append_rows([(pid, arrival, service, priority)])
+
+    def paste_processes(self):
+        # Tab- or comma-separated lines of pid, arrival, service[, priority]
+        rows = []
+        for line in QApplication.clipboard().text().splitlines():
+            if not line.strip():
+                continue
+            values = line.split("\t") if "\t" in line else line.split(",")
+            if not rows and values[0].strip().lower() == "pid":
+                continue  # Header line
+            if len(values) == 3:
+                values.append("0")
+            rows.append(values)
+        self.process_model.append_rows(rows)
+
+    def load_workload(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load Workload", "",
+                                              "Workloads (*.csv *.jsonl *.ndjson)")
+        if not path:
+            return
+
+        # Valid rows are loaded in one batch; every bad row is reported once at the end
+        errors = []
+        try:
+            table = ProcessTable(iter_workload(path, errors.append))
+        except OSError as e:
+            QMessageBox.warning(self, "Load Error", str(e))
+            return
+        self.process_model.append_table(table)
+
+        if errors:
+            show_errors(self, "Input Error", errors, f"Skipped {len(errors)} invalid rows")
+
+    def generate_workload(self):
+        # Replaces the process list with a seeded synthetic workload, or writes one to
+        # a trace file for the command line's --stream
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Generate Workload")
+        form = QFormLayout()
+        count = QSpinBox()
+        count.setRange(1, 100000000)
+        count.setValue(10000)
+        count.setGroupSeparatorShown(True)
+        seed = QSpinBox()
+        seed.setRange(0, 2 ** 31 - 1)
+        arrivals = QComboBox()
+        arrivals.addItems(ARRIVALS)
+        service = QComboBox()
+        service.addItems(SERVICES)
+        mean_service = QDoubleSpinBox()
+        mean_service.setRange(1, 1000000)
+        mean_service.setValue(5)
+        load = QDoubleSpinBox()
+        load.setRange(0.01, 1000)
+        load.setValue(0.9)
+        priorities = QLineEdit("0:1,1:1,2:1")
+        priorities.setToolTip("value:weight pairs")
+        for label, widget in (("Processes:", count), ("Seed:", seed), ("Arrivals:", arrivals),
+                              ("Service times:", service), ("Mean service:", mean_service),
+                              ("Offered load:", load), ("Priorities:", priorities)):
+            form.addRow(label, widget)
+        buttons = QDialogButtonBox(QDialogButtonBox.Cancel)
+        buttons.addButton("Generate", QDialogButtonBox.AcceptRole)
+        save_btn = buttons.addButton("Save Trace...", QDialogButtonBox.ActionRole)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        save_btn.clicked.connect(lambda: dialog.done(2))
+        form.addRow(buttons)
+        dialog.setLayout(form)
+
+        result = dialog.exec_()
+        if result == QDialog.Rejected:
+            return
+        try:
+            options = {"arrivals": arrivals.currentText(), "service": service.currentText(),
+                       "mean_service": mean_service.value(), "load": load.value(),
+                       "priorities": parse_mix(priorities.text())}
+        except ValueError as e:
+            QMessageBox.warning(self, "Input Error", str(e))
+            return
+
+        if result == 2:
+            path, _ = QFileDialog.getSaveFileName(self, "Save Trace", "", "Traces (*.csv *.jsonl)")
+            if not path:
+                return
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                write_trace(path, count.value(), seed.value(), **options)
+            except OSError as e:
+                QMessageBox.warning(self, "Save Error", str(e))
+            finally:
+                QApplication.restoreOverrideCursor()
+            return
+
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            table = generate_table(count.value(), seed.value(), **options)
+            self.process_model.clear()
+            self.process_model.append_table(table)
+        finally:
+            QApplication.restoreOverrideCursor()
+
+    def clear_all(self):
+        self.stop_simulation()
+        self.process_model.clear()
+        self.gantt_view.clear()
+        self.results_model.clear()
+        self.avg_results_label.clear()
+        self.processes = []
+        self.lanes = None
+        self.close_schedule_file()
+
+    def validate_inputs(self):
+        # Every bad row is highlighted; the first one is scrolled into view
+        errors = self.process_model.validate()
+        if errors:
+            self.process_table.scrollTo(self.process_model.index(errors[0][0], 0))
+            show_errors(self, "Input Error", [error for _, error in errors],
+                        f"{len(errors)} invalid rows")
+            return False
+
+        return True
+
+    def collect_process_data(self):
+        self.processes = self.process_model.processes()
+        return self.processes
+
+    def run_simulation(self):
+        if not self.validate_inputs():
+            return
+
+        self.collect_process_data()
+
+        algorithm = self.algorithm_combo.currentText()
+
+        if algorithm == "Deadlock Detection":
+            self.run_deadlock_detection()
+            return
+
+        # The run happens in a worker process; its segments are drawn as they arrive
+        self.stop_simulation()
+        cpus = self.cpus_spin.value()
+        name = self.algorithm_combo.currentData()
+        quantum = self.quantum_spin.value()
+        prepare_processes(self.processes)
+        self.close_schedule_file()
+        self.rerun = None
+        self.start_time = 0
+        if cpus == 1:
+            # After edits to the last run's workload only the busy periods they
+            # changed run again. Their chart is collected off screen and spliced into
+            # the last one, and only the result rows that changed are updated.
+            last = self.incremental
+            if (last is None or self.lanes != [last.gantt] or
+                    (last.name, last.quantum) != (name, quantum)):
+                self.incremental = IncrementalSchedule(name, quantum)
+                self.results_model.clear()
+            ranges = self.incremental.begin(self.processes)
+            if sum(stop - start for start, stop in ranges) <= INLINE_ROWS:
+                # A few busy periods run here sooner than a worker process starts
+                self.show_run(self.incremental.resume())
+                return
+            run_on = self.processes.copy(ranges)
+            if len(run_on) < len(self.processes):
+                self.rerun = SegmentColumns()
+                self.start_time = run_on.arrival[0]
+            else:
+                self.gantt_view.set_lanes([[]])
+        else:
+            self.incremental = None
+            self.gantt_view.set_lanes([[] for _ in range(cpus)])
+            self.results_model.clear()
+            run_on = self.processes
+        self.lanes = None
+        self.avg_results_label.setText("Running...")
+        self.estimated_end = max(self.start_time + 1, makespan_estimate(run_on, cpus))
+        self.progress_bar.setValue(0)
+        self.simulation = SimulationRun(run_on, name, quantum, cpus,
+                                        self.run_queues_combo.currentData(),
+                                        self.result_cache.directory)
+        self.run_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.poll_timer.start()
+
+    def poll_simulation(self):
+        time = None
+        for message in self.simulation.poll():
+            if message[0] == "segments":
+                _, batch, time = message
+                for lane, segments in batch.items():
+                    if self.rerun is not None:
+                        self.rerun.extend(segments)
+                    else:
+                        self.gantt_view.append_segments(segments, lane)
+            elif message[0] == "done":
+                self.finish_simulation()
+                self.complete_simulation(message[1])
+            elif message[0] == "cancelled":
+                self.finish_simulation()
+                self.abandon_simulation("Simulation cancelled.")
+            else:
+                self.finish_simulation()
+                self.abandon_simulation("")
+                QMessageBox.warning(self, "Simulation Error", message[1])
+        if time is not None and self.simulation is not None:
+            self.progress_bar.setValue(min(1000, 1000 * (time - self.start_time) //
+                                           (self.estimated_end - self.start_time)))
+
+    def complete_simulation(self, finish):
+        if self.incremental is None:
+            apply_finish(self.processes, finish)
+            self.show_run()
+            return
+        run = self.rerun if self.rerun is not None else self.gantt_view.lanes[0]
+        self.show_run(self.incremental.complete(run, finish))
+
+    def abandon_simulation(self, message):
+        if self.rerun is not None:
+            # Nothing was drawn yet, and the last run is still whole
+            self.processes = self.incremental.table
+            self.lanes = self.gantt_view.lanes
+            self.avg_results_label.setText(f"{message} The previous run is shown.".strip())
+            return
+        self.results_model.clear()
+        self.avg_results_label.setText(message)
+
+    def show_run(self, rows=None):
+        # rows are the changed result rows of an incremental run
+        utilization = None
+        if self.incremental is not None:
+            if self.gantt_view.lanes == [self.incremental.gantt]:
+                self.gantt_view.refresh()
+            else:
+                self.gantt_view.set_lanes([self.incremental.gantt])
+        self.lanes = self.gantt_view.lanes
+        makespan = self.gantt_view.end
+        if len(self.lanes) > 1 and makespan:
+            utilization = [lane.busy_total / makespan for lane in self.lanes]
+        self.progress_bar.setValue(1000)
+        self.display_results(utilization, rows)
+
+    def cancel_simulation(self):
+        # The worker stops at its next batch of segments
+        if self.simulation is not None:
+            self.simulation.cancel()
+            self.cancel_btn.setEnabled(False)
+
+    def finish_simulation(self):
+        self.poll_timer.stop()
+        self.simulation.stop()
+        self.simulation = None
+        self.run_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+
+    def stop_simulation(self):
+        # Abandons a run in progress, keeping whatever it has drawn
+        if self.simulation is not None:
+            self.finish_simulation()
+            self.progress_bar.setValue(0)
+
+    def closeEvent(self, event):
+        self.stop_simulation()
+        self.stop_tasks()
+        super().closeEvent(event)
+
+    def start_tasks(self, title, tasks, show):
+        # Runs compare.py tasks in a worker pool while the window stays responsive,
+        # then passes their summaries to show
+        self.stop_tasks()
+        self.tasks = TaskRun(self.processes, tasks)
+        self.show_tasks = show
+        self.task_progress = QProgressDialog(f"{title}...", "Cancel", 0, len(tasks), self)
+        self.task_progress.setWindowTitle(title)
+        self.task_progress.setWindowModality(Qt.WindowModal)
+        self.task_progress.setMinimumDuration(0)
+        self.task_progress.canceled.connect(self.stop_tasks)
+        self.task_progress.setValue(0)
+        self.task_timer.start()
+
+    def poll_tasks(self):
+        try:
+            results = self.tasks.poll()
+        except Exception as e:
+            self.stop_tasks()
+            QMessageBox.warning(self, "Simulation Error", f"{type(e).__name__}: {e}")
+            return
+        if results is None:
+            self.task_progress.setValue(self.tasks.ready())
+            return
+        show = self.show_tasks
+        self.stop_tasks()
+        show(results)
+
+    def stop_tasks(self):
+        # Also called when the progress dialog is cancelled or closed
+        if self.tasks is not None:
+            self.task_timer.stop()
+            tasks, self.tasks = self.tasks, None
+            tasks.stop()
+            self.task_progress.close()
+
+    def compare_all(self):
+        if not self.validate_inputs():
+            return
+
+        self.collect_process_data()
+        quantum = self.quantum_spin.value()
+        self.start_tasks("Comparing algorithms", [(name, quantum) for name in ALGORITHMS],
+                         self.show_comparison)
+
+    def show_comparison(self, results):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Algorithm Comparison")
+        dialog.resize(1000, 300)
+        layout = QVBoxLayout()
+        table = QTableWidget(len(results), len(COMPARISON_FIELDS))
+        table.setHorizontalHeaderLabels(COMPARISON_FIELDS)
+        for row, result in enumerate(results):
+            for column, value in enumerate(comparison_row(result)):
+                text = f"{value:.2f}" if isinstance(value, float) else str(value)
+                table.setItem(row, column, QTableWidgetItem(text))
+        layout.addWidget(table)
+        dialog.setLayout(layout)
+        dialog.exec_()
+
+    def quantum_sweep(self):
+        if not self.validate_inputs():
+            return
+
+        text, ok = QInputDialog.getText(self, "Quantum Sweep",
+                                        "Quanta (start:stop[:step] or a comma-separated list):",
+                                        text="1:20")
+        if not ok:
+            return
+        try:
+            quanta = parse_quanta(text)
+        except ValueError as e:
+            QMessageBox.warning(self, "Input Error", str(e))
+            return
+
+        # The table is parsed once and shared by every point of the sweep
+        self.collect_process_data()
+        self.start_tasks("Sweeping the quantum", [("rr", quantum) for quantum in quanta],
+                         self.show_sweep)
+
+    def show_sweep(self, results):
+        best = best_quantum(results)
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Round Robin Quantum Sweep")
+        dialog.resize(760, 600)
+        layout = QVBoxLayout()
+
+        scene = QGraphicsScene()
+        self.draw_sweep_chart(scene, results, best)
+        view = QGraphicsView(scene)
+        layout.addWidget(view)
+
+        table = QTableWidget(len(results), 6)
+        table.setHorizontalHeaderLabels(["Quantum", "Avg WT", "WT p95", "WT p99", "WT max", "Switches"])
+        for row, result in enumerate(results):
+            waiting = result["waiting"]
+            values = [str(result["quantum"]), f"{result['averages']['waiting']:.2f}", str(waiting["p95"]),
+                      str(waiting["p99"]), str(waiting["max"]), str(result["context_switches"])]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if result["quantum"] == best:
+                    item.setBackground(QBrush(QColor(255, 230, 150)))
+                table.setItem(row, column, item)
+        layout.addWidget(table)
+
+        layout.addWidget(QLabel(f"Best quantum: {best} (lowest average waiting time)"))
+        dialog.setLayout(layout)
+        dialog.exec_()
+
+    def draw_sweep_chart(self, scene, results, best):
+        # Average and p95 waiting time on the left axis, context switches on the right
+        x0, y0 = 50, 20
+        width, height = 620, 260
+        quanta = [r["quantum"] for r in results]
+        avg = [r["averages"]["waiting"] for r in results]
+        tail = [r["waiting"]["p95"] for r in results]
+        switches = [r["context_switches"] for r in results]
+
+        span = max(quanta) - min(quanta) or 1
+        top = max(max(tail), max(avg)) or 1
+        top_switches = max(switches) or 1
+
+        def x_of(quantum):
+            return x0 + (quantum - min(quanta)) * width / span
+
+        def y_of(value, limit):
+            return y0 + height - value * height / limit
+
+        scene.addRect(x0, y0, width, height, QPen(Qt.gray))
+
+        series = [(avg, top, QColor(0, 90, 200), "Avg WT"),
+                  (tail, top, QColor(200, 60, 0), "WT p95"),
+                  (switches, top_switches, QColor(0, 150, 70), "Context switches (right axis)")]
+        for values, limit, color, label in series:
+            path = QPainterPath()
+            for i, (quantum, value) in enumerate(zip(quanta, values)):
+                point = (x_of(quantum), y_of(value, limit))
+                if i == 0:
+                    path.moveTo(*point)
+                else:
+                    path.lineTo(*point)
+                scene.addEllipse(point[0] - 2, point[1] - 2, 4, 4, QPen(color), QBrush(color))
+            scene.addPath(path, QPen(color, 2))
+
+        # Highlight the best quantum
+        best_x = x_of(best)
+        scene.addLine(best_x, y0, best_x, y0 + height, QPen(Qt.darkYellow, 1, Qt.DashLine))
+        text = scene.addText(f"best q={best}")
+        text.setPos(best_x + 3, y0)
+
+        # Axis labels
+        for value, limit, x in ((top, top, x0 - 45), (top_switches, top_switches, x0 + width + 5)):
+            text = scene.addText(f"{value:.0f}")
+            text.setPos(x, y_of(limit, limit) - 10)
+        for quantum in (min(quanta), max(quanta)):
+            text = scene.addText(str(quantum))
+            text.setPos(x_of(quantum) - 5, y0 + height + 2)
+
+        # Legend
+        for i, (_, _, color, label) in enumerate(series):
+            text = scene.addText(label)
+            text.setDefaultTextColor(color)
+            text.setPos(x0 + i * 180, y0 + height + 25)
+
+    def save_schedule(self):
+        if self.lanes is None:
+            QMessageBox.warning(self, "Save Schedule", "Run a simulation first.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Save Schedule", "", "Schedules (*.sched)")
+        if not path:
+            return
+        try:
+            write_schedule(path, self.processes, self.lanes,
+                           algorithm=self.algorithm_combo.currentData(),
+                           quantum=self.quantum_spin.value(), cpus=len(self.lanes))
+        except OSError as e:
+            QMessageBox.warning(self, "Save Error", str(e))
+
+    def open_schedule(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Schedule", "", "Schedules (*.sched)")
+        if not path:
+            return
+        try:
+            schedule = ScheduleFile(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Open Error", str(e))
+            return
+
+        # The chart reads the mapped file directly; only the old mapping is closed
+        self.gantt_view.set_lanes(schedule.lanes)
+        self.close_schedule_file()
+        self.schedule_file = schedule
+        self.lanes = None
+
+        self.results_model.set_rows(len(schedule), schedule.process)
+
+        summary = schedule.metrics().summary()
+        averages = summary["averages"]
+        waiting = summary["waiting"]
+        text = (f"Saved run of {schedule.metadata.get('algorithm', '?')}: {len(schedule)} processes\n"
+                f"Average TAT: {averages['tat']:.2f} | "
+                f"Average WT: {averages['waiting']:.2f} | "
+                f"Average NTAT: {averages['ntat']:.2f}\n"
+                f"WT p50: {waiting['p50']} | "
+                f"WT p95: {waiting['p95']} | "
+                f"WT p99: {waiting['p99']} | "
+                f"Max WT: {waiting['max']}")
+        if len(schedule.lanes) > 1:
+            utilization = schedule.utilization()
+            text += f"\nCPU utilization: mean {sum(utilization) / len(utilization):.1%}"
+        self.avg_results_label.setText(text)
+
+    def close_schedule_file(self):
+        if self.schedule_file is not None:
+            self.schedule_file.close()
+            self.schedule_file = None
+
+    def display_gantt_chart(self, gantt):
+        self.gantt_view.set_segments(gantt)
+
+    def display_results(self, utilization=None, rows=None):
+        avg_tat, avg_waiting, avg_ntat = compute_metrics(self.processes)
+
+        if rows is None:
+            self.results_model.set_rows(len(self.processes), self.processes.__getitem__)
+        else:
+            # Only the rows an incremental run replaced
+            self.results_model.replace_rows(*rows, self.processes.__getitem__)
+
+        # Tail latencies
+        metrics = StreamingMetrics()
+        metrics.add_table(self.processes)
+        waiting = metrics.summary()["waiting"]
+
+        self.avg_results_label.setText(
+            f"Average TAT: {avg_tat:.2f} | "
+            f"Average WT: {avg_waiting:.2f} | "
+            f"Average NTAT: {avg_ntat:.2f}\n"
+            f"WT p50: {waiting['p50']} | "
+            f"WT p95: {waiting['p95']} | "
+            f"WT p99: {waiting['p99']} | "
+            f"Max WT: {waiting['max']}"
+        )
+        if utilization is not None:
+            # Listing every core would not fit with many CPUs
+            shown = ", ".join(f"{busy:.0%}" for busy in utilization[:16])
+            if len(utilization) > 16:
+                shown += ", ..."
+            self.avg_results_label.setText(
+                self.avg_results_label.text() +
+                f"\nCPU utilization: mean {sum(utilization) / len(utilization):.1%}, "
+                f"min {min(utilization):.1%}, max {max(utilization):.1%} [{shown}]")
+
+    def run_deadlock_detection(self):
+        # The allocation, max demand and available values come from one state file
+        path, _ = QFileDialog.getOpenFileName(self, "Load Banker's State", "",
+                                              "Banker's state (*.csv *.npz)")
+        if not path:
+            return
+
+        try:
+            allocation, max_demand, available = read_state(path)
+            check_state(allocation, max_demand, available)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Input Error", str(e))
+            return
+
+        safe_sequence = find_safe_sequence(allocation, max_demand, available)
+
+        if safe_sequence is not None:
+            shown = ", ".join(str(i) for i in safe_sequence[:50])
+            if len(safe_sequence) > 50:
+                shown += f", ... and {len(safe_sequence) - 50} more"
+            QMessageBox.information(
+                self, "Deadlock Detection Result",
+                f"System is in a safe state.\nSafe sequence: [{shown}]"
+            )
+        else:
+            QMessageBox.warning(
+                self, "Deadlock Detection Result",
+                "Deadlock detected! System is in an unsafe state."
+            )
+
+def main():
+    app = QApplication(sys.argv)
+    window = SchedulingSimulator()
+    window.show()
+    return app.exec_()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+from array import array
+from bisect import bisect_left
+
+from .algorithms import ALGORITHMS, prepare_processes, run_stream
+from .cache import apply_finish
+from .gantt import SegmentColumns
+from .shard import busy_period_starts
+from .table import ProcessTable, np
+
+# The checkpoints are the busy-period starts that shard.py splits a workload at: the
+# CPU is idle and the ready queues are empty, so the state there is just the time.
+# A busy period that starts at the same time with the same rows as one of the last
+# run is scheduled the same way again, so its part of the chart and its finish times
+# are kept. Only the busy periods an edit reaches run again, together, since nothing
+# carries over from one busy period to the next.
+ROW_COLUMNS = ("pid_index", "arrival", "service", "priority")
+
+def same_names(old, new):
+    # Whether equal PID indices mean equal names in the two tables, as they do for
+    # copies of one table that has been edited in between
+    return (new.pid_data.startswith(old.pid_data) and
+            new.pid_offsets[:len(old.pid_offsets)] == old.pid_offsets)
+
+def matching_periods(old, old_starts, new, starts):
+    # For each busy period of new, the index of the one of old with the same rows
+    # from the same start time, or -1
+    if not old_starts or not same_names(old, new):
+        return [-1] * len(starts)
+    if np is not None:
+        new_starts = np.asarray(starts, dtype=np.int64)
+        old_starts = np.asarray(old_starts, dtype=np.int64)
+        new_columns = [np.frombuffer(getattr(new, name), dtype=np.int64) for name in ROW_COLUMNS]
+        old_columns = [np.frombuffer(getattr(old, name), dtype=np.int64) for name in ROW_COLUMNS]
+        new_lengths = np.diff(np.append(new_starts, len(new)))
+        old_lengths = np.diff(np.append(old_starts, len(old)))
+        times = new_columns[1][new_starts]
+        old_times = old_columns[1][old_starts]
+        match = np.minimum(np.searchsorted(old_times, times), len(old_starts) - 1)
+        found = (old_times[match] == times) & (old_lengths[match] == new_lengths)
+        # The old row each new row stands in for, and whether it is the same
+        old_rows = np.arange(len(new)) + np.repeat(np.where(found, old_starts[match] - new_starts, 0),
+                                                  new_lengths)
+        old_rows = np.minimum(old_rows, len(old) - 1)
+        same = np.ones(len(new), dtype=bool)
+        for old_column, new_column in zip(old_columns, new_columns):
+            same &= old_column[old_rows] == new_column
+        found &= np.logical_and.reduceat(same, new_starts)
+        return np.where(found, match, -1).tolist()
+
+    by_time = {old.arrival[start]: i for i, start in enumerate(old_starts)}
+    old_bounds = old_starts + [len(old)]
+    matches = []
+    for start, stop in zip(starts, starts[1:] + [len(new)]):
+        i = by_time.get(new.arrival[start], -1)
+        if i >= 0:
+            old_start, old_stop = old_bounds[i], old_bounds[i + 1]
+            if old_stop - old_start != stop - start or any(
+                    getattr(old, name)[old_start:old_stop] != getattr(new, name)[start:stop]
+                    for name in ROW_COLUMNS):
+                i = -1
+        matches.append(i)
+    return matches
+
+def changed_rows(old, new):
+    # (start, stop, old_stop): rows start to stop of new take the place of rows start
+    # to old_stop of old. The rows before and after are the same in both tables,
+    # finish times included.
+    count = min(len(old), len(new))
+    if not same_names(old, new):
+        return 0, len(new), len(old)
+    names = ROW_COLUMNS + ("finish",)
+    if np is not None:
+        same = np.ones(count, dtype=bool)
+        tail_same = np.ones(count, dtype=bool)
+        for name in names:
+            old_column = np.frombuffer(getattr(old, name), dtype=np.int64)
+            new_column = np.frombuffer(getattr(new, name), dtype=np.int64)
+            same &= old_column[:count] == new_column[:count]
+            tail_same &= old_column[len(old) - count:] == new_column[len(new) - count:]
+        differ = np.flatnonzero(~same)
+        prefix = int(differ[0]) if len(differ) else count
+        differ = np.flatnonzero(~tail_same)
+        suffix = count - 1 - int(differ[-1]) if len(differ) else count
+    else:
+        old_rows = list(zip(*(getattr(old, name) for name in names)))
+        new_rows = list(zip(*(getattr(new, name) for name in names)))
+        prefix = 0
+        while prefix < count and old_rows[prefix] == new_rows[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < count and old_rows[len(old) - 1 - suffix] == new_rows[len(new) - 1 - suffix]:
+            suffix += 1
+    suffix = min(suffix, count - prefix)
+    return prefix, len(new) - suffix, len(old) - suffix
+
+class IncrementalSchedule:
+    # Single-CPU schedule that is brought up to date after the workload changes by
+    # running again only the busy periods that changed. A run is begin(), one run of
+    # the rows it names, then complete(); resume() does the last two in this process
+    # and run() all three. gantt is SegmentColumns, updated in place so that a chart
+    # drawing it only needs a repaint, except when nothing of the last run is kept:
+    # then it becomes the chart of the new run. A run abandoned after begin()
+    # changes nothing.
+    def __init__(self, name, quantum=4, **options):
+        if name not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {name}")
+        self.name = name
+        self.quantum = quantum
+        self.options = options
+        self.table = ProcessTable()  # Workload of the last run, in arrival order
+        self.starts = []  # Its busy-period starts
+        self.finish = array("q")
+        self.gantt = SegmentColumns()
+        self.pending = None
+
+    def begin(self, processes):
+        # Sorts processes, a ProcessTable, and finds its busy periods that the last
+        # run didn't have. Returns their rows as (start, stop) ranges, to be
+        # scheduled as one run over processes.copy(ranges).
+        prepare_processes(processes)
+        starts = busy_period_starts(processes)
+        matches = matching_periods(self.table, self.starts, processes, starts)
+        ranges = []
+        for start, stop, match in zip(starts, starts[1:] + [len(processes)], matches):
+            if match >= 0:
+                continue
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], stop)
+            else:
+                ranges.append((start, stop))
+        self.pending = (processes, starts, matches, ranges)
+        return ranges
+
+    def complete(self, run, finish):
+        # Takes the chart (SegmentColumns) and finish times of the run of the rows
+        # begin() named, and puts the schedule together from them and the busy
+        # periods kept from the last run. Returns changed_rows() of the two runs.
+        processes, starts, matches, _ = self.pending
+        old, gantt = self.table, self.gantt
+        if all(match < 0 for match in matches):
+            chart, new_finish = run, array("q", finish)
+        else:
+            chart = SegmentColumns()
+            chart.pid_names, chart.pid_codes = gantt.pid_names, gantt.pid_codes
+            new_finish = array("q")
+            bounds = starts + [len(processes)]
+            old_bounds = self.starts + [len(old)]
+            taken = 0  # Rows of the run used so far
+            first = 0
+            while first < len(starts):
+                # A stretch of busy periods that follow each other in the same chart
+                last = first
+                if matches[first] >= 0:
+                    while last + 1 < len(starts) and matches[last + 1] == matches[last] + 1:
+                        last += 1
+                    source = gantt
+                    rows = self.finish[old_bounds[matches[first]]:old_bounds[matches[last] + 1]]
+                else:
+                    while last + 1 < len(starts) and matches[last + 1] < 0:
+                        last += 1
+                    source = run
+                    count = bounds[last + 1] - bounds[first]
+                    rows = finish[taken:taken + count]
+                    taken += count
+                time = processes.arrival[bounds[first]]
+                if time > chart.end_time():
+                    chart.extend([(chart.end_time(), time, None)])
+                # Up to the idle segment after the stretch's last process finishes
+                chart.join(source, bisect_left(source.starts, time), bisect_left(source.starts, max(rows)))
+                new_finish.extend(rows)
+                first = last + 1
+            gantt.starts, gantt.ends, gantt.codes = chart.starts, chart.ends, chart.codes
+            gantt.busy, gantt.busy_total = chart.busy, chart.busy_total
+            chart = gantt
+
+        apply_finish(processes, new_finish)
+        rows = changed_rows(old, processes)
+        self.table, self.starts, self.finish, self.gantt = processes, starts, new_finish, chart
+        self.pending = None
+        return rows
+
+    def resume(self):
+        # Schedules the rows begin() named in this process and completes the run
+        processes, _, _, ranges = self.pending
+        run_on = processes.copy(ranges)
+        run = SegmentColumns(run_stream(self.name, run_on, self.quantum, **self.options))
+        return self.complete(run, run_on.finish)
+
+    def run(self, processes):
+        # begin() and resume()
+        self.begin(processes)
+        return self.resume()
@@ -0,0 +1,242 @@
+from .table import ProcessTable, np
+
+def process_metrics(p):
+    # Fills in tat, waiting and ntat on a finished process
+    p.tat = p.finish - p.arrival
+    p.waiting = p.tat - p.service
+    p.ntat = p.tat / p.service if p.service > 0 else 0
+
+class RunningAverages:
+    # Keeps only the totals, so streamed runs don't need to hold finished processes
+    def __init__(self):
+        self.count = 0
+        self.total_tat = 0
+        self.total_waiting = 0
+        self.total_ntat = 0
+
+    def add(self, p):
+        self.count += 1
+        self.total_tat += p.tat
+        self.total_waiting += p.waiting
+        self.total_ntat += p.ntat
+
+    def merge(self, other):
+        self.count += other.count
+        self.total_tat += other.total_tat
+        self.total_waiting += other.total_waiting
+        self.total_ntat += other.total_ntat
+
+    def averages(self):
+        count = self.count
+        avg_tat = self.total_tat / count if count > 0 else 0
+        avg_waiting = self.total_waiting / count if count > 0 else 0
+        avg_ntat = self.total_ntat / count if count > 0 else 0
+        return avg_tat, avg_waiting, avg_ntat
+
+def compute_metrics(processes):
+    # Fills in tat, waiting and ntat on each finished process and returns the averages
+    if isinstance(processes, ProcessTable):
+        return processes.compute_metrics()
+
+    totals = RunningAverages()
+    for p in processes:
+        process_metrics(p)
+        totals.add(p)
+    return totals.averages()
+
+def bit_lengths(values):
+    # int.bit_length() of each non-negative value of an int64 NumPy array. The float
+    # exponent is one too high where a value rounds up to the next power of two.
+    lengths = np.frexp(values.astype(np.float64))[1].astype(np.int64)
+    lengths -= (lengths > 0) & ((values >> np.maximum(lengths - 1, 0)) == 0)
+    return lengths
+
+class Histogram:
+    # Log-linear histogram of non-negative integers, in the style of HdrHistogram.
+    # Values below 2**precision are counted exactly; larger ones share a bucket with
+    # neighbours within a relative error of 2**-(precision - 1). A histogram never
+    # holds more than 64 * 2**(precision - 1) buckets, whatever it has seen, and two
+    # histograms with the same precision merge by adding counts.
+    def __init__(self, precision=8):
+        self.precision = precision
+        self.counts = {}
+        self.count = 0
+        self.max = 0
+
+    def bucket(self, value):
+        shift = value.bit_length() - self.precision
+        if shift <= 0:
+            return value
+        return (shift << (self.precision - 1)) + (value >> shift)
+
+    def bucket_limit(self, index):
+        # Largest value that falls into the bucket
+        half = 1 << (self.precision - 1)
+        if index < 2 * half:
+            return index
+        shift = index // half - 1
+        mantissa = index - shift * half
+        return ((mantissa + 1) << shift) - 1
+
+    def add(self, value, count=1):
+        index = self.bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        if value > self.max:
+            self.max = value
+
+    def add_values(self, values):
+        # add() for each value of an int64 NumPy array
+        if not len(values):
+            return
+        shift = bit_lengths(values) - self.precision
+        index = np.where(shift <= 0, values,
+                         (shift << (self.precision - 1)) + (values >> np.maximum(shift, 0)))
+        buckets, counts = np.unique(index, return_counts=True)
+        for index, count in zip(buckets.tolist(), counts.tolist()):
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += len(values)
+        self.max = max(self.max, int(values.max()))
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def percentiles(self, percents):
+        # Value at or below which each percent of the samples fall
+        if self.count == 0:
+            return [0 for _ in percents]
+        targets = sorted((max(1, -(-percent * self.count // 100)), i) for i, percent in enumerate(percents))
+        results = [self.max] * len(percents)
+        seen = 0
+        pending = iter(targets)
+        target, slot = next(pending)
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            while seen >= target:
+                results[slot] = min(self.bucket_limit(index), self.max)
+                nxt = next(pending, None)
+                if nxt is None:
+                    return results
+                target, slot = nxt
+        return results
+
+    def to_dict(self):
+        return {"precision": self.precision, "max": self.max,
+                "counts": [[index, count] for index, count in sorted(self.counts.items())]}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data["precision"])
+        for index, count in data["counts"]:
+            histogram.counts[index] = count
+            histogram.count += count
+        histogram.max = data["max"]
+        return histogram
+
+PERCENTILES = (50, 95, 99)
+
+class StreamingMetrics:
+    # Aggregates finished processes one at a time: averages plus waiting-time and
+    # turnaround histograms, overall and per priority value. Memory is bounded by the
+    # histogram size rather than the number of processes, and results from separate
+    # shards of a trace can be combined with merge().
+    def __init__(self, precision=8):
+        self.precision = precision
+        self.totals = RunningAverages()
+        self.waiting = Histogram(precision)
+        self.tat = Histogram(precision)
+        self.by_priority = {}
+
+    def add(self, p):
+        # p must already have its tat, waiting and ntat filled in
+        self.totals.add(p)
+        self.waiting.add(p.waiting)
+        self.tat.add(p.tat)
+        waiting, tat = self.priority_histograms(p.priority)
+        waiting.add(p.waiting)
+        tat.add(p.tat)
+
+    def add_table(self, table):
+        # add() for every row of a ProcessTable with its metrics columns filled in,
+        # a column at a time when NumPy is installed
+        if np is None:
+            for p in table:
+                self.add(p)
+            return
+        tat = np.frombuffer(table.tat, dtype=np.int64)
+        waiting = np.frombuffer(table.waiting, dtype=np.int64)
+        priority = np.frombuffer(table.priority, dtype=np.int64)
+        totals = self.totals
+        totals.count += len(table)
+        totals.total_tat += int(tat.sum())
+        totals.total_waiting += int(waiting.sum())
+        # Summed in row order, to the same float as adding one row at a time
+        totals.total_ntat = float(np.cumsum(np.concatenate(([totals.total_ntat], table.ntat)))[-1])
+        self.waiting.add_values(waiting)
+        self.tat.add_values(tat)
+        order = np.argsort(priority, kind="stable")
+        values, firsts = np.unique(priority[order], return_index=True)
+        for value, waiting_group, tat_group in zip(values.tolist(), np.split(waiting[order], firsts[1:]),
+                                                   np.split(tat[order], firsts[1:])):
+            waiting_histogram, tat_histogram = self.priority_histograms(value)
+            waiting_histogram.add_values(waiting_group)
+            tat_histogram.add_values(tat_group)
+
+    def priority_histograms(self, priority):
+        histograms = self.by_priority.get(priority)
+        if histograms is None:
+            histograms = self.by_priority[priority] = (Histogram(self.precision), Histogram(self.precision))
+        return histograms
+
+    def merge(self, other):
+        self.totals.merge(other.totals)
+        self.waiting.merge(other.waiting)
+        self.tat.merge(other.tat)
+        for priority, (waiting, tat) in other.by_priority.items():
+            own_waiting, own_tat = self.priority_histograms(priority)
+            own_waiting.merge(waiting)
+            own_tat.merge(tat)
+
+    def summary(self):
+        avg_tat, avg_waiting, avg_ntat = self.totals.averages()
+        return {
+            "count": self.totals.count,
+            "averages": {"tat": avg_tat, "waiting": avg_waiting, "ntat": avg_ntat},
+            "waiting": describe(self.waiting),
+            "tat": describe(self.tat),
+            "by_priority": {priority: {"count": waiting.count,
+                                       "waiting": describe(waiting),
+                                       "tat": describe(tat)}
+                            for priority, (waiting, tat) in sorted(self.by_priority.items())},
+        }
+
+    def to_dict(self):
+        totals = self.totals
+        return {
+            "precision": self.precision,
+            "totals": [totals.count, totals.total_tat, totals.total_waiting, totals.total_ntat],
+            "waiting": self.waiting.to_dict(),
+            "tat": self.tat.to_dict(),
+            "by_priority": [[priority, waiting.to_dict(), tat.to_dict()]
+                            for priority, (waiting, tat) in sorted(self.by_priority.items())],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        metrics = cls(data["precision"])
+        totals = metrics.totals
+        totals.count, totals.total_tat, totals.total_waiting, totals.total_ntat = data["totals"]
+        metrics.waiting = Histogram.from_dict(data["waiting"])
+        metrics.tat = Histogram.from_dict(data["tat"])
+        for priority, waiting, tat in data["by_priority"]:
+            metrics.by_priority[priority] = (Histogram.from_dict(waiting), Histogram.from_dict(tat))
+        return metrics
+
+def describe(histogram):
+    p50, p95, p99 = histogram.percentiles(PERCENTILES)
+    return {"p50": p50, "p95": p95, "p99": p99, "max": histogram.max}
@@ -0,0 +1,15 @@
+class Process:
+    __slots__ = ("pid", "arrival", "service", "priority", "remaining",
+                 "finish", "waiting", "tat", "ntat", "completed")
+
+    def __init__(self, pid="", arrival=0, service=0, priority=0):
+        self.pid = pid
+        self.arrival = arrival
+        self.service = service
+        self.priority = priority  # Lower number = higher priority
+        self.remaining = service
+        self.finish = 0
+        self.waiting = 0
+        self.tat = 0
+        self.ntat = 0
+        self.completed = False
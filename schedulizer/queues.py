@@ -0,0 +1,262 @@
+import heapq
+
+INF = float('inf')
+
+class ArrivalFeed:
+    # Hands out processes from an arrival-ordered iterable as simulated time reaches
+    # them. Only the next pending arrival is held, so a generator over a trace is read
+    # lazily instead of being loaded up front.
+    def __init__(self, processes):
+        self.source = iter(processes)
+        self.pending = next(self.source, None)
+        self.order = 0
+
+    def __bool__(self):
+        return self.pending is not None
+
+    def next_arrival(self):
+        return self.pending.arrival
+
+    def pop(self):
+        # Returns (arrival order, process)
+        p = self.pending
+        order = self.order
+        self.pending = next(self.source, None)
+        self.order += 1
+        return order, p
+
+class ResponseRatioQueue:
+    # Ready queue for HRRN. The response ratio 1 + (time - arrival) / service of every
+    # ready process grows linearly with time, so the queue is a kinetic tournament tree:
+    # each node keeps the winner of its subtree and the earliest time another process
+    # in the subtree can overtake it. Advancing the clock only revisits nodes whose
+    # winner may have changed, and push/pop touch a single leaf-to-root path.
+    # Ties go to the lower arrival order, as with the other ready queues.
+    def __init__(self):
+        self.size = 1
+        self.winner = [None] * 2
+        self.melt = [INF] * 2
+        self.free = [0]
+        self.count = 0
+        self.time = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, process, order, time):
+        self.advance(time)
+        if not self.free:
+            self.grow()
+        slot = self.free.pop()
+        node = self.size + slot
+        self.winner[node] = (process.arrival, process.service, order, process, slot)
+        self.count += 1
+        self.update(node // 2)
+
+    def pop(self, time):
+        self.advance(time)
+        entry = self.winner[1]
+        node = self.size + entry[4]
+        self.winner[node] = None
+        self.free.append(entry[4])
+        self.count -= 1
+        self.update(node // 2)
+        return entry[3]
+
+    def advance(self, time):
+        if time > self.time:
+            self.time = time
+            if self.melt[1] <= time:
+                self.recompute(1)
+
+    def recompute(self, node):
+        # Refresh every node whose cached winner may be stale at self.time
+        if node >= self.size:
+            return
+        if self.melt[2*node] <= self.time:
+            self.recompute(2*node)
+        if self.melt[2*node + 1] <= self.time:
+            self.recompute(2*node + 1)
+        self.pull(node)
+
+    def update(self, node):
+        while node:
+            self.pull(node)
+            node //= 2
+
+    def pull(self, node):
+        left = self.winner[2*node]
+        right = self.winner[2*node + 1]
+        melt = min(self.melt[2*node], self.melt[2*node + 1])
+        if left is None or right is None:
+            self.winner[node] = right if left is None else left
+            self.melt[node] = melt
+            return
+
+        t = self.time
+        left_ratio = (t - left[0] + left[1]) / left[1]
+        right_ratio = (t - right[0] + right[1]) / right[1]
+        if left_ratio > right_ratio or (left_ratio == right_ratio and left[2] < right[2]):
+            best, other = left, right
+        else:
+            best, other = right, left
+
+        # A shorter job's ratio rises faster and catches up at the crossing time
+        if other[1] < best[1]:
+            crossing = (other[0]*best[1] - best[0]*other[1]) / (best[1] - other[1])
+            melt = min(melt, crossing)
+
+        self.winner[node] = best
+        self.melt[node] = melt
+
+    def grow(self):
+        old_size = self.size
+        self.size *= 2
+        leaves = self.winner[old_size:]
+        self.winner = [None] * self.size + leaves + [None] * old_size
+        self.melt = [INF] * (2 * self.size)
+        self.free.extend(range(old_size, self.size))
+        for node in range(self.size - 1, 0, -1):
+            self.pull(node)
+
+# Load weight per nice value -20..19, as in Linux: each step is about 1.25x, so a
+# process one level more important gets about 10% more CPU than its peer
+NICE_WEIGHTS = (
+    88761, 71755, 56483, 46273, 36291, 29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906, 3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423, 335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45, 36, 29, 23, 18, 15,
+)
+VRUNTIME_SCALE = 1024 << 16  # Fixed-point virtual time per unit run at nice 0
+
+def fair_weight(priority):
+    # The priority field is read as a nice value, clamped to -20..19
+    return NICE_WEIGHTS[min(19, max(-20, priority)) + 20]
+
+# The two time-sliced queues below follow the push/pop(time) protocol of the online
+# engine's queues, where pop returns (arrival order, process). They also tell the
+# scheduler how long a dispatched process may run (slice) and want to hear when one
+# finishes (retire), and they charge a process for the time it ran when it is
+# pushed back.
+
+class FairQueue:
+    # CFS-style ready queue: processes are kept in a heap by virtual runtime, which
+    # advances inversely to their weight, so CPU time is shared in proportion to
+    # weight. New processes start at the queue's minimum virtual runtime rather than
+    # zero, so they cannot monopolise the CPU. Each slice is a weight-proportional
+    # share of the latency period, never below min_granularity.
+    def __init__(self, min_granularity=4, latency=None):
+        if min_granularity < 1 or (latency is not None and latency < 1):
+            raise ValueError("min_granularity and latency must be positive")
+        self.min_granularity = min_granularity
+        self.latency = 8 * min_granularity if latency is None else latency
+        self.heap = []  # Heap of (virtual runtime, arrival order, process)
+        self.vruntime = {}  # Arrival order -> virtual runtime, for unfinished processes
+        self.weight = {}
+        self.dispatched = {}  # Arrival order -> dispatch time, for running processes
+        self.load = 0  # Total weight of unfinished processes
+        self.min_vruntime = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, process, order, time):
+        if order in self.dispatched:
+            ran = time - self.dispatched.pop(order)
+            vruntime = self.vruntime[order] + ran * VRUNTIME_SCALE // self.weight[order]
+        else:
+            weight = self.weight[order] = fair_weight(process.priority)
+            self.load += weight
+            vruntime = self.min_vruntime
+        self.vruntime[order] = vruntime
+        heapq.heappush(self.heap, (vruntime, order, process))
+
+    def pop(self, time):
+        vruntime, order, process = heapq.heappop(self.heap)
+        self.min_vruntime = max(self.min_vruntime, vruntime)
+        self.dispatched[order] = time
+        return order, process
+
+    def peek(self):
+        return self.heap[0][:2]
+
+    def slice(self, process, order, time):
+        period = max(self.latency, len(self.weight) * self.min_granularity)
+        return max(self.min_granularity, -(-period * self.weight[order] // self.load))
+
+    def retire(self, order, time):
+        self.dispatched.pop(order, None)
+        del self.vruntime[order]
+        self.load -= self.weight.pop(order)
+
+class FeedbackQueue:
+    # Multilevel feedback queue. A new process starts at level 0; one that uses up
+    # its level's quantum in total moves down a level, to the back, and the last
+    # level is plain round robin. A preempted process keeps its level and place.
+    # Every boost time units all waiting processes move back to level 0 in their
+    # current order, so long jobs cannot starve.
+    #
+    # Everything is one heap keyed (epoch, level, sequence), where epoch counts the
+    # boosts before the process got its place. A boost only bumps the current epoch:
+    # entries from earlier epochs then sort ahead of everything placed since, in the
+    # order they had, and those queued before the boost count as level 0 with a
+    # fresh quantum when popped.
+    def __init__(self, quantum=4, levels=3, quanta=None, boost=None):
+        self.quanta = tuple(quanta) if quanta else tuple(quantum << level for level in range(levels))
+        if not self.quanta or min(self.quanta) < 1:
+            raise ValueError("MLFQ needs at least one level, and every quantum must be positive")
+        self.boost = 10 * self.quanta[-1] if boost is None else boost
+        if self.boost < 0:
+            raise ValueError("boost period must not be negative")
+        self.next_boost = self.boost or INF
+        self.epoch = 0
+        self.heap = []  # Heap of (epoch, level, sequence, arrival order, process, epoch when queued)
+        self.key = {}  # Arrival order -> (epoch, level, sequence), for unfinished processes
+        self.used = {}  # Arrival order -> time used of the current level's quantum
+        self.dispatched = {}  # Arrival order -> dispatch time, for running processes
+        self.sequence = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def advance(self, time):
+        if time >= self.next_boost:
+            self.epoch += 1
+            self.next_boost += self.boost * ((time - self.next_boost) // self.boost + 1)
+
+    def push(self, process, order, time):
+        self.advance(time)
+        if order in self.dispatched:
+            used = self.used[order] + time - self.dispatched.pop(order)
+            epoch, level, _ = key = self.key[order]
+            if used >= self.quanta[level]:
+                key = (self.epoch, min(level + 1, len(self.quanta) - 1), self.sequence)
+                self.sequence += 1
+                used = 0
+        else:
+            key = (self.epoch, 0, self.sequence)
+            self.sequence += 1
+            used = 0
+        self.key[order] = key
+        self.used[order] = used
+        heapq.heappush(self.heap, key + (order, process, self.epoch))
+
+    def pop(self, time):
+        self.advance(time)
+        epoch, level, sequence, order, process, queued = heapq.heappop(self.heap)
+        if queued < self.epoch:
+            # Boosted while waiting
+            self.key[order] = (epoch, 0, sequence)
+            self.used[order] = 0
+        self.dispatched[order] = time
+        return order, process
+
+    def peek(self):
+        return self.heap[0][:3]
+
+    def slice(self, process, order, time):
+        return self.quanta[self.key[order][1]] - self.used[order]
+
+    def retire(self, order, time):
+        self.dispatched.pop(order, None)
+        del self.key[order], self.used[order]
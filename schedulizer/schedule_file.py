@@ -0,0 +1,433 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from .gantt import SegmentColumns
+from .metrics import StreamingMetrics, process_metrics
+from .process import Process
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Saved schedules: a fixed prelude (magic, format, header length), a JSON header
+# describing the columns, then every column as a packed array of fixed-width
+# integers, each 8-byte aligned. Each column uses the narrowest of 1, 2, 4 or 8
+# bytes that holds its values. PIDs are stored once, in a dictionary of UTF-8
+# names that the segment and process columns refer to by code.
+MAGIC = b"SCHEDULE"
+FILE_FORMAT = 1
+PRELUDE = struct.Struct("<8sII")
+WIDTHS = "bhiq"  # array typecodes of 1, 2, 4 and 8 bytes
+CHUNK = 1 << 16
+PROCESS_COLUMNS = ("pid", "arrival", "service", "priority", "finish")
+SEGMENT_COLUMNS = ("start", "end", "code", "busy")
+
+def aligned(size):
+    return -(-size // 8) * 8
+
+class SpillColumn:
+    # int64 values buffered in memory and spilled to a temporary file, with their
+    # range tracked so the narrowest width can be chosen when the file is written
+    def __init__(self):
+        self.file = tempfile.TemporaryFile()
+        self.buffer = array("q")
+        self.count = 0
+        self.low = 0
+        self.high = 0
+
+    def append(self, value):
+        self.buffer.append(value)
+        if len(self.buffer) >= CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.low = min(self.low, min(self.buffer))
+            self.high = max(self.high, max(self.buffer))
+            self.count += len(self.buffer)
+            self.file.write(self.buffer.tobytes())
+            self.buffer = array("q")
+
+    def typecode(self):
+        for code in WIDTHS:
+            limit = 1 << (8 * array(code).itemsize - 1)
+            if -limit <= self.low and self.high < limit:
+                return code
+        return "q"
+
+    def copy_to(self, out, typecode):
+        self.file.seek(0)
+        while True:
+            data = self.file.read(8 * CHUNK)
+            if not data:
+                break
+            if typecode == "q":
+                out.write(data)
+            elif np is not None:
+                out.write(np.frombuffer(data, dtype=np.int64).astype(np.dtype(typecode)).tobytes())
+            else:
+                out.write(array(typecode, array("q", data)).tobytes())
+
+    def close(self):
+        self.file.close()
+
+class LaneWriter:
+    # Segment columns of one CPU. The last segment is held back until the next one
+    # shows whether it continues it.
+    def __init__(self):
+        self.columns = [SpillColumn() for _ in SEGMENT_COLUMNS]
+        self.pending = None  # (start, end, code)
+        self.busy = 0  # CPU time before the pending segment
+
+    def add(self, start, end, code):
+        pending = self.pending
+        if pending is not None:
+            if start < pending[1]:
+                raise ValueError(f"Segment at {start} overlaps the previous one, which ends at {pending[1]}")
+            if start == pending[1] and code == pending[2]:
+                self.pending = (pending[0], end, code)
+                return
+            self.write()
+        self.pending = (start, end, code)
+
+    def write(self):
+        start, end, code = self.pending
+        starts, ends, codes, busy = self.columns
+        starts.buffer.append(start)
+        ends.buffer.append(end)
+        codes.buffer.append(code)
+        busy.buffer.append(self.busy)
+        if code >= 0:
+            self.busy += end - start
+        if len(starts.buffer) >= CHUNK:
+            for column in self.columns:
+                column.flush()
+
+    def finish(self):
+        if self.pending is not None:
+            self.write()
+            self.pending = None
+
+class ScheduleWriter:
+    # Builds a schedule file from Gantt segments and finished processes as they come,
+    # so a streamed run can be saved without holding it in memory. Segments must be
+    # added in time order per lane; adjacent runs of the same PID are merged, as in
+    # SegmentColumns. The file only appears, complete, when close() is called.
+    def __init__(self, path, **metadata):
+        self.path = path
+        self.metadata = metadata
+        self.pid_codes = {}
+        self.pid_offsets = SpillColumn()
+        self.pid_offsets.append(0)
+        self.pid_data = tempfile.TemporaryFile()
+        self.pid_buffer = bytearray()
+        self.pid_size = 0
+        self.lanes = []
+        self.processes = {name: SpillColumn() for name in PROCESS_COLUMNS}
+        self.metrics = StreamingMetrics()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def code(self, pid):
+        if pid is None:
+            return -1
+        code = self.pid_codes.get(pid)
+        if code is None:
+            code = self.pid_codes[pid] = len(self.pid_codes)
+            self.pid_buffer += pid.encode()
+            self.pid_offsets.append(self.pid_size + len(self.pid_buffer))
+            if len(self.pid_buffer) >= 8 * CHUNK:
+                self.flush_pids()
+        return code
+
+    def lane(self, index):
+        while len(self.lanes) <= index:
+            self.lanes.append(LaneWriter())
+        return self.lanes[index]
+
+    def add_segment(self, start, end, pid, lane=0):
+        self.lane(lane).add(start, end, self.code(pid))
+
+    def add_segments(self, segments, lane=0):
+        add = self.lane(lane).add
+        code = self.code
+        for start, end, pid in segments:
+            add(start, end, code(pid))
+
+    def flush_pids(self):
+        self.pid_data.write(self.pid_buffer)
+        self.pid_size += len(self.pid_buffer)
+        self.pid_buffer = bytearray()
+
+    def add_process(self, p):
+        # p must be finished, with its tat, waiting and ntat filled in
+        self.metrics.add(p)
+        columns = self.processes
+        columns["pid"].append(self.code(p.pid))
+        columns["arrival"].append(p.arrival)
+        columns["service"].append(p.service)
+        columns["priority"].append(p.priority)
+        columns["finish"].append(p.finish)
+
+    def add_processes(self, processes):
+        for p in processes:
+            self.add_process(p)
+
+    def spill_columns(self):
+        yield self.pid_offsets
+        for lane in self.lanes:
+            yield from lane.columns
+        yield from self.processes.values()
+
+    def close(self):
+        for lane in self.lanes:
+            lane.finish()
+        for column in self.spill_columns():
+            column.flush()
+        self.flush_pids()
+
+        # Lay out the data section: every column gets an aligned offset in it
+        layout = []
+        offset = 0
+
+        def place(column):
+            nonlocal offset
+            typecode = column.typecode()
+            layout.append((column, typecode, offset))
+            spec = [offset, column.count, typecode]
+            offset += aligned(column.count * array(typecode).itemsize)
+            return spec
+
+        pid_offsets = place(self.pid_offsets)
+        pid_data = [offset, self.pid_size]
+        offset += aligned(self.pid_size)
+        header = {
+            "format": FILE_FORMAT,
+            "byteorder": sys.byteorder,
+            "metadata": self.metadata,
+            "metrics": self.metrics.to_dict(),
+            "pids": {"offsets": pid_offsets, "data": pid_data},
+            "lanes": [dict({name: place(column) for name, column in zip(SEGMENT_COLUMNS, lane.columns)},
+                           busy_total=lane.busy) for lane in self.lanes],
+            "processes": {name: place(column) for name, column in self.processes.items()},
+        }
+        header = json.dumps(header).encode()
+        base = aligned(PRELUDE.size + len(header))
+
+        # Write to a temporary file first so readers never see a partial schedule
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(PRELUDE.pack(MAGIC, FILE_FORMAT, len(header)))
+                out.write(header)
+                for column, typecode, start in layout:
+                    out.seek(base + start)
+                    column.copy_to(out, typecode)
+                out.seek(base + pid_data[0])
+                self.pid_data.seek(0)
+                while True:
+                    data = self.pid_data.read(8 * CHUNK)
+                    if not data:
+                        break
+                    out.write(data)
+                # Pad the last column so the file is as long as the layout says
+                out.truncate(base + offset)
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        finally:
+            self.discard()
+
+    def discard(self):
+        for column in self.spill_columns():
+            column.close()
+        self.pid_data.close()
+
+def write_schedule(path, processes, gantts, **metadata):
+    # Saves a finished run: gantts holds one segment list (or SegmentColumns) per CPU
+    with ScheduleWriter(path, **metadata) as writer:
+        for lane, gantt in enumerate(gantts):
+            writer.lane(lane)
+            if isinstance(gantt, SegmentColumns):
+                gantt = gantt.window(0, gantt.end_time())
+            writer.add_segments(gantt, lane)
+        writer.add_processes(processes)
+
+class PidNames:
+    # Read-only sequence of PID names decoded from the file on access
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, code):
+        if not 0 <= code < len(self):
+            raise IndexError("pid code out of range")
+        return str(self.data[self.offsets[code]:self.offsets[code + 1]], "utf-8")
+
+class MappedSegments(SegmentColumns):
+    # SegmentColumns over columns of a mapped schedule file, so the Gantt view and
+    # time-range queries read pages of the file only as they touch them
+    def __init__(self, starts, ends, codes, busy, busy_total, pid_names):
+        self.starts = starts
+        self.ends = ends
+        self.codes = codes
+        self.busy = busy
+        self.busy_total = busy_total
+        self.pid_names = pid_names
+
+    def extend(self, segments):
+        raise TypeError("a saved schedule is read-only")
+
+class ScheduleFile:
+    # A saved schedule, memory-mapped rather than read. Columns are memoryviews
+    # into the mapping, so opening a file costs the same whatever its size.
+    # lanes[i] holds CPU i's segments; segments(start, end) returns the ones
+    # overlapping a time window, and processes are read back by row.
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.views = []
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{path} is not a schedule file") from None
+        try:
+            self.load(path)
+        except (KeyError, IndexError, TypeError):
+            # Readable JSON, but not laid out as a schedule header
+            self.close()
+            raise ValueError(f"{path} is not a schedule file") from None
+        except BaseException:
+            self.close()
+            raise
+
+    def load(self, path):
+        if len(self.map) < PRELUDE.size:
+            raise ValueError(f"{path} is not a schedule file")
+        magic, version, header_size = PRELUDE.unpack_from(self.map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a schedule file")
+        if version != FILE_FORMAT:
+            raise ValueError(f"{path} has schedule format {version}, expected {FILE_FORMAT}")
+        header = json.loads(bytes(self.map[PRELUDE.size:PRELUDE.size + header_size]))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {header['byteorder']}-endian machine")
+
+        self.header = header
+        self.metadata = header["metadata"]
+        self.base = aligned(PRELUDE.size + header_size)
+        whole = self.view(memoryview(self.map))
+
+        pids = header["pids"]
+        data_start, data_size = pids["data"]
+        data = self.view(whole[self.base + data_start:self.base + data_start + data_size])
+        if len(data) != data_size:
+            raise ValueError(f"{path} is truncated")
+        self.pid_names = PidNames(self.column(whole, pids["offsets"], path), data)
+        self.lanes = [MappedSegments(*(self.column(whole, lane[name], path) for name in SEGMENT_COLUMNS),
+                                     lane["busy_total"], self.pid_names)
+                      for lane in header["lanes"]]
+        columns = header["processes"]
+        self.pid, self.arrival, self.service, self.priority, self.finish = (
+            self.column(whole, columns[name], path) for name in PROCESS_COLUMNS)
+
+    def view(self, view):
+        self.views.append(view)
+        return view
+
+    def column(self, whole, spec, path):
+        offset, count, typecode = spec
+        start = self.base + offset
+        end = start + count * array(typecode).itemsize
+        if end > len(whole):
+            raise ValueError(f"{path} is truncated")
+        return self.view(self.view(whole[start:end]).cast(typecode))
+
+    def __len__(self):
+        return len(self.arrival)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        # Views must go before the mapping; anything still sharing their buffer
+        # (a NumPy array, say) keeps the mapping open until it is collected
+        for view in reversed(self.views):
+            try:
+                view.release()
+            except BufferError:
+                return
+        self.views = []
+        if not self.map.closed:
+            self.map.close()
+        self.file.close()
+
+    def end_time(self):
+        return max((lane.end_time() for lane in self.lanes), default=0)
+
+    def segments(self, start, end, lane=0):
+        return self.lanes[lane].window(start, end)
+
+    def process(self, index):
+        # Row index as a finished Process with its metrics
+        if index < 0:
+            index += len(self)
+        p = Process(self.pid_names[self.pid[index]], self.arrival[index],
+                    self.service[index], self.priority[index])
+        p.finish = self.finish[index]
+        p.remaining = 0
+        p.completed = True
+        process_metrics(p)
+        return p
+
+    def processes(self, start=0, stop=None):
+        for index in range(*slice(start, stop).indices(len(self))):
+            yield self.process(index)
+
+    def active(self, start, end):
+        # Row indices of the processes in the system at some point in [start, end)
+        if np is not None:
+            arrival = np.frombuffer(self.arrival, dtype=self.arrival.format)
+            finish = np.frombuffer(self.finish, dtype=self.finish.format)
+            return np.flatnonzero((arrival < end) & (finish > start)).tolist()
+        return [index for index, (arrival, finish) in enumerate(zip(self.arrival, self.finish))
+                if arrival < end and finish > start]
+
+    def metrics(self):
+        # Percentile histograms of the saved run, as collected when it was written
+        return StreamingMetrics.from_dict(self.header["metrics"])
+
+    def utilization(self):
+        end = self.end_time()
+        return [lane.busy_total / end if end else 0.0 for lane in self.lanes]
+
+def is_schedule_file(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
@@ -0,0 +1,137 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+
+from .algorithms import ALGORITHMS, prepare_processes, run_stream
+from .cache import apply_finish
+from .metrics import StreamingMetrics, process_metrics
+from .table import ProcessTable, np
+
+# Every scheduler here is work-conserving, so the CPU only goes idle once every
+# process that has arrived is finished. What it does after that gap can't depend on
+# anything before it: the ready queues are empty, and the state they keep between
+# busy periods (the CFS minimum virtual runtime, MLFQ's sequence numbers and boost
+# epoch) only matters relative to processes still to come. So the workload splits at
+# those gaps into shards that can be scheduled separately, in parallel, and the
+# stitched result is the serial schedule exactly.
+SHARDS_PER_WORKER = 4  # More shards than workers, so an uneven split still keeps every worker busy
+
+# Each pool worker receives the workload once, through the initializer, and keeps it
+# here, as compare.py does
+worker_table = None
+
+def init_worker(table):
+    global worker_table
+    worker_table = table
+
+def busy_period_starts(table):
+    # Rows of an arrival-sorted table that arrive to an idle CPU: row 0, and every row
+    # arriving after all the work before it is done. With the rows before i alone,
+    # the CPU finishes at the latest arrival plus all the work from then on.
+    count = len(table)
+    if not count:
+        return []
+    if np is not None:
+        arrival = np.frombuffer(table.arrival, dtype=np.int64)
+        service = np.frombuffer(table.service, dtype=np.int64)
+        done = np.cumsum(service)
+        ends = done + np.maximum.accumulate(arrival - (done - service))
+        return [0] + (np.flatnonzero(arrival[1:] > ends[:-1]) + 1).tolist()
+    starts = [0]
+    end = 0
+    for i, (arrival, service) in enumerate(zip(table.arrival, table.service)):
+        if i and arrival > end:
+            starts.append(i)
+        end = max(end, arrival) + service
+    return starts
+
+def plan_shards(table, shards):
+    # Splits the table into at most shards ranges of rows, each with about the same
+    # total service time, cutting only where a busy period starts. A busy period
+    # starts a new shard when the work before it passes another 1/shards of the total.
+    starts = busy_period_starts(table)
+    if not starts:
+        return []
+    if np is not None:
+        work = np.concatenate(([0], np.cumsum(np.frombuffer(table.service, dtype=np.int64))))
+        passed = np.minimum(work[starts] * shards // work[-1], shards - 1)
+        cuts = np.asarray(starts[1:])[np.diff(passed) > 0].tolist()
+    else:
+        work = [0, *accumulate(table.service)]
+        cuts, last = [], 0
+        for start in starts[1:]:
+            passed = min(work[start] * shards // work[-1], shards - 1)
+            if passed > last:
+                cuts.append(start)
+            last = passed
+    bounds = [0] + cuts + [len(table)]
+    return list(zip(bounds, bounds[1:]))
+
+def run_shard(name, quantum, options, start, stop, with_metrics, table=None):
+    # Schedules rows start to stop on their own. Returns their Gantt segments, finish
+    # times in row order and, if asked for, their metrics and NTATs in row order.
+    table = worker_table if table is None else table
+    processes = list(table.processes(start, stop))
+    if with_metrics:
+        metrics = StreamingMetrics()
+
+        def record(p):
+            process_metrics(p)
+            metrics.add(p)
+    else:
+        metrics = record = None
+
+    gantt = run_stream(name, processes, quantum, None, record, **options)
+    ntat = array("d", (p.ntat for p in processes)) if with_metrics else None
+    return gantt, array("q", (p.finish for p in processes)), metrics, ntat
+
+def run_sharded(name, processes, quantum=4, workers=None, metrics=None, **options):
+    # Drop-in for run_algorithm that schedules the busy periods of a workload in a
+    # process pool. Returns the same Gantt chart and fills in the same finish times
+    # as a serial run. metrics, if given, gets every process merged in from the
+    # shards; tracing needs the serial run.
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {name}")
+    prepare_processes(processes)
+    table = processes if isinstance(processes, ProcessTable) else ProcessTable(processes)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    shards = plan_shards(table, workers * SHARDS_PER_WORKER)
+    if workers <= 1 or len(shards) <= 1:
+        results = [run_shard(name, quantum, options, start, stop, metrics is not None, table)
+                   for start, stop in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards)), initializer=init_worker,
+                                 initargs=(table,)) as pool:
+            futures = [pool.submit(run_shard, name, quantum, options, start, stop, metrics is not None)
+                       for start, stop in shards]
+            results = [future.result() for future in futures]
+
+    # A shard starts with an idle segment from time 0, which in the serial run
+    # starts where the shard before it ended
+    gantt = []
+    finish = array("q")
+    ntat = array("d")
+    total_ntat = metrics.totals.total_ntat if metrics is not None else 0
+    for shard_gantt, shard_finish, shard_metrics, shard_ntat in results:
+        if gantt:
+            start, end, pid = shard_gantt[0]
+            shard_gantt[0] = (gantt[-1][1], end, pid)
+        gantt.extend(shard_gantt)
+        finish.extend(shard_finish)
+        if metrics is not None:
+            metrics.merge(shard_metrics)
+            ntat.extend(shard_ntat)
+    if metrics is not None:
+        # A float total depends on the order it is added up in, so the NTATs are added
+        # again one at a time in row order, as a serial pass over the table does
+        if np is not None:
+            total_ntat = float(np.cumsum(np.concatenate(([total_ntat], ntat)))[-1])
+        else:
+            for value in ntat:
+                total_ntat += value
+        metrics.totals.total_ntat = total_ntat
+    apply_finish(processes, finish)
+    return gantt
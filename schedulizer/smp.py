@@ -0,0 +1,231 @@
+import heapq
+
+from .algorithms import finish_process
+from .engine import POLICIES
+from .gantt import add_segment
+from .queues import ArrivalFeed
+
+RUN_QUEUES = ("global", "per-core")
+
+class LoadHeap:
+    # Cores ordered by load, lightest first (pass sign=-1 for heaviest first). Entries
+    # are pushed on every change and stale ones are skipped when popped, so finding
+    # the lightest or heaviest core never scans all cores.
+    def __init__(self, loads, sign=1):
+        self.loads = loads
+        self.sign = sign
+        self.heap = [(0, core) for core in range(len(loads))]
+
+    def changed(self, core):
+        heapq.heappush(self.heap, (self.sign * self.loads[core], core))
+        if len(self.heap) > 4 * len(self.loads) + 64:
+            self.heap = [(self.sign * load, core) for core, load in enumerate(self.loads)]
+            heapq.heapify(self.heap)
+
+    def top(self):
+        heap = self.heap
+        while heap[0][0] != self.sign * self.loads[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+class SmpScheduler:
+    # Discrete-event simulation of an algorithm on several CPUs, with one Gantt lane
+    # per core. With the "global" run queue every core takes work from one shared
+    # ready queue, and an idle core is found through a heap of idle core numbers.
+    # With "per-core" run queues each arrival goes to the least loaded core, and a
+    # core that runs out of work steals the next process of the most loaded one.
+    # Either way each event costs O(log cores + log processes).
+    #
+    # For SRT and preemptive priority an arrival preempts the running process with
+    # the worst key: the one on the same core with per-core queues, or the worst on
+    # any core with the global queue, found through a heap of running processes. A
+    # running SRT process's remaining time falls as it runs, so that heap keys it on
+    # remaining + dispatch time, which orders the running processes the same way at
+    # any later time. Preempted processes and those whose slice expired go back to
+    # the queue they came from. A stolen process starts afresh in the thief's queue,
+    # as a new arrival would. With one CPU the schedule is the same as the batch
+    # scheduler's. gantts may supply the per-core segment lists, like the gantt
+    # argument of the batch schedulers.
+    def __init__(self, name, cpus, quantum=4, run_queues="global", on_finish=None, gantts=None,
+                 **options):
+        if name not in POLICIES:
+            raise ValueError(f"Unknown algorithm: {name}")
+        if cpus < 1:
+            raise ValueError("cpus must be a positive integer")
+        if run_queues not in RUN_QUEUES:
+            raise ValueError(f"Unknown run queue mode: {run_queues}")
+
+        new_queue, self.preemptive = POLICIES[name]
+        self.shrinks = name == "srt"
+        self.cpus = cpus
+        self.shared = run_queues == "global"
+        self.on_finish = on_finish
+        self.gantts = [[] for _ in range(cpus)] if gantts is None else gantts
+
+        self.current = [None] * cpus
+        self.order = [None] * cpus  # Arrival order of the running process
+        self.start = [0] * cpus  # Start of the running slice, or when the core went idle
+        self.rank = [None] * cpus  # Preemption key of the running process
+        self.serial = [0] * cpus  # Bumped whenever a slice ends, to spot stale events
+        self.ends = []  # Heap of (end time, core, serial) of running slices
+
+        if self.shared:
+            self.queues = [new_queue(quantum, **options)] * cpus
+            self.idle = list(range(cpus))  # Heap of idle cores
+            self.running = []  # Heap of (negated rank, core, serial) for preemption
+        else:
+            self.queues = [new_queue(quantum, **options) for _ in range(cpus)]
+            self.loads = [0] * cpus  # Queued processes plus the running one
+            self.lightest = LoadHeap(self.loads)
+            self.heaviest = LoadHeap(self.loads, -1)
+        self.timesliced = hasattr(self.queues[0], "slice")
+
+    def run(self, processes):
+        arrivals = ArrivalFeed(processes)
+        ends = self.ends
+        while arrivals or ends:
+            time = ends[0][0] if ends else None
+            if arrivals and (time is None or arrivals.next_arrival() < time):
+                time = arrivals.next_arrival()
+
+            # Slices ending now: finished processes leave, RR requeues the rest after
+            # the arrivals below, as on a single CPU
+            touched = []
+            expired = []
+            while ends and ends[0][0] == time:
+                _, core, serial = heapq.heappop(ends)
+                if serial != self.serial[core]:
+                    continue
+                p, order = self.current[core], self.order[core]
+                self.stop(core, time)
+                if p.remaining == 0:
+                    if self.timesliced:
+                        self.queues[core].retire(order, time)
+                    finish_process(p, time, self.on_finish)
+                else:
+                    expired.append((core, p, order))
+                self.went_idle(core)
+                touched.append(core)
+
+            while arrivals and arrivals.next_arrival() <= time:
+                order, p = arrivals.pop()
+                core = 0 if self.shared else self.lightest.top()
+                self.enqueue(core, p, order, time)
+                touched.append(core)
+
+            for core, p, order in expired:
+                self.enqueue(core, p, order, time)
+
+            if self.shared:
+                self.dispatch_shared(time)
+            else:
+                for core in sorted(set(touched)):
+                    self.dispatch_local(core, time)
+
+            # Drop slice ends that preemptions made stale
+            while ends and ends[0][2] != self.serial[ends[0][1]]:
+                heapq.heappop(ends)
+
+        return self.gantts
+
+    def enqueue(self, core, p, order, time):
+        self.queues[core].push(p, order, time)
+        if not self.shared:
+            self.add_load(core, 1)
+
+    def add_load(self, core, change):
+        self.loads[core] += change
+        self.lightest.changed(core)
+        self.heaviest.changed(core)
+
+    def dispatch(self, core, queue, time):
+        if self.preemptive:
+            rank = queue.peek()
+            if self.shrinks:
+                rank = (rank[0] + time, rank[1])
+            self.rank[core] = rank
+            if self.shared:
+                heapq.heappush(self.running, (tuple(-x for x in rank), core, self.serial[core]))
+        order, p = queue.pop(time)
+        add_segment(self.gantts[core], self.start[core], time, None)
+        self.current[core] = p
+        self.order[core] = order
+        self.start[core] = time
+        run_time = p.remaining
+        if self.timesliced:
+            run_time = min(queue.slice(p, order, time), run_time)
+        heapq.heappush(self.ends, (time + run_time, core, self.serial[core]))
+
+    def stop(self, core, time):
+        p = self.current[core]
+        add_segment(self.gantts[core], self.start[core], time, p.pid)
+        p.remaining -= time - self.start[core]
+        self.current[core] = None
+        self.start[core] = time
+        self.serial[core] += 1
+
+    def went_idle(self, core):
+        if self.shared:
+            heapq.heappush(self.idle, core)
+        else:
+            self.add_load(core, -1)
+
+    def running_key(self, core, time):
+        # Key the running process would have if it were back in the ready queue now
+        rank = self.rank[core]
+        return (rank[0] - time, rank[1]) if self.shrinks else rank
+
+    def dispatch_shared(self, time):
+        queue = self.queues[0]
+        while queue and self.idle:
+            self.dispatch(heapq.heappop(self.idle), queue, time)
+
+        if not self.preemptive:
+            return
+        running = self.running
+        while queue and running:
+            _, core, serial = running[0]
+            if serial != self.serial[core]:
+                heapq.heappop(running)
+                continue
+            if queue.peek() >= self.running_key(core, time):
+                break
+            heapq.heappop(running)
+            p, order = self.current[core], self.order[core]
+            self.stop(core, time)
+            self.dispatch(core, queue, time)
+            queue.push(p, order, time)
+
+    def dispatch_local(self, core, time):
+        queue = self.queues[core]
+        if self.current[core] is None:
+            if not queue:
+                victim = self.heaviest.top()
+                if self.loads[victim] < 2:
+                    return
+                # Take the victim's next process, as it would have run it next
+                order, p = self.queues[victim].pop(time)
+                if self.timesliced:
+                    self.queues[victim].retire(order, time)
+                self.add_load(victim, -1)
+                self.enqueue(core, p, order, time)
+            self.dispatch(core, queue, time)
+        elif self.preemptive and queue and queue.peek() < self.running_key(core, time):
+            p, order = self.current[core], self.order[core]
+            self.stop(core, time)
+            self.dispatch(core, queue, time)
+            queue.push(p, order, time)
+
+def run_smp(name, processes, cpus, quantum=4, run_queues="global", on_finish=None, gantts=None,
+            **options):
+    # Runs an algorithm on cpus cores over arrival-ordered processes and returns one
+    # Gantt list per core
+    return SmpScheduler(name, cpus, quantum, run_queues, on_finish, gantts, **options).run(processes)
+
+def core_utilization(gantts):
+    # Busy fraction of each core over the whole schedule
+    makespan = max((gantt[-1][1] for gantt in gantts if gantt), default=0)
+    if not makespan:
+        return [0.0] * len(gantts)
+    return [sum(end - start for start, end, pid in gantt if pid is not None) / makespan
+            for gantt in gantts]
@@ -0,0 +1,235 @@
+from array import array
+from itertools import accumulate
+from operator import attrgetter, sub
+
+from .process import Process
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def int_column(values):
+    # array("q") of values; a NumPy array is copied as one block, not value by value
+    if np is not None and isinstance(values, np.ndarray):
+        return array("q", values.astype(np.int64).tobytes())
+    return array("q", values)
+
+def column(name, writable=False):
+    table_column = attrgetter(name)
+
+    def get(row):
+        return table_column(row.table)[row.index]
+
+    def set(row, value):
+        table_column(row.table)[row.index] = value
+
+    return property(get, set if writable else None)
+
+class ProcessRow:
+    # View of one row of a ProcessTable with the same attributes as Process, so the
+    # schedulers can run on a table unchanged. Rows are created on demand and hold
+    # no data of their own.
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def pid(self):
+        return self.table.pid_name(self.table.pid_index[self.index])
+
+    arrival = column("arrival")
+    service = column("service")
+    priority = column("priority")
+    remaining = column("remaining", writable=True)
+    finish = column("finish", writable=True)
+    tat = column("tat")
+    waiting = column("waiting")
+    ntat = column("ntat")
+
+    @property
+    def completed(self):
+        return bool(self.table.completed[self.index])
+
+    @completed.setter
+    def completed(self, value):
+        self.table.completed[self.index] = 1 if value else 0
+
+class ProcessTable:
+    # Struct-of-arrays replacement for a list of Process objects. Every field is a
+    # typed array column, and PIDs are packed into one UTF-8 buffer that pid_index
+    # points into, so a process costs about a hundred bytes instead of an object,
+    # a dict and a dozen boxed ints. Metrics are computed a column at a time, with
+    # NumPy when it is installed.
+    def __init__(self, processes=()):
+        self.pid_data = bytearray()
+        self.pid_offsets = array("q", [0])
+        self.pid_index = array("q")
+        self.arrival = array("q")
+        self.service = array("q")
+        self.priority = array("q")
+        self.remaining = array("q")
+        self.finish = array("q")
+        self.completed = bytearray()
+        self.tat = array("q")
+        self.waiting = array("q")
+        self.ntat = array("d")
+        for p in processes:
+            self.append(p.pid, p.arrival, p.service, p.priority)
+
+    def __len__(self):
+        return len(self.arrival)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("process index out of range")
+        return ProcessRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ProcessRow(self, index)
+
+    def pid_name(self, index):
+        return self.pid_data[self.pid_offsets[index]:self.pid_offsets[index + 1]].decode()
+
+    def append(self, pid, arrival, service, priority=0):
+        self.pid_index.append(len(self.pid_offsets) - 1)
+        self.pid_data += pid.encode()
+        self.pid_offsets.append(len(self.pid_data))
+        self.arrival.append(arrival)
+        self.service.append(service)
+        self.priority.append(priority)
+        self.remaining.append(service)
+        self.finish.append(0)
+        self.completed.append(0)
+
+    def extend(self, pids, arrivals, services, priorities):
+        # Bulk append of whole columns, without a Python call per row
+        names = [pid.encode() for pid in pids]
+        self.extend_packed(b"".join(names), array("q", accumulate(map(len, names))),
+                           arrivals, services, priorities)
+
+    def extend_packed(self, pid_data, pid_ends, arrivals, services, priorities):
+        # Like extend, with the PIDs already packed back to back in pid_data; name i
+        # ends at offset pid_ends[i]. Columns may be NumPy arrays.
+        pid_ends, arrivals, services, priorities = (
+            int_column(values) for values in (pid_ends, arrivals, services, priorities))
+        count = len(pid_ends)
+        if not count == len(arrivals) == len(services) == len(priorities):
+            raise ValueError("columns must have the same length")
+
+        first_name = len(self.pid_offsets) - 1
+        base = len(self.pid_data)
+        self.pid_data += pid_data
+        if np is not None:
+            self.pid_offsets.extend(int_column(np.frombuffer(pid_ends, dtype=np.int64) + base))
+            self.pid_index.extend(int_column(np.arange(first_name, first_name + count)))
+        else:
+            self.pid_offsets.extend(end + base for end in pid_ends)
+            self.pid_index.extend(range(first_name, first_name + count))
+        self.arrival.extend(arrivals)
+        self.service.extend(services)
+        self.priority.extend(priorities)
+        self.remaining.extend(services)
+        self.finish.extend(array("q", [0]) * count)
+        self.completed.extend(bytes(count))
+
+    def extend_table(self, other):
+        # Appends every row of another table, reusing its packed PID names
+        first_name = len(self.pid_offsets) - 1
+        base = len(self.pid_data)
+        self.pid_data += other.pid_data
+        self.pid_offsets.extend(offset + base for offset in other.pid_offsets[1:])
+        self.pid_index.extend(index + first_name for index in other.pid_index)
+        self.arrival.extend(other.arrival)
+        self.service.extend(other.service)
+        self.priority.extend(other.priority)
+        self.remaining.extend(other.service)
+        self.finish.extend(array("q", [0]) * len(other))
+        self.completed.extend(bytes(len(other)))
+
+    def set_pid(self, index, pid):
+        # The old name stays in pid_data; rows only point at names
+        self.pid_index[index] = len(self.pid_offsets) - 1
+        self.pid_data += pid.encode()
+        self.pid_offsets.append(len(self.pid_data))
+
+    def copy(self, ranges=None):
+        # A new table before any run, with every row, or with rows start to stop of
+        # each (start, stop) in ranges, in that order
+        table = ProcessTable()
+        table.pid_data = bytearray(self.pid_data)
+        table.pid_offsets = array("q", self.pid_offsets)
+        for name in ("pid_index", "arrival", "service", "priority"):
+            column = getattr(self, name)
+            if ranges is None:
+                setattr(table, name, array("q", column))
+                continue
+            rows = array("q")
+            for start, stop in ranges:
+                rows.extend(column[start:stop])
+            setattr(table, name, rows)
+        table.reset()
+        return table
+
+    def processes(self, start=0, stop=None):
+        # Fresh Process objects for rows start to stop in table order, built only as a
+        # scheduler pulls them. A run over this generator leaves the table itself
+        # untouched.
+        pid_name = self.pid_name
+        columns = (self.pid_index, self.arrival, self.service, self.priority)
+        if start or stop is not None:
+            columns = [column[start:stop] for column in columns]
+        for index, arrival, service, priority in zip(*columns):
+            yield Process(pid_name(index), arrival, service, priority)
+
+    def sort(self):
+        # Stable sort by arrival time, like processes.sort(key=lambda p: p.arrival)
+        names = ("pid_index", "arrival", "service", "priority", "remaining", "finish")
+        if np is not None:
+            order = np.argsort(np.frombuffer(self.arrival, dtype=np.int64), kind="stable")
+            for name in names:
+                column = np.frombuffer(getattr(self, name), dtype=np.int64)
+                setattr(self, name, array("q", column[order].tobytes()))
+            self.completed = bytearray(np.frombuffer(self.completed, dtype=np.uint8)[order].tobytes())
+            return
+
+        order = sorted(range(len(self)), key=self.arrival.__getitem__)
+        for name in names:
+            column = getattr(self, name)
+            setattr(self, name, array("q", [column[i] for i in order]))
+        self.completed = bytearray(self.completed[i] for i in order)
+
+    def reset(self):
+        n = len(self)
+        self.remaining = array("q", self.service)
+        self.finish = array("q", [0]) * n
+        self.completed = bytearray(n)
+
+    def compute_metrics(self):
+        # Fills the tat, waiting and ntat columns and returns the averages
+        count = len(self)
+        if count == 0:
+            self.tat, self.waiting, self.ntat = array("q"), array("q"), array("d")
+            return 0, 0, 0
+
+        if np is not None:
+            finish = np.frombuffer(self.finish, dtype=np.int64)
+            arrival = np.frombuffer(self.arrival, dtype=np.int64)
+            service = np.frombuffer(self.service, dtype=np.int64)
+            tat = finish - arrival
+            waiting = tat - service
+            ntat = np.divide(tat, service, out=np.zeros(count), where=service > 0)
+            self.tat = array("q", tat.tobytes())
+            self.waiting = array("q", waiting.tobytes())
+            self.ntat = array("d", ntat.tobytes())
+            return float(tat.mean()), float(waiting.mean()), float(ntat.mean())
+
+        self.tat = array("q", map(sub, self.finish, self.arrival))
+        self.waiting = array("q", map(sub, self.tat, self.service))
+        self.ntat = array("d", (t / s if s > 0 else 0 for t, s in zip(self.tat, self.service)))
+        return sum(self.tat) / count, sum(self.waiting) / count, sum(self.ntat) / count
@@ -0,0 +1,188 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor
+
+from .table import ProcessTable
+from .workload import is_number, table_errors
+
+BAD_ROW_COLOR = QColor(255, 200, 200)
+
+class ProcessTableModel(QAbstractTableModel):
+    # Editable process list over a ProcessTable. The view asks only for the cells
+    # on screen, so the cost of a repaint doesn't depend on the number of rows, and
+    # rows are inserted in bulk with one notification per batch. A cell edited to
+    # text that isn't a number, or is too big for the column, keeps that text in an
+    # overlay instead, so validate() can flag it along with every other bad row in
+    # one pass.
+    HEADERS = ("PID", "Arrival Time", "Service Time", "Priority")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.table = ProcessTable()
+        self.raw = {}  # (row, column) -> text of cells that aren't numbers
+        self.errors = {}  # Row -> message, from the last validate()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.table)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.text(row, column)
+        if role == Qt.BackgroundRole and row in self.errors:
+            return BAD_ROW_COLOR
+        if role == Qt.ToolTipRole:
+            return self.errors.get(row)
+        return None
+
+    def text(self, row, column):
+        table = self.table
+        if column == 0:
+            return table.pid_name(table.pid_index[row])
+        raw = self.raw.get((row, column))
+        if raw is not None:
+            return raw
+        return str((table.arrival, table.service, table.priority)[column - 1][row])
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole:
+            return False
+        row, column = index.row(), index.column()
+        text = str(value).strip()
+        if column == 0:
+            self.table.set_pid(row, text)
+        elif is_number(text):
+            (self.table.arrival, self.table.service, self.table.priority)[column - 1][row] = int(text)
+            self.raw.pop((row, column), None)
+        else:
+            self.raw[(row, column)] = text
+        # The row is checked again by the next validate()
+        self.errors.pop(row, None)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        return True
+
+    def append_table(self, table):
+        if not len(table):
+            return
+        first = len(self.table)
+        self.beginInsertRows(QModelIndex(), first, first + len(table) - 1)
+        self.table.extend_table(table)
+        self.endInsertRows()
+
+    def append_rows(self, rows):
+        # rows of (pid, arrival, service, priority) text, as typed or pasted; values
+        # that aren't numbers are kept as text and flagged by validate()
+        pids, columns = [], ([], [], [])
+        first = len(self.table)
+        for row, (pid, *values) in enumerate(rows, start=first):
+            pids.append(str(pid).strip())
+            # Missing trailing values are left blank, and so flagged
+            values = (values + [""] * 3)[:3]
+            for column, value in enumerate(values, start=1):
+                text = str(value).strip()
+                if is_number(text):
+                    columns[column - 1].append(int(text))
+                else:
+                    columns[column - 1].append(0)
+                    self.raw[(row, column)] = text
+        if not pids:
+            return
+        self.beginInsertRows(QModelIndex(), first, first + len(pids) - 1)
+        self.table.extend(pids, *columns)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.table = ProcessTable()
+        self.raw = {}
+        self.errors = {}
+        self.endResetModel()
+
+    def validate(self):
+        # Checks every row at once and highlights the bad ones. Returns
+        # (row, ValueError) for each of them.
+        errors = table_errors(self.table, self.raw)
+        self.errors = {row: str(error) for row, error in errors}
+        if len(self.table):
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(len(self.table) - 1, len(self.HEADERS) - 1),
+                                  [Qt.BackgroundRole, Qt.ToolTipRole])
+        return errors
+
+    def processes(self):
+        # A copy to run on, since scheduling sorts and updates the table it's given
+        return self.table.copy()
+
+class ResultsModel(QAbstractTableModel):
+    # Read-only per-process results. Rows are fetched from a source as the view
+    # shows them: a ProcessTable after a run, or a mapped ScheduleFile.
+    HEADERS = ("PID", "Finish", "TAT", "WT", "NTAT")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.count = 0
+        self.row = None
+
+    def set_rows(self, count, row):
+        # row(index) returns a finished process with its metrics
+        self.beginResetModel()
+        self.count = count
+        self.row = row
+        self.endResetModel()
+
+    def replace_rows(self, start, stop, old_stop, row):
+        # Rows start to old_stop are replaced by rows start to stop of a new source;
+        # the views are told about those rows only
+        self.row = row
+        if stop > old_stop:
+            self.beginInsertRows(QModelIndex(), old_stop, stop - 1)
+            self.count += stop - old_stop
+            self.endInsertRows()
+        elif stop < old_stop:
+            self.beginRemoveRows(QModelIndex(), stop, old_stop - 1)
+            self.count -= old_stop - stop
+            self.endRemoveRows()
+        if min(stop, old_stop) > start:
+            self.dataChanged.emit(self.index(start, 0),
+                                  self.index(min(stop, old_stop) - 1, len(self.HEADERS) - 1))
+
+    def clear(self):
+        self.set_rows(0, None)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        p = self.row(index.row())
+        column = index.column()
+        if column == 0:
+            return p.pid
+        if column == 4:
+            return f"{p.ntat:.2f}"
+        return str((p.finish, p.tat, p.waiting)[column - 1])
@@ -0,0 +1,125 @@
+import json
+from array import array
+
+class SchedulerTrace:
+    # Instrumentation for the scheduling loops. Pass one as trace= to a scheduler and
+    # it is told about every arrival, every selection of the next process (with the
+    # nanoseconds spent choosing it) and every end of a run slice. Without a trace
+    # the schedulers only pay an `if trace:` test per event.
+    #
+    # From those hooks it counts dispatches, preemptions, context switches and
+    # completions, and keeps the ready-queue length over time as +1/-1 changes. A
+    # process picked again right after its own slice ended (SRT and preemptive
+    # priority re-check at every arrival) continues the same slice.
+    def __init__(self):
+        self.slices = []  # (start, end, pid, selection ns)
+        self.preempted = []  # (time, pid)
+        self.queue_times = array("q")
+        self.queue_changes = array("b")
+        self.dispatches = 0
+        self.preemptions = 0
+        self.context_switches = 0
+        self.completions = 0
+        self.selections = 0
+        self.selection_ns = 0
+        self.max_selection_ns = 0
+        self.running = None  # (start, pid, selection ns) of the open slice
+        self.last = None  # (end, pid, finished) of the last closed slice
+
+    def arrive(self, p):
+        self.queue_times.append(p.arrival)
+        self.queue_changes.append(1)
+
+    def select(self, time, p, selection_ns):
+        self.selections += 1
+        self.selection_ns += selection_ns
+        self.max_selection_ns = max(self.max_selection_ns, selection_ns)
+        self.queue_times.append(time)
+        self.queue_changes.append(-1)
+
+        last = self.last
+        if last is not None and last[0] == time:
+            if last[1] == p.pid and not last[2]:
+                start, _, pid, ns = self.slices.pop()
+                self.running = (start, pid, ns + selection_ns)
+                return
+            self.context_switches += 1
+            if not last[2]:
+                self.preemptions += 1
+                self.preempted.append((time, last[1]))
+        self.dispatches += 1
+        self.running = (time, p.pid, selection_ns)
+
+    def release(self, time, p, finished):
+        start, pid, selection_ns = self.running
+        self.slices.append((start, time, pid, selection_ns))
+        self.running = None
+        self.last = (time, pid, finished)
+        if finished:
+            self.completions += 1
+        else:
+            self.queue_times.append(time)
+            self.queue_changes.append(1)
+
+    def queue_lengths(self):
+        # (time, ready-queue length) after all changes at each time, in time order
+        order = sorted(range(len(self.queue_times)), key=self.queue_times.__getitem__)
+        samples = []
+        length = 0
+        for i in order:
+            length += self.queue_changes[i]
+            time = self.queue_times[i]
+            if samples and samples[-1][0] == time:
+                samples[-1] = (time, length)
+            else:
+                samples.append((time, length))
+        return samples
+
+    def summary(self):
+        samples = self.queue_lengths()
+        weighted = sum(length * (after[0] - time) for (time, length), after in zip(samples, samples[1:]))
+        span = samples[-1][0] - samples[0][0] if samples else 0
+        return {
+            "dispatches": self.dispatches,
+            "preemptions": self.preemptions,
+            "context_switches": self.context_switches,
+            "completions": self.completions,
+            "selections": self.selections,
+            "selection_ns": {
+                "total": self.selection_ns,
+                "mean": self.selection_ns / self.selections if self.selections else 0,
+                "max": self.max_selection_ns,
+            },
+            "ready_queue": {
+                "max": max((length for _, length in samples), default=0),
+                "mean": weighted / span if span else 0,
+            },
+        }
+
+    def chrome_events(self, name="schedulizer", time_unit_us=1000):
+        # Chrome trace-event records, viewable in Perfetto or chrome://tracing. Each
+        # unit of simulated time is time_unit_us microseconds on the timeline.
+        yield {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": name}}
+        yield {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "CPU"}}
+        for start, end, pid, selection_ns in self.slices:
+            yield {"name": pid, "cat": "run", "ph": "X", "pid": 1, "tid": 1,
+                   "ts": start * time_unit_us, "dur": (end - start) * time_unit_us,
+                   "args": {"selection_ns": selection_ns}}
+        for time, pid in self.preempted:
+            yield {"name": f"preempt {pid}", "cat": "preemption", "ph": "i", "s": "t",
+                   "pid": 1, "tid": 1, "ts": time * time_unit_us}
+        for time, length in self.queue_lengths():
+            yield {"name": "ready queue", "ph": "C", "pid": 1, "ts": time * time_unit_us,
+                   "args": {"length": length}}
+
+    def write_chrome(self, path, name="schedulizer", time_unit_us=1000):
+        # Written one event per line so large traces never sit in memory as one string
+        with open(path, "w") as f:
+            f.write('{"displayTimeUnit": "ms", "otherData": ')
+            json.dump(self.summary(), f)
+            f.write(', "traceEvents": [\n')
+            for i, event in enumerate(self.chrome_events(name, time_unit_us)):
+                if i:
+                    f.write(",\n")
+                json.dump(event, f)
+            f.write("\n]}\n")
@@ -0,0 +1,183 @@
+import multiprocessing
+import os
+import queue
+from functools import partial
+from time import perf_counter
+
+from .cache import ResultCache
+from .compare import as_sorted_table, init_worker, run_on_worker
+from .gantt import SegmentStream
+from .smp import run_smp
+from .table import np
+
+BATCH_SEGMENTS = 4096  # Segments per message at most
+BATCH_SECONDS = 0.1  # and at least one message this often while segments come in
+
+def makespan_estimate(processes, cpus=1):
+    # Every scheduler here keeps a CPU busy while work is waiting, so on one CPU the
+    # makespan is the latest arrival plus all the work that arrives from then on,
+    # taken over every arrival. Dividing the work among cpus gives a rough figure for
+    # several CPUs. processes must be in arrival order.
+    if not len(processes):
+        return 0
+    arrival, service = processes.arrival, processes.service
+    if np is not None:
+        arrival = np.frombuffer(arrival, dtype=np.int64)
+        work = np.cumsum(np.frombuffer(service, dtype=np.int64)[::-1])[::-1]
+        return int(np.max(arrival + -(-work // cpus)))
+    end = work = 0
+    for a, s in zip(reversed(arrival), reversed(service)):
+        work += s
+        end = max(end, a - (-work // cpus))
+    return end
+
+class Cancelled(Exception):
+    pass
+
+class Reporter:
+    # Collects finished segments in the worker and sends them on in batches, along
+    # with the simulated time reached. The cancel flag is checked at every batch.
+    def __init__(self, messages, cancel):
+        self.messages = messages
+        self.cancel = cancel
+        self.batch = {}  # Lane -> segments
+        self.count = 0
+        self.time = 0
+        self.sent_at = perf_counter()
+
+    def add(self, lane, segment):
+        self.batch.setdefault(lane, []).append(segment)
+        self.count += 1
+        if segment[1] > self.time:
+            self.time = segment[1]
+        if self.count >= BATCH_SEGMENTS or (self.count % 64 == 0 and
+                                            perf_counter() - self.sent_at >= BATCH_SECONDS):
+            self.flush()
+
+    def flush(self):
+        if self.cancel.is_set():
+            raise Cancelled
+        if self.batch:
+            self.messages.put(("segments", self.batch, self.time))
+        self.batch = {}
+        self.count = 0
+        self.sent_at = perf_counter()
+
+class ReportingGantt(list):
+    # Gantt list that also reports each segment once it is final, so a single-CPU
+    # run can stream its chart and still be cached whole. add_segment may extend the
+    # last segment, so a segment is final when the next one is appended.
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def append(self, segment):
+        if self:
+            self.callback(self[-1])
+        super().append(segment)
+
+    def close(self):
+        if self:
+            self.callback(self[-1])
+
+def simulate(job, messages, cancel):
+    # Worker process entry point. job holds the arrival-ordered ProcessTable and the
+    # run settings. Ends with one of ("done", finish times), ("cancelled",) or
+    # ("error", message).
+    try:
+        reporter = Reporter(messages, cancel)
+        processes = job["processes"]
+        if job["cpus"] > 1:
+            streams = [SegmentStream(partial(reporter.add, lane)) for lane in range(job["cpus"])]
+            run_smp(job["algorithm"], processes, job["cpus"], job["quantum"], job["run_queues"],
+                    gantts=streams, **job["options"])
+        else:
+            streams = [ReportingGantt(partial(reporter.add, 0))]
+            gantt = ResultCache(job["cache_dir"]).run(job["algorithm"], processes, job["quantum"],
+                                                      streams[0], **job["options"])
+            if gantt is not streams[0]:
+                # Cache hit: the whole chart is known already
+                for segment in gantt:
+                    reporter.add(0, segment)
+        for stream in streams:
+            stream.close()
+        reporter.flush()
+        messages.put(("done", processes.finish))
+    except Cancelled:
+        messages.put(("cancelled",))
+    except Exception as e:
+        messages.put(("error", f"{type(e).__name__}: {e}"))
+
+class SimulationRun:
+    # A simulation in a separate process, so pure-Python scheduling loops don't hold
+    # the GUI thread or its GIL. The process is spawned rather than forked, which is
+    # safe in a process that already runs Qt. poll() returns the messages that have
+    # arrived without blocking.
+    def __init__(self, processes, algorithm, quantum=4, cpus=1, run_queues="global",
+                 cache_dir=None, **options):
+        context = multiprocessing.get_context("spawn")
+        self.messages = context.Queue()
+        self.cancel_event = context.Event()
+        job = {"processes": processes, "algorithm": algorithm, "quantum": quantum, "cpus": cpus,
+               "run_queues": run_queues, "cache_dir": cache_dir, "options": options}
+        self.process = context.Process(target=simulate, args=(job, self.messages, self.cancel_event),
+                                       daemon=True)
+        self.process.start()
+        self.finished = False
+
+    def poll(self):
+        messages = self.drain()
+        if not self.finished and not self.process.is_alive():
+            # Anything it sent before exiting is in the queue by now
+            messages += self.drain()
+            if not self.finished:
+                self.finished = True
+                messages.append(("error", f"Simulation process exited with code {self.process.exitcode}"))
+        return messages
+
+    def drain(self):
+        messages = []
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                return messages
+            messages.append(message)
+            if message[0] != "segments":
+                self.finished = True
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def stop(self):
+        # Ends the process at once, whatever it is doing
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+class TaskRun:
+    # compare.py tasks, (algorithm, quantum) pairs, in a pool of spawned processes, for
+    # Compare All and Quantum Sweep. poll() returns None until every summary is in,
+    # then the summaries in task order; a task that failed raises its exception there.
+    def __init__(self, processes, tasks, workers=None):
+        if workers is None:
+            workers = min(len(tasks), os.cpu_count() or 1)
+        context = multiprocessing.get_context("spawn")
+        self.pool = context.Pool(max(1, workers), initializer=init_worker,
+                                 initargs=(as_sorted_table(processes),))
+        self.results = [self.pool.apply_async(run_on_worker, task) for task in tasks]
+        self.pool.close()
+
+    def ready(self):
+        # Number of tasks finished
+        return sum(result.ready() for result in self.results)
+
+    def poll(self):
+        if self.ready() < len(self.results):
+            return None
+        return [result.get() for result in self.results]
+
+    def stop(self):
+        # Ends the pool at once, whatever it is doing
+        self.pool.terminate()
+        self.pool.join()
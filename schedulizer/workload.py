@@ -0,0 +1,143 @@
+import csv
+import json
+
+from .process import Process
+from .table import ProcessTable, np
+
+FIELDS = ("pid", "arrival", "service", "priority")
+
+class WorkloadError(ValueError):
+    # Raised with every bad row of a workload, not just the first one
+    def __init__(self, errors):
+        super().__init__("\n".join(str(e) for e in errors))
+        self.errors = errors
+
+# Error for a bad value in each field, in the order the fields are checked
+FIELD_ERRORS = (
+    "Missing PID in row {row}",
+    "Invalid arrival time in row {row}. Must be non-negative integer.",
+    "Invalid service time in row {row}. Must be positive integer.",
+    "Invalid priority in row {row}. Must be integer.",
+)
+
+# Largest value a ProcessTable column (a signed 64-bit array) can hold
+MAX_VALUE = 2**63 - 1
+
+def is_number(text):
+    # Whether text is a whole number that fits a ProcessTable column
+    text = str(text)
+    return text.isdigit() and int(text) <= MAX_VALUE
+
+def parse_process(pid, arrival, service, priority, row):
+    # Same rules the GUI applies to each row of the process table
+    if not pid:
+        raise ValueError(FIELD_ERRORS[0].format(row=row))
+
+    if not is_number(arrival):
+        raise ValueError(FIELD_ERRORS[1].format(row=row))
+
+    if not is_number(service) or int(service) <= 0:
+        raise ValueError(FIELD_ERRORS[2].format(row=row))
+
+    if not is_number(priority):
+        raise ValueError(FIELD_ERRORS[3].format(row=row))
+
+    return Process(str(pid), int(arrival), int(service), int(priority))
+
+def table_errors(table, invalid=()):
+    # parse_process's checks over a whole ProcessTable at once, a column at a time.
+    # invalid holds (row index, field) pairs of cells whose text isn't a number at
+    # all. Returns (row index, ValueError) for every bad row, in row order, for the
+    # first field that fails, with the message parse_process would give.
+    count = len(table)
+    if np is not None:
+        offsets = np.frombuffer(table.pid_offsets, dtype=np.int64)
+        index = np.frombuffer(table.pid_index, dtype=np.int64)
+        checks = (
+            offsets[index + 1] == offsets[index],
+            np.frombuffer(table.arrival, dtype=np.int64) < 0,
+            np.frombuffer(table.service, dtype=np.int64) <= 0,
+            np.frombuffer(table.priority, dtype=np.int64) < 0,
+        )
+        first = np.full(count, len(FIELD_ERRORS))
+        for field in reversed(range(len(checks))):
+            first[checks[field]] = field
+        for row, field in invalid:
+            first[row] = min(first[row], field)
+        bad = np.flatnonzero(first < len(FIELD_ERRORS))
+        return [(row, ValueError(FIELD_ERRORS[field].format(row=row + 1)))
+                for row, field in zip(bad.tolist(), first[bad].tolist())]
+
+    first = {}
+    for row, field in invalid:
+        first[row] = min(first.get(row, field), field)
+    offsets = table.pid_offsets
+    for row, (name, arrival, service, priority) in enumerate(
+            zip(table.pid_index, table.arrival, table.service, table.priority)):
+        checks = (offsets[name + 1] == offsets[name], arrival < 0, service <= 0, priority < 0)
+        if any(checks):
+            field = checks.index(True)
+            first[row] = min(first.get(row, field), field)
+    return [(row, ValueError(FIELD_ERRORS[first[row]].format(row=row + 1))) for row in sorted(first)]
+
+def iter_rows(path):
+    # Yields (row, values) for each record of a CSV or JSONL trace. CSV files need a
+    # pid,arrival,service,priority header; JSONL lines are objects with those keys.
+    # A missing priority defaults to 0. Lines that can't be read yield a ValueError.
+    with open(path, newline="") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for row, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield row, ValueError(f"Invalid JSON in row {row}")
+                    continue
+                if not isinstance(record, dict):
+                    yield row, ValueError(f"Expected a JSON object in row {row}")
+                    continue
+                yield row, [record.get(field, "") for field in FIELDS]
+        else:
+            for row, record in enumerate(csv.DictReader(f), start=1):
+                yield row, [(record.get(field) or "").strip() for field in FIELDS]
+
+def iter_workload(path, on_error=None, check_order=False):
+    # Lazily parses a trace file. Bad rows are passed to on_error and skipped, so one
+    # pass reports all of them; without on_error the first bad row raises. With
+    # check_order, rows arriving before the previous row are rejected too, which
+    # streaming runs need since they never sort the trace.
+    last_arrival = 0
+    for row, values in iter_rows(path):
+        try:
+            if isinstance(values, ValueError):
+                raise values
+            if values[3] in ("", None):
+                values[3] = 0
+            p = parse_process(*values, row)
+            if check_order and p.arrival < last_arrival:
+                raise ValueError(f"Arrival time in row {row} is earlier than the previous row. "
+                                 "Trace must be sorted by arrival time.")
+        except ValueError as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            continue
+        last_arrival = p.arrival
+        yield p
+
+def read_workload(path):
+    # Loads a whole workload, raising WorkloadError with every bad row
+    errors = []
+    processes = list(iter_workload(path, errors.append))
+    if errors:
+        raise WorkloadError(errors)
+    return processes
+
+def read_table(path):
+    # Like read_workload, but loads the rows straight into a ProcessTable
+    errors = []
+    table = ProcessTable(iter_workload(path, errors.append))
+    if errors:
+        raise WorkloadError(errors)
+    return table
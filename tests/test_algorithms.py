@@ -0,0 +1,238 @@
+import random
+
+import pytest
+
+from schedulizer.algorithms import ALGORITHMS, TIME_SLICED, run_algorithm
+from schedulizer.process import Process
+from schedulizer.queues import VRUNTIME_SCALE, fair_weight
+from schedulizer.table import ProcessTable
+
+# Per-tick references: the CPU is given to someone (or left idle) one time unit at a
+# time, as the original GUI schedulers did. The first seven are those schedulers;
+# cfs and mlfq follow the policies described in queues.py the same way. Each takes
+# arrival-ordered processes and returns the pid run in each tick.
+
+def tick_fcfs(processes, quantum):
+    ticks = []
+    for p in processes:
+        while len(ticks) < p.arrival:
+            ticks.append(None)
+        ticks += [p.pid] * p.service
+        p.finish = len(ticks)
+    return ticks
+
+def tick_rr(processes, quantum):
+    ticks = []
+    waiting = list(processes)
+    ready = []
+    while waiting or ready:
+        while waiting and waiting[0].arrival <= len(ticks):
+            ready.append(waiting.pop(0))
+        if not ready:
+            ticks.append(None)
+            continue
+        current = ready.pop(0)
+        for _ in range(min(quantum, current.remaining)):
+            ticks.append(current.pid)
+            current.remaining -= 1
+        while waiting and waiting[0].arrival <= len(ticks):
+            ready.append(waiting.pop(0))
+        if current.remaining:
+            ready.append(current)
+        else:
+            current.finish = len(ticks)
+    return ticks
+
+def tick_run_to_completion(key):
+    def run(processes, quantum):
+        ticks = []
+        waiting = list(processes)
+        while waiting:
+            ready = [p for p in waiting if p.arrival <= len(ticks)]
+            if not ready:
+                ticks.append(None)
+                continue
+            current = min(ready, key=lambda p: key(p, len(ticks)))
+            ticks += [current.pid] * current.service
+            current.finish = len(ticks)
+            waiting.remove(current)
+        return ticks
+    return run
+
+def tick_preemptive(key):
+    def run(processes, quantum):
+        ticks = []
+        while any(p.remaining for p in processes):
+            ready = [p for p in processes if p.arrival <= len(ticks) and p.remaining]
+            if not ready:
+                ticks.append(None)
+                continue
+            current = min(ready, key=key)
+            ticks.append(current.pid)
+            current.remaining -= 1
+            if not current.remaining:
+                current.finish = len(ticks)
+        return ticks
+    return run
+
+def tick_cfs(processes, quantum, latency=None):
+    latency = 8 * quantum if latency is None else latency
+    ticks = []
+    waiting = list(processes)
+    order = {id(p): i for i, p in enumerate(processes)}
+    vruntime, weight = {}, {}
+    ready = []
+    min_vruntime = 0
+
+    def admit():
+        while waiting and waiting[0].arrival <= len(ticks):
+            p = waiting.pop(0)
+            vruntime[id(p)] = min_vruntime
+            weight[id(p)] = fair_weight(p.priority)
+            ready.append(p)
+
+    while waiting or ready:
+        admit()
+        if not ready:
+            ticks.append(None)
+            continue
+        current = min(ready, key=lambda p: (vruntime[id(p)], order[id(p)]))
+        ready.remove(current)
+        min_vruntime = max(min_vruntime, vruntime[id(current)])
+        period = max(latency, len(weight) * quantum)
+        share = -(-period * weight[id(current)] // sum(weight.values()))
+        ran = 0
+        while current.remaining and ran < max(quantum, share):
+            ticks.append(current.pid)
+            current.remaining -= 1
+            ran += 1
+        if current.remaining:
+            admit()
+            vruntime[id(current)] += ran * VRUNTIME_SCALE // weight[id(current)]
+            ready.append(current)
+        else:
+            current.finish = len(ticks)
+            del weight[id(current)]
+    return ticks
+
+def tick_mlfq(processes, quantum, levels=3, boost=None):
+    quanta = [quantum << level for level in range(levels)]
+    boost = 10 * quanta[-1] if boost is None else boost
+    ticks = []
+    waiting = list(processes)
+    order = {id(p): i for i, p in enumerate(processes)}
+    # A waiting process's place is (boosts before it was queued, level, sequence); a
+    # boost sends every process queued before it to level 0, ahead of later ones
+    place, used, queued = {}, {}, {}
+    ready = []
+    state = {"epoch": 0, "sequence": 0}
+
+    def epoch():
+        # Boosts happen at every multiple of the boost period
+        return len(ticks) // boost if boost else 0
+
+    def queue(p, level, keep_place=False):
+        if not keep_place:
+            place[id(p)] = (epoch(), level, state["sequence"])
+            state["sequence"] += 1
+        queued[id(p)] = epoch()
+        ready.append(p)
+
+    def admit():
+        while waiting and waiting[0].arrival <= len(ticks):
+            p = waiting.pop(0)
+            used[id(p)] = 0
+            queue(p, 0)
+
+    while waiting or ready:
+        admit()
+        if not ready:
+            ticks.append(None)
+            continue
+        current = min(ready, key=lambda p: (place[id(p)], order[id(p)]))
+        ready.remove(current)
+        if queued[id(current)] < epoch():
+            place[id(current)] = (place[id(current)][0], 0, place[id(current)][2])
+            used[id(current)] = 0
+        level = place[id(current)][1]
+        # Runs out its quantum unless it finishes or a new arrival preempts it
+        while current.remaining and used[id(current)] < quanta[level]:
+            ticks.append(current.pid)
+            current.remaining -= 1
+            used[id(current)] += 1
+            if waiting and waiting[0].arrival <= len(ticks):
+                break
+        if not current.remaining:
+            current.finish = len(ticks)
+            continue
+        admit()
+        if used[id(current)] >= quanta[level]:
+            used[id(current)] = 0
+            queue(current, min(level + 1, levels - 1))
+        else:
+            queue(current, level, keep_place=True)
+    return ticks
+
+REFERENCES = {
+    "fcfs": tick_fcfs,
+    "rr": tick_rr,
+    "spn": tick_run_to_completion(lambda p, time: p.service),
+    "srt": tick_preemptive(lambda p: p.remaining),
+    "hrrn": tick_run_to_completion(lambda p, time: -(time - p.arrival + p.service) / p.service),
+    "priority-np": tick_run_to_completion(lambda p, time: p.priority),
+    "priority-p": tick_preemptive(lambda p: p.priority),
+    "cfs": tick_cfs,
+    "mlfq": tick_mlfq,
+}
+
+def random_processes(rng):
+    # Few enough processes, and arrivals close enough, for ties and busy queues
+    count = rng.randint(1, 12)
+    processes = [Process(f"P{i + 1}", rng.randint(0, 25), rng.randint(1, 9), rng.randint(-3, 5))
+                 for i in range(count)]
+    processes.sort(key=lambda p: p.arrival)
+    return processes
+
+def run_length(ticks):
+    segments = []
+    for time, pid in enumerate(ticks):
+        if segments and segments[-1][2] == pid:
+            segments[-1] = (segments[-1][0], time + 1, pid)
+        else:
+            segments.append((time, time + 1, pid))
+    return segments
+
+def random_options(name, rng):
+    if name == "cfs":
+        return {"latency": rng.choice([None, 1, 6, 20])}
+    if name == "mlfq":
+        return {"levels": rng.randint(1, 3), "boost": rng.choice([None, 0, 5, 13])}
+    return {}
+
+def test_references_cover_every_algorithm():
+    assert set(REFERENCES) == set(ALGORITHMS)
+
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_matches_per_tick_reference(name):
+    rng = random.Random(name)
+    for _ in range(300):
+        processes = random_processes(rng)
+        quantum = rng.randint(1, 5) if name in TIME_SLICED else 4
+        options = random_options(name, rng)
+        expected = [Process(p.pid, p.arrival, p.service, p.priority) for p in processes]
+        ticks = REFERENCES[name](expected, quantum, **options)
+
+        gantt = run_algorithm(name, processes, quantum, **options)
+        assert gantt == run_length(ticks), (quantum, options, [(p.pid, p.arrival, p.service, p.priority)
+                                                               for p in processes])
+        assert [p.finish for p in processes] == [p.finish for p in expected]
+        assert all(p.completed for p in processes)
+
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_table_matches_process_list(name):
+    rng = random.Random(f"table-{name}")
+    for _ in range(20):
+        processes = random_processes(rng)
+        table = ProcessTable(processes)
+        assert run_algorithm(name, table, 3) == run_algorithm(name, processes, 3)
+        assert list(table.finish) == [p.finish for p in processes]
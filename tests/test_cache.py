@@ -0,0 +1,110 @@
+import os
+import pickle
+
+import pytest
+
+from schedulizer import cache
+from schedulizer.algorithms import run_algorithm
+from schedulizer.cache import ResultCache, workload_fingerprint
+from schedulizer.generate import generate_table
+from schedulizer.process import Process
+
+def workload():
+    return [Process("A", 0, 5, 1), Process("B", 1, 3, 0), Process("C", 4, 2, 2)]
+
+def test_key_covers_workload_algorithm_version_and_parameters(tmp_path, monkeypatch):
+    results = ResultCache(tmp_path)
+    base = results.key(workload(), "rr", {"quantum": 2})
+    assert base == results.key(workload(), "rr", {"quantum": 2})
+
+    changed = []
+    for field in ("pid", "arrival", "service", "priority"):
+        processes = workload()
+        setattr(processes[1], field, "X" if field == "pid" else getattr(processes[1], field) + 1)
+        changed.append(results.key(processes, "rr", {"quantum": 2}))
+    changed.append(results.key(workload()[::-1], "rr", {"quantum": 2}))
+    changed.append(results.key(workload(), "fcfs", {"quantum": 2}))
+    changed.append(results.key(workload(), "rr", {"quantum": 3}))
+    monkeypatch.setitem(cache.ALGORITHM_VERSIONS, "rr", cache.ALGORITHM_VERSIONS["rr"] + 1)
+    changed.append(results.key(workload(), "rr", {"quantum": 2}))
+    assert len(set(changed)) == len(changed) and base not in changed
+
+def test_table_and_list_fingerprints():
+    table = generate_table(200, seed=4)
+    again = generate_table(200, seed=4)
+    assert workload_fingerprint(table) == workload_fingerprint(again)
+    again.service[100] += 1
+    assert workload_fingerprint(table) != workload_fingerprint(again)
+    processes = list(table.processes())
+    assert workload_fingerprint(processes) == workload_fingerprint(list(generate_table(200, seed=4).processes()))
+
+def test_hit_returns_the_stored_run_without_scheduling(tmp_path, monkeypatch):
+    results = ResultCache(tmp_path)
+    expected = workload()
+    gantt = run_algorithm("rr", expected, 2)
+
+    processes = workload()
+    assert results.run("rr", processes, 2) == gantt
+    assert [p.finish for p in processes] == [p.finish for p in expected]
+
+    def no_run(*args, **kwargs):
+        raise AssertionError("a cached run was scheduled again")
+
+    monkeypatch.setattr(cache, "run_stream", no_run)
+    processes = workload()
+    assert results.run("rr", processes, 2) == gantt
+    assert [p.finish for p in processes] == [p.finish for p in expected]
+    assert all(p.completed for p in processes)
+    with pytest.raises(AssertionError):
+        results.run("rr", workload(), 3)
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    results = ResultCache(tmp_path)
+    keys = [f"{n:064x}" for n in range(4)]
+    for age, key in enumerate(keys):
+        results.put(key, [(0, 1, "A")] * 50, [1])
+        # Oldest first, a minute apart
+        os.utime(results.path(key), (1000 + 60 * age, 1000 + 60 * age))
+    size = os.path.getsize(results.path(keys[0]))
+
+    # A hit makes the oldest entry the most recently used one
+    assert results.get(keys[0]) is not None
+    results.max_bytes = 3 * size
+    results.put(f"{4:064x}", [(0, 1, "A")] * 50, [1])
+    assert not os.path.exists(results.path(keys[1]))
+    assert not os.path.exists(results.path(keys[2]))
+    assert all(os.path.exists(results.path(key)) for key in (keys[0], keys[3], f"{4:064x}"))
+
+    # The newest entry stays even when it alone is over the limit
+    results.max_bytes = 1
+    results.put(f"{5:064x}", [(0, 1, "A")] * 50, [1])
+    assert os.listdir(tmp_path) == [f"{5:064x}.pkl"]
+
+    results.clear()
+    assert os.listdir(tmp_path) == []
+
+class Refuses:
+    # Unpickling it raises, as loading an entry written by other code may
+    def __reduce__(self):
+        return int, ("not a number",)
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"garbage",
+    pickle.dumps({"format": cache.CACHE_FORMAT, "key": "k", "gantt": [], "finish": []})[:-5],
+    pickle.dumps([1, 2, 3]),
+    pickle.dumps({"format": cache.CACHE_FORMAT + 1, "key": "k", "gantt": [], "finish": []}),
+    pickle.dumps({"format": cache.CACHE_FORMAT, "key": "other", "gantt": [], "finish": []}),
+    pickle.dumps(Refuses()),
+    b"cno_such_module_here\nthing\n.",
+])
+def test_unreadable_entry_is_dropped(tmp_path, data):
+    results = ResultCache(tmp_path)
+    path = results.path("k")
+    with open(path, "wb") as f:
+        f.write(data)
+    assert results.get("k") is None
+    assert not os.path.exists(path)
+
+def test_missing_entry(tmp_path):
+    assert ResultCache(tmp_path / "none yet").get("k") is None
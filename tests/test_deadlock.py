@@ -0,0 +1,19 @@
+from schedulizer.deadlock import WaitForGraph
+
+def test_cycle_through_held_back_edge():
+    graph = WaitForGraph()
+    assert graph.add_wait("A", "B") is None
+    assert graph.add_wait("B", "A") == ["B", "A"]
+    assert graph.add_wait("A", "C") is None
+    # C -> B -> A -> C goes through the edge held back for the first cycle
+    assert graph.add_wait("C", "B") == ["C", "B", "A"]
+    assert graph.deadlocked() == {"A", "B", "C"}
+
+    # Without B -> A nothing is left of either cycle
+    graph.remove_wait("B", "A")
+    assert not graph
+    assert graph.deadlocked() == set()
+    assert graph.add_wait("B", "A") is not None
+    graph.remove_process("A")
+    assert not graph
+    assert graph.deadlocked() == set()
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from schedulizer.algorithms import ALGORITHMS, run_algorithm
+from schedulizer.engine import OnlineScheduler
+from schedulizer.process import Process
+
+OPTIONS = {"cfs": {"latency": 6}, "mlfq": {"levels": 2, "boost": 9}}
+
+def random_processes(rng):
+    processes = [Process(f"P{i + 1}", rng.randint(0, 30), rng.randint(1, 9), rng.randint(-2, 4))
+                 for i in range(rng.randint(1, 15))]
+    processes.sort(key=lambda p: p.arrival)
+    return processes
+
+def copies(processes):
+    return [Process(p.pid, p.arrival, p.service, p.priority) for p in processes]
+
+def batch_run(name, processes, options):
+    processes = copies(processes)
+    gantt = run_algorithm(name, processes, 3, **options)
+    return gantt, [p.finish for p in processes]
+
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_submitting_everything_up_front_matches_batch(name):
+    rng = random.Random(name)
+    options = OPTIONS.get(name, {})
+    for _ in range(100):
+        processes = random_processes(rng)
+        engine = OnlineScheduler(name, 3, **options)
+        submitted = copies(processes)
+        engine.extend(submitted)
+        gantt = engine.run()
+        assert not engine
+        assert (gantt, [p.finish for p in submitted]) == batch_run(name, processes, options)
+        assert engine.metrics.totals.count == len(processes)
+
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_submitting_arrivals_as_they_come_matches_batch(name):
+    rng = random.Random(f"online-{name}")
+    options = OPTIONS.get(name, {})
+    for _ in range(100):
+        processes = random_processes(rng)
+        engine = OnlineScheduler(name, 3, **options)
+        submitted = copies(processes)
+        for p in submitted:
+            # Everything before the arrival is decided before the process is known
+            engine.advance(p.arrival)
+            assert engine.time == p.arrival
+            engine.submit(p)
+        gantt = engine.run()
+        assert (gantt, [p.finish for p in submitted]) == batch_run(name, processes, options)
+
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_stepping_between_submissions_matches_batch(name):
+    rng = random.Random(f"step-{name}")
+    options = OPTIONS.get(name, {})
+    for _ in range(100):
+        processes = random_processes(rng)
+        engine = OnlineScheduler(name, 3, **options)
+        submitted = copies(processes)
+        for p in submitted:
+            while engine.next_event() is not None and engine.next_event() < p.arrival:
+                engine.step()
+            engine.submit(p)
+        while engine:
+            engine.step()
+        assert (engine.gantt, [p.finish for p in submitted]) == batch_run(name, processes, options)
+
+def test_arrival_in_the_decided_past_is_rejected():
+    engine = OnlineScheduler("rr", 2)
+    engine.submit(Process("P1", 0, 5))
+    engine.advance(4)
+    with pytest.raises(ValueError):
+        engine.submit(Process("P2", 3, 1))
+    engine.submit(Process("P3", 4, 1))
+    engine.step()
+    with pytest.raises(ValueError):
+        engine.submit(Process("P4", 4, 1))
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from schedulizer.algorithms import ALGORITHMS, run_algorithm
+from schedulizer.generate import generate_table
+from schedulizer.incremental import IncrementalSchedule
+from schedulizer.table import ProcessTable
+
+OPTIONS = {"cfs": {"latency": 6}, "mlfq": {"levels": 2, "boost": 40}}
+
+def edited(table, rng):
+    # A copy of table with one random change, insertion or deletion, as the GUI makes
+    table = table.copy()
+    i = rng.randrange(len(table))
+    kind = rng.choice(["arrival", "service", "priority", "pid", "insert", "delete", "move"])
+    if kind == "arrival":
+        table.arrival[i] = max(0, table.arrival[i] + rng.randint(-30, 30))
+    elif kind == "service":
+        table.service[i] = max(1, table.service[i] + rng.randint(-5, 20))
+    elif kind == "priority":
+        table.priority[i] = rng.randrange(4)
+    elif kind == "pid":
+        table.set_pid(i, f"X{rng.randrange(1000)}")
+    elif kind == "insert":
+        table.extend([f"N{rng.randrange(1000)}"], [rng.randrange(table.arrival[-1] + 10)],
+                      [rng.randint(1, 15)], [rng.randrange(4)])
+    elif kind == "delete" and len(table) > 1:
+        table = table.copy([(0, i), (i + 1, len(table))])
+    else:
+        # Far past the end, so a new busy period of its own
+        table.arrival[i] = table.arrival[-1] + 1000
+    return table
+
+def rows(table):
+    return [(p.pid, p.arrival, p.service, p.priority, p.finish) for p in table]
+
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_edits_match_a_full_rerun(name):
+    rng = random.Random(name)
+    options = OPTIONS.get(name, {})
+    schedule = IncrementalSchedule(name, 4, **options)
+    table = generate_table(400, seed=5, load=0.8, priorities=([0, 1, 2, 3], [1, 1, 1, 1]))
+    scheduled = total = 0
+    for _ in range(30):
+        before = rows(schedule.table)
+        run_on = table.copy()
+        scheduled += sum(stop - start for start, stop in schedule.begin(run_on))
+        total += len(run_on)
+        start, stop, old_stop = schedule.resume()
+
+        full = table.copy()
+        gantt = run_algorithm(name, full, 4, **options)
+        assert list(schedule.gantt.window(0, 1 << 62)) == gantt
+        assert schedule.gantt.busy_total == sum(end - begin for begin, end, pid in gantt if pid is not None)
+        assert run_on.finish == full.finish
+        # Only rows start to stop changed, in place of the old rows start to old_stop
+        after = rows(run_on)
+        assert before[:start] == after[:start] and before[old_stop:] == after[stop:]
+        table = edited(table, rng)
+    # Apart from the first run, an edit only schedules the busy periods it reaches
+    assert scheduled < total // 4
+
+def test_unrelated_workload_and_empty_table():
+    schedule = IncrementalSchedule("srt")
+    schedule.run(generate_table(100, seed=1))
+    table = generate_table(50, seed=2)
+    assert schedule.run(table.copy()) == (0, 50, 100)
+    assert list(schedule.gantt.window(0, 1 << 62)) == run_algorithm("srt", table)
+    assert schedule.run(ProcessTable()) == (0, 0, 50)
+    assert len(schedule.gantt) == 0
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        IncrementalSchedule("lottery")
@@ -0,0 +1,99 @@
+import os
+import pickle
+import random
+
+import pytest
+
+from schedulizer.algorithms import run_algorithm
+from schedulizer.generate import generate_table
+from schedulizer.metrics import compute_metrics
+from schedulizer.schedule_file import ScheduleFile, ScheduleWriter, is_schedule_file, write_schedule
+from schedulizer.smp import run_smp
+
+def saved_run(path, cpus=3):
+    table = generate_table(500, seed=2, load=0.7 * cpus, priorities=([0, 1], [1, 1]))
+    if cpus > 1:
+        gantts = run_smp("srt", table, cpus)
+    else:
+        gantts = [run_algorithm("srt", table)]
+    compute_metrics(table)
+    write_schedule(path, table, gantts, algorithm="srt", cpus=cpus)
+    return table, gantts
+
+def overlapping(gantt, start, end):
+    return [segment for segment in gantt if segment[1] > start and segment[0] < end]
+
+def contents(schedule):
+    return ([list(lane.window(0, 1 << 62)) for lane in schedule.lanes],
+            [(p.pid, p.arrival, p.service, p.priority, p.finish) for p in schedule.processes()],
+            schedule.metadata, schedule.metrics().to_dict())
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "run.sched"
+    table, gantts = saved_run(path)
+    assert is_schedule_file(path)
+    with ScheduleFile(path) as schedule:
+        assert schedule.metadata == {"algorithm": "srt", "cpus": 3}
+        assert len(schedule) == len(table)
+        assert [list(lane.window(0, 1 << 62)) for lane in schedule.lanes] == gantts
+        assert schedule.end_time() == max(gantt[-1][1] for gantt in gantts)
+        for saved, p in zip(schedule.processes(), table):
+            assert (saved.pid, saved.arrival, saved.service, saved.priority, saved.finish) == \
+                   (p.pid, p.arrival, p.service, p.priority, p.finish)
+            assert (saved.tat, saved.waiting, saved.ntat) == (p.tat, p.waiting, p.ntat)
+
+        rng = random.Random(1)
+        end = schedule.end_time()
+        for _ in range(200):
+            start = rng.randrange(-5, end + 5)
+            stop = start + rng.randrange(0, 60)
+            for lane, gantt in enumerate(gantts):
+                assert list(schedule.segments(start, stop, lane)) == overlapping(gantt, start, stop)
+            assert schedule.active(start, stop) == [
+                i for i, p in enumerate(table) if p.arrival < stop and p.finish > start]
+
+def test_streamed_writer_merges_runs(tmp_path):
+    path = tmp_path / "stream.sched"
+    with ScheduleWriter(path, note="streamed") as writer:
+        for start, end, pid in [(0, 2, None), (2, 4, "A"), (4, 5, "A"), (5, 9, "B")]:
+            writer.add_segment(start, end, pid)
+        writer.add_segment(0, 7, "B", lane=1)
+    with ScheduleFile(path) as schedule:
+        assert list(schedule.segments(0, 100)) == [(0, 2, None), (2, 5, "A"), (5, 9, "B")]
+        assert list(schedule.segments(0, 100, 1)) == [(0, 7, "B")]
+        assert schedule.utilization() == [7 / 9, 7 / 9]
+        assert len(schedule) == 0 and schedule.active(0, 100) == []
+
+def test_truncated_file_is_rejected_or_intact(tmp_path):
+    path = tmp_path / "run.sched"
+    saved_run(path, cpus=1)
+    with ScheduleFile(path) as schedule:
+        whole = contents(schedule)
+    data = path.read_bytes()
+    cut = tmp_path / "cut.sched"
+    for size in sorted(set(range(0, 200)) | set(range(0, len(data), 97)) | set(range(len(data) - 64, len(data)))):
+        cut.write_bytes(data[:size])
+        try:
+            schedule = ScheduleFile(cut)
+        except ValueError:
+            continue
+        # Only the padding after the last column can go without losing anything
+        with schedule:
+            assert contents(schedule) == whole, size
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"pid,arrival,service,priority\nP1,0,3,1\n",
+    pickle.dumps({"format": 1}),
+    bytes(random.Random(3).randrange(256) for _ in range(4096)),
+    b"SCHEDULE" + bytes(12),
+    b"SCHEDULE\x01\x00\x00\x00\x02\x00\x00\x00{}",
+    b"SCHEDULE\x01\x00\x00\x00\x02\x00\x00\x00[]",
+    b"SCHEDULE\x01\x00\x00\x00\xff\xff\x00\x00{\"format\": 1",
+])
+def test_foreign_file_is_rejected(tmp_path, data):
+    path = tmp_path / "foreign.sched"
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        ScheduleFile(path)
+    assert os.path.exists(path)
@@ -0,0 +1,46 @@
+import pytest
+
+from schedulizer.algorithms import ALGORITHMS, run_algorithm
+from schedulizer.generate import generate_table
+from schedulizer.metrics import StreamingMetrics, compute_metrics
+from schedulizer.shard import busy_period_starts, run_sharded
+
+OPTIONS = {"cfs": {"latency": 6}, "mlfq": {"levels": 2, "boost": 40}}
+
+def traces():
+    # Below a load of 1 the CPU often goes idle; far above it, it never does
+    gaps = generate_table(3000, seed=7, load=0.6, priorities=([0, 1, 2], [1, 1, 1]))
+    busy = generate_table(1500, seed=8, load=4, priorities=([0, 1, 2], [1, 1, 1]))
+    assert len(busy_period_starts(gaps)) > 50
+    assert busy_period_starts(busy) == [0]
+    return {"gaps": gaps, "no-gaps": busy}
+
+TRACES = traces()
+
+def serial_run(name, table, options):
+    # As the CLI's serial path does it: metrics added in row order after the run
+    table = table.copy()
+    gantt = run_algorithm(name, table, 5, **options)
+    compute_metrics(table)
+    metrics = StreamingMetrics()
+    for p in table:
+        metrics.add(p)
+    return gantt, list(table.finish), metrics
+
+@pytest.mark.parametrize("trace", list(TRACES))
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_sharded_run_matches_serial(name, trace):
+    options = OPTIONS.get(name, {})
+    gantt, finish, metrics = serial_run(name, TRACES[trace], options)
+    for workers in (1, 3):
+        table = TRACES[trace].copy()
+        sharded_metrics = StreamingMetrics()
+        assert run_sharded(name, table, 5, workers, sharded_metrics, **options) == gantt
+        assert list(table.finish) == finish
+        assert sharded_metrics.to_dict() == metrics.to_dict()
+
+def test_sharded_run_of_a_process_list():
+    processes = list(TRACES["gaps"].copy().processes())
+    gantt, finish, _ = serial_run("srt", TRACES["gaps"], {})
+    assert run_sharded("srt", processes, 5, 2) == gantt
+    assert [p.finish for p in processes] == finish
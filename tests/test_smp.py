@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from schedulizer.algorithms import ALGORITHMS, run_algorithm
+from schedulizer.process import Process
+from schedulizer.smp import RUN_QUEUES, run_smp
+
+OPTIONS = {"cfs": {"latency": 6}, "mlfq": {"levels": 2, "boost": 9}}
+
+def random_processes(rng, count):
+    processes = [Process(f"P{i + 1}", rng.randint(0, 40), rng.randint(1, 12), rng.randint(-2, 4))
+                 for i in range(count)]
+    processes.sort(key=lambda p: p.arrival)
+    return processes
+
+def copies(processes):
+    return [Process(p.pid, p.arrival, p.service, p.priority) for p in processes]
+
+@pytest.mark.parametrize("run_queues", RUN_QUEUES)
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_one_cpu_matches_single_cpu_schedule(name, run_queues):
+    rng = random.Random(f"{name}-{run_queues}")
+    options = OPTIONS.get(name, {})
+    for _ in range(60):
+        processes = random_processes(rng, rng.randint(1, 15))
+        serial = copies(processes)
+        gantt = run_algorithm(name, serial, 3, **options)
+        assert run_smp(name, processes, 1, 3, run_queues, **options) == [gantt]
+        assert [p.finish for p in processes] == [p.finish for p in serial]
+
+def ticks_by_pid(gantts):
+    # pid -> the (tick, core) pairs it ran in
+    ran = {}
+    for core, gantt in enumerate(gantts):
+        last_end = 0
+        for start, end, pid in gantt:
+            # Each lane is one core's timeline, so its segments follow each other
+            assert start == last_end and start < end
+            last_end = end
+            if pid is not None:
+                ran.setdefault(pid, []).extend((tick, core) for tick in range(start, end))
+    return ran
+
+@pytest.mark.parametrize("run_queues", RUN_QUEUES)
+@pytest.mark.parametrize("name", list(ALGORITHMS))
+def test_several_cpus_run_every_process_once_at_a_time(name, run_queues):
+    rng = random.Random(f"smp-{name}-{run_queues}")
+    options = OPTIONS.get(name, {})
+    for _ in range(40):
+        cpus = rng.randint(2, 4)
+        processes = random_processes(rng, rng.randint(1, 25))
+        gantts = run_smp(name, processes, cpus, 3, run_queues, **options)
+        assert len(gantts) == cpus
+        ran = ticks_by_pid(gantts)
+
+        for p in processes:
+            ticks = sorted(tick for tick, _ in ran[p.pid])
+            # Never on two cores in the same tick, exactly its service time, and
+            # only between its arrival and its finish
+            assert len(set(ticks)) == len(ticks) == p.service
+            assert p.completed and ticks[0] >= p.arrival and ticks[-1] + 1 == p.finish
+
+        if run_queues == "global":
+            # Work-conserving: a core is only idle while nothing is waiting
+            busy = {}
+            for ticks in ran.values():
+                for tick, _ in ticks:
+                    busy[tick] = busy.get(tick, 0) + 1
+            for tick in range(max(p.finish for p in processes)):
+                in_system = sum(p.arrival <= tick < p.finish for p in processes)
+                assert busy.get(tick, 0) == min(cpus, in_system), (tick, cpus)
@@ -0,0 +1,47 @@
+import pytest
+
+from schedulizer.workload import MAX_VALUE, WorkloadError, parse_process, read_table
+
+TOO_BIG = str(MAX_VALUE + 1)
+
+def test_values_up_to_the_column_limit():
+    p = parse_process("A", MAX_VALUE, MAX_VALUE, str(MAX_VALUE), 1)
+    assert (p.arrival, p.service, p.priority) == (MAX_VALUE, MAX_VALUE, MAX_VALUE)
+
+@pytest.mark.parametrize("field, message", [
+    (1, "Invalid arrival time in row 4"),
+    (2, "Invalid service time in row 4"),
+    (3, "Invalid priority in row 4"),
+])
+def test_too_big_value_is_a_row_error(field, message):
+    values = ["A", "0", "1", "0"]
+    values[field] = TOO_BIG
+    with pytest.raises(ValueError, match=message):
+        parse_process(*values, 4)
+
+def test_too_big_values_in_a_file(tmp_path):
+    path = tmp_path / "big.csv"
+    path.write_text("pid,arrival,service,priority\n"
+                    f"A,0,99999999999999999999,0\nB,1,3,0\nC,{TOO_BIG},2,0\n")
+    with pytest.raises(WorkloadError) as error:
+        read_table(str(path))
+    assert [str(e) for e in error.value.errors] == [
+        "Invalid service time in row 1. Must be positive integer.",
+        "Invalid arrival time in row 3. Must be non-negative integer.",
+    ]
+
+def test_table_model_flags_too_big_values():
+    pytest.importorskip("PyQt5")
+    from schedulizer.table_model import ProcessTableModel
+
+    model = ProcessTableModel()
+    model.append_rows([("A", "0", TOO_BIG, "0"), ("B", "1", "3", str(MAX_VALUE))])
+    model.setData(model.index(1, 1), TOO_BIG)
+    assert model.text(0, 2) == TOO_BIG and model.text(1, 1) == TOO_BIG
+    assert [(row, str(e)) for row, e in model.validate()] == [
+        (0, "Invalid service time in row 1. Must be positive integer."),
+        (1, "Invalid arrival time in row 2. Must be non-negative integer."),
+    ]
+    model.setData(model.index(1, 1), "5")
+    assert [row for row, e in model.validate()] == [0]
+    assert model.table.priority[1] == MAX_VALUE